@@ -312,7 +312,7 @@ class App:
 
         self.perception_module = PerceptionModule(self.prediction)
         self.executive_module = ExecutiveModule(self.metacognition, self.skill_registry)
-        self.agentic_module = AgenticModule(self.brain)
+        self.agentic_module = AgenticModule(self.brain, workspace=self.workspace)
 
         self.workspace.register_module(self.perception_module)
         self.workspace.register_module(self.executive_module)
@@ -689,6 +689,8 @@ class App:
                 tg.create_task(self.skill_registry.run(), name="skill_registry")
                 # tg.create_task(self._prediction_loop(), name="prediction") # Deprecated by GWT
                 tg.create_task(self._consciousness_loop(), name="consciousness")
+                if settings.sub_agent_warmup:
+                    tg.create_task(self.sub_agents.warmup(), name="sub_agent_warmup")
                 if self._sound_detector:
                     tg.create_task(
                         self._sound_detection_loop(),
@@ -711,6 +713,8 @@ class App:
         finally:
             # Graceful shutdown — persist state
             self.lifecycle.on_shutdown(self.self_model, self.desires)
+            await self.blob_store.flush()
+            self.context_engine.flush()
             logger.info("Enton shutdown. State saved.")
 
     async def _idle_loop(self) -> None:
@@ -1010,7 +1014,7 @@ class App:
             self._adjust_fps(surprise)
 
             # 2. Global Workspace Cycle (Competition & Broadcast)
-            thought = self.workspace.tick()
+            thought = await self.workspace.tick()
 
             # 3. Mathematical Sentience: Attention Resource Allocation
             # Calculate attention based on surprise using a logistic function
@@ -19,13 +19,42 @@ import math
 import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
 PREDICTION_FILE = Path.home() / ".enton" / "memory" / "world_model.json"
 
+# Conversão epoch -> (dia da semana, hora) sem montar um datetime por tick.
+# O offset local é cacheado por janela de 15 min alinhada em UTC. Viradas de
+# horário de verão caem em múltiplos de 15 min UTC (offsets são múltiplos de
+# 15 min), então nunca acontecem no meio de uma janela.
+_DAY_S = 86400
+_EPOCH_WEEKDAY = time.gmtime(0).tm_wday
+_WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_TZ_REFRESH_S = 900
+
+_tz_offset = -time.altzone if time.daylight and time.localtime().tm_isdst else -time.timezone
+_tz_window_start = -_TZ_REFRESH_S - 1
+
+
+def _weekday_hour(ts: float) -> tuple[int, int]:
+    """Retorna (dia da semana 0=Mon, hora local) para um epoch."""
+    global _tz_offset, _tz_window_start
+    if not (0 <= ts - _tz_window_start < _TZ_REFRESH_S):
+        _tz_offset = time.localtime(ts).tm_gmtoff
+        _tz_window_start = ts - ts % _TZ_REFRESH_S
+    t = int(ts) + _tz_offset
+    day = (t // _DAY_S + _EPOCH_WEEKDAY) % 7
+    hour = (t % _DAY_S) // 3600
+    return day, hour
+
+
+def _hour_key(ts: float) -> str:
+    """Chave 'Weekday-Hour' (ex: 'Mon-14'), igual a strftime('%a-%H')."""
+    day, hour = _weekday_hour(ts)
+    return f"{_WEEKDAY_NAMES[day]}-{hour:02d}"
+
 
 @dataclass
 class WorldState:
@@ -39,8 +68,7 @@ class WorldState:
     @property
     def hour_key(self) -> str:
         """Returns 'Weekday-Hour' key e.g., 'Mon-14'."""
-        dt = datetime.fromtimestamp(self.timestamp)
-        return dt.strftime("%a-%H")
+        return _hour_key(self.timestamp)
 
 
 from enton.core.config import settings
@@ -86,8 +114,7 @@ class WorldModel:
 
     def predict(self, timestamp: float) -> dict[str, float]:
         """Return probabilities for user presence and activity at timestamp."""
-        dt = datetime.fromtimestamp(timestamp)
-        key = dt.strftime("%a-%H")
+        key = _hour_key(timestamp)
 
         stats = self._stats.get(key)
         if not stats or stats["total"] < 5:
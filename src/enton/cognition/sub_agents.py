@@ -26,19 +26,42 @@ Pattern:
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import copy
+import dataclasses
+import functools
+import inspect
+import json
 import logging
+import queue
+import re
+import sqlite3
+import threading
 import time
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
 from agno.agent import Agent
+from agno.run.agent import RunEvent
 from agno.tools import Toolkit
 
+from enton.core._embedders import nomic_embedder
+from enton.core.config import settings
+from enton.core.query_cache import EMBED_CACHE
+
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
     from agno.models.base import Model
 
 logger = logging.getLogger(__name__)
 
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
 
 @dataclass(slots=True)
 class AgentResult:
@@ -54,10 +77,344 @@ class AgentResult:
     def summary(self) -> str:
         tools = f", tools={self.tools_used}" if self.tools_used else ""
         return (
-            f"[{self.agent_role}] {self.content[:100]}... "
+            f"[{self.agent_role}] {self.content:.100}... "
             f"(conf={self.confidence:.0%}, {self.elapsed_ms:.0f}ms{tools})"
         )
 
+    @classmethod
+    def acquire(
+        cls,
+        agent_role: str,
+        content: str,
+        *,
+        confidence: float = 0.7,
+        elapsed_ms: float = 0.0,
+        tools_used: list[str] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> AgentResult:
+        """Get a result from the pool (or a new one) filled with these values."""
+        try:
+            r = _RESULT_POOL.pop()
+        except IndexError:
+            return cls(
+                agent_role,
+                content,
+                confidence,
+                elapsed_ms,
+                list(tools_used or ()),
+                dict(metadata or {}),
+            )
+        r.agent_role = agent_role
+        r.content = content
+        r.confidence = confidence
+        r.elapsed_ms = elapsed_ms
+        if tools_used:
+            r.tools_used.extend(tools_used)
+        if metadata:
+            r.metadata.update(metadata)
+        return r
+
+    def release(self) -> None:
+        """Return to the pool. Only call once the result is fully consumed."""
+        self.content = ""
+        self.tools_used.clear()
+        self.metadata.clear()
+        _RESULT_POOL.append(self)
+
+
+# Pool de AgentResult reciclados (release -> acquire); evita alocação em rajada
+_RESULT_POOL: deque[AgentResult] = deque(maxlen=64)
+
+
+class _ThinkStripper:
+    """Remove <think>...</think> de um stream, mesmo com tags cortadas entre chunks."""
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self) -> None:
+        self._buf = ""
+        self._in_think = False
+
+    def feed(self, chunk: str) -> str:
+        buf = self._buf + chunk
+        out: list[str] = []
+        while buf:
+            if self._in_think:
+                idx = buf.find(self._CLOSE)
+                if idx < 0:
+                    # guarda só o que pode ser o começo de </think>
+                    buf = buf[-(len(self._CLOSE) - 1) :]
+                    break
+                buf = buf[idx + len(self._CLOSE) :]
+                self._in_think = False
+            else:
+                idx = buf.find(self._OPEN)
+                if idx >= 0:
+                    out.append(buf[:idx])
+                    buf = buf[idx + len(self._OPEN) :]
+                    self._in_think = True
+                    continue
+                keep = _partial_suffix(buf, self._OPEN)
+                out.append(buf[: len(buf) - keep])
+                buf = buf[len(buf) - keep :]
+                break
+        self._buf = buf
+        return "".join(out)
+
+    def flush(self) -> str:
+        """Texto pendente no fim do stream (bloco <think> sem fechamento é descartado)."""
+        tail = "" if self._in_think else self._buf
+        self._buf = ""
+        return tail
+
+
+def _partial_suffix(text: str, tag: str) -> int:
+    """Tamanho do maior sufixo de ``text`` que é prefixo próprio de ``tag``."""
+    for n in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:n]):
+            return n
+    return 0
+
+
+# ------------------------------------------------------------------ #
+# Semantic Cache
+# ------------------------------------------------------------------ #
+
+
+class _SemanticCache:
+    """Cache semântico de respostas: (role, embedding da task) -> AgentResult.
+
+    Tasks recorrentes com similaridade >= threshold reaproveitam a resposta
+    anterior sem chamar o LLM. LRU por role, persistido em SQLite por uma
+    thread de escrita (o event loop nunca espera o disco).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        threshold: float = 0.92,
+        max_per_role: int = 500,
+    ) -> None:
+        self._path = path
+        self._threshold = threshold
+        self._max = max_per_role
+        self._embedder: Any = None
+        self._db: sqlite3.Connection | None = None
+        # escritas vão pra uma thread daemon, iniciada na primeira escrita
+        self._write_queue: queue.Queue[list[tuple[str, list[tuple]]]] | None = None
+        # role -> [(task, embedding normalizado, result)] do mais antigo ao mais recente
+        self._entries: dict[str, list[tuple[str, np.ndarray, AgentResult]]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if self._path is None:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # so a thread de escrita usa a conexao depois do load
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "role TEXT, task TEXT, embedding BLOB, content TEXT, "
+                "confidence REAL, model TEXT, last_used REAL, "
+                "PRIMARY KEY (role, task))"
+            )
+            rows = self._db.execute(
+                "SELECT role, task, embedding, content, confidence, model "
+                "FROM entries ORDER BY last_used"
+            ).fetchall()
+        except Exception as e:
+            logger.warning("SubAgent cache unavailable: %s", e)
+            self._db = None
+            return
+        for role, task, blob, content, confidence, model in rows:
+            result = AgentResult(
+                agent_role=role,
+                content=content,
+                confidence=confidence,
+                metadata={"model": model},
+            )
+            vec = np.frombuffer(blob, dtype=np.float32)
+            self._entries.setdefault(role, []).append((task, vec, result))
+        logger.info("SubAgent cache loaded: %d entries", len(rows))
+
+    def _get_embedder(self) -> Any:
+        """Return OllamaEmbedder for nomic-embed-text."""
+        if self._embedder is not None:
+            return self._embedder
+        try:
+            self._embedder = nomic_embedder()
+            return self._embedder
+        except Exception:
+            return None
+
+    async def embed(self, task: str) -> np.ndarray | None:
+        """Embedding normalizado da task (None se o embedder falhar)."""
+        embedder = self._get_embedder()
+        if embedder is None:
+            return None
+        text = " ".join(task.lower().split())
+        try:
+            emb = await EMBED_CACHE.aembed(embedder, text)
+        except Exception:
+            logger.debug("SubAgent cache embed failed")
+            return None
+        if not emb:
+            return None
+        vec = np.asarray(emb, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def lookup(self, role: str, vec: np.ndarray) -> AgentResult | None:
+        """Retorna o resultado mais similar acima do threshold (e marca uso)."""
+        entries = self._entries.get(role)
+        if not entries:
+            return None
+        sims = np.stack([e[1] for e in entries]) @ vec
+        idx = int(np.argmax(sims))
+        if sims[idx] < self._threshold:
+            return None
+        entry = entries.pop(idx)
+        entries.append(entry)
+        self._persist(
+            [
+                (
+                    "UPDATE entries SET last_used = ? WHERE role = ? AND task = ?",
+                    [(time.time(), role, entry[0])],
+                )
+            ]
+        )
+        return entry[2]
+
+    def insert(self, role: str, task: str, vec: np.ndarray, result: AgentResult) -> None:
+        """Guarda o resultado e despeja o mais antigo se passar do limite."""
+        result = dataclasses.replace(
+            result, tools_used=list(result.tools_used), metadata=dict(result.metadata)
+        )
+        entries = self._entries.setdefault(role, [])
+        entries[:] = [e for e in entries if e[0] != task]
+        entries.append((task, vec, result))
+        evicted = entries[: max(0, len(entries) - self._max)]
+        del entries[: len(evicted)]
+        self._persist(
+            [
+                (
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            role,
+                            task,
+                            vec.astype(np.float32).tobytes(),
+                            result.content,
+                            result.confidence,
+                            result.metadata.get("model", ""),
+                            time.time(),
+                        )
+                    ],
+                ),
+                (
+                    "DELETE FROM entries WHERE role = ? AND task = ?",
+                    [(role, e[0]) for e in evicted],
+                ),
+            ]
+        )
+
+    def flush(self) -> None:
+        """Block until every queued write is committed."""
+        if self._write_queue is not None:
+            self._write_queue.join()
+
+    def _persist(self, statements: list[tuple[str, list[tuple]]]) -> None:
+        if self._db is None:
+            return
+        if self._write_queue is None:
+            self._write_queue = queue.Queue()
+            threading.Thread(
+                target=self._writer_loop,
+                args=(self._write_queue,),
+                name="subagent-cache-writer",
+                daemon=True,
+            ).start()
+        self._write_queue.put(statements)
+
+    def _writer_loop(self, q: queue.Queue[list[tuple[str, list[tuple]]]]) -> None:
+        while True:
+            statements = q.get()
+            try:
+                for sql, rows in statements:
+                    self._db.executemany(sql, rows)
+                self._db.commit()
+            except Exception:
+                logger.debug("SubAgent cache persist failed")
+            finally:
+                q.task_done()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._entries.values())
+
+
+# ------------------------------------------------------------------ #
+# Tool Coalescing
+# ------------------------------------------------------------------ #
+
+
+class _ToolCoalescer:
+    """Compartilha chamadas idênticas em voo entre tasks irmãs de um batch.
+
+    Se (tool, args) iguais rodam ao mesmo tempo, a segunda aguarda o Future
+    da primeira. A chave sai do mapa quando a chamada termina: uma chamada
+    posterior executa de novo (coalescência, não memo).
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def call(
+        self, function_name: str, function_call: Callable, arguments: dict[str, Any]
+    ) -> Any:
+        try:
+            key = (function_name, json.dumps(arguments, sort_keys=True, default=str))
+        except (TypeError, ValueError):
+            return await function_call(**arguments)
+
+        inflight = self._inflight
+        fut = inflight.get(key)
+        if fut is not None:
+            self.coalesced += 1
+            return await asyncio.shield(fut)
+
+        fut = asyncio.get_running_loop().create_future()
+        inflight[key] = fut
+        try:
+            result = await function_call(**arguments)
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # evita "exception never retrieved" sem irmãos esperando
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            del inflight[key]
+
+
+# Batch de execute_batch da task atual (as tasks do gather herdam o contexto);
+# um execute() avulso no mesmo SubAgent não vê o batch
+_BATCH: contextvars.ContextVar[_ToolCoalescer | None] = contextvars.ContextVar(
+    "enton_subagent_batch", default=None
+)
+
+
+async def _coalesce_hook(
+    function_name: str, function_call: Callable, arguments: dict[str, Any]
+) -> Any:
+    coalescer = _BATCH.get()
+    if coalescer is None:
+        return await function_call(**arguments)
+    return await coalescer.call(function_name, function_call, arguments)
+
 
 # ------------------------------------------------------------------ #
 # Role Definitions
@@ -65,55 +422,182 @@ class AgentResult:
 
 from enton.cognition.prompts import SUBAGENT_PROMPTS
 
-ROLE_CONFIGS: dict[str, dict[str, Any]] = {
-    "vision": {
-        "name": "EntonVision",
-        "system": SUBAGENT_PROMPTS["vision"],
-        "toolkit_names": [
+
+@dataclass(slots=True, frozen=True)
+class RoleConfig:
+    """Static definition of a sub-agent role."""
+
+    name: str
+    system: str
+    toolkit_names: tuple[str, ...]
+    description: str
+    # Corre os 2 primeiros models em paralelo (first-good-wins). Só pra roles
+    # sensíveis a latência; os demais seguem o fallback sequencial. Tools com
+    # efeito colateral (ver _SIDE_EFFECT_TOOLKITS) encerram o race na 1a chamada.
+    race_models: bool = False
+
+
+# Toolkits cujas tools mudam o mundo (shell, arquivos, processos, camera, faces,
+# cloud). Dois racers chamando-as executariam a mesma acao duas vezes, e o
+# perdedor seria cancelado no meio da tool call.
+_SIDE_EFFECT_TOOLKITS = frozenset(
+    {
+        "shell_tools",
+        "file_tools",
+        "process_tools",
+        "coding_tools",
+        "gcp_tools",
+        "ptz_tools",
+        "face_tools",
+    }
+)
+
+
+ROLE_CONFIGS: dict[str, RoleConfig] = {
+    "vision": RoleConfig(
+        name="EntonVision",
+        system=SUBAGENT_PROMPTS["vision"],
+        toolkit_names=(
             "describe_tools",
             "face_tools",
             "visual_memory_tools",
             "ptz_tools",
-        ],
-        "description": "Análise de cenas, objetos, faces e atividades visuais.",
-    },
-    "coding": {
-        "name": "EntonCoder",
-        "system": SUBAGENT_PROMPTS["coding"],
-        "toolkit_names": [
+        ),
+        description="Análise de cenas, objetos, faces e atividades visuais.",
+        race_models=True,
+    ),
+    "coding": RoleConfig(
+        name="EntonCoder",
+        system=SUBAGENT_PROMPTS["coding"],
+        toolkit_names=(
             "coding_tools",
             "shell_tools",
             "file_tools",
             "workspace_tools",
             "process_tools",
-        ],
-        "description": "Programação multi-linguagem, review, debug e execução.",
-    },
-    "research": {
-        "name": "EntonResearch",
-        "system": SUBAGENT_PROMPTS["research"],
-        "toolkit_names": [
+        ),
+        description="Programação multi-linguagem, review, debug e execução.",
+    ),
+    "research": RoleConfig(
+        name="EntonResearch",
+        system=SUBAGENT_PROMPTS["research"],
+        toolkit_names=(
             "search_tools",
             "knowledge_tools",
             "memory_tools",
-        ],
-        "description": "Pesquisa web, knowledge crawling e síntese de informações.",
-    },
-    "system": {
-        "name": "EntonSysAdmin",
-        "system": SUBAGENT_PROMPTS["system"],
-        "toolkit_names": [
+        ),
+        description="Pesquisa web, knowledge crawling e síntese de informações.",
+    ),
+    "system": RoleConfig(
+        name="EntonSysAdmin",
+        system=SUBAGENT_PROMPTS["system"],
+        toolkit_names=(
             "system_tools",
             "workspace_tools",
             "process_tools",
             "gcp_tools",
             "shell_tools",
-        ],
-        "description": "Monitoramento de hardware, processos, GCP e infraestrutura.",
-    },
+        ),
+        description="Monitoramento de hardware, processos, GCP e infraestrutura.",
+    ),
 }
 
 
+# Tamanho da janela de resultados recentes usada no success_rate
+_OUTCOME_WINDOW = 256
+
+# Providers que aceitam `prompt_cache_key` no corpo da request (roteamento
+# de prompt cache por shard). Os demais ignoram ou rejeitam o campo.
+_PROMPT_CACHE_KEY_PROVIDERS = frozenset({"OpenAI", "OpenRouter"})
+
+
+def _with_prompt_cache_key(model: Model, key: str) -> Model:
+    """Return a per-role copy of ``model`` carrying a stable prompt_cache_key.
+
+    Models are shared with the main brain, so the key goes on a shallow copy.
+    A key already set by the parent is kept.
+    """
+    if getattr(model, "provider", None) not in _PROMPT_CACHE_KEY_PROVIDERS:
+        return model
+    body = getattr(model, "extra_body", None) or {}
+    if "prompt_cache_key" in body:
+        return model
+    clone = copy.copy(model)
+    clone.extra_body = {**body, "prompt_cache_key": key}
+    return clone
+
+
+def _one_token_model(model: Model) -> Model:
+    """Copy of ``model`` capped at a single output token (warmup probes)."""
+    probe = copy.copy(model)
+    if hasattr(probe, "max_tokens"):
+        probe.max_tokens = 1
+    elif hasattr(probe, "options"):  # Ollama
+        probe.options = {**(probe.options or {}), "num_predict": 1}
+    return probe
+
+
+class _RaceClaim:
+    """Shared by the two racers of one ``_race``.
+
+    The first racer to call a side-effecting tool becomes the owner and
+    the other one is cancelled, so the action runs at most once.
+    """
+
+    __slots__ = ("owner", "tasks")
+
+    def __init__(self) -> None:
+        self.owner: int | None = None
+        self.tasks: list[asyncio.Task] = []
+
+    def claim(self, racer: int) -> None:
+        if self.owner is None:
+            self.owner = racer
+            for i, t in enumerate(self.tasks):
+                if i != racer:
+                    t.cancel()
+        elif self.owner != racer:
+            # o outro racer ja agiu: este foi cancelado e nao pode executar nada
+            raise asyncio.CancelledError
+
+
+# (race, indice do racer) da task atual; herdado pelas tasks filhas das tool calls
+_RACE: contextvars.ContextVar[tuple[_RaceClaim, int] | None] = contextvars.ContextVar(
+    "enton_subagent_race", default=None
+)
+
+
+async def _race_guard(
+    function_name: str, function_call: Callable, arguments: dict[str, Any]
+) -> Any:
+    racing = _RACE.get()
+    if racing is not None:
+        racing[0].claim(racing[1])
+    return await function_call(**arguments)
+
+
+def _hooked_toolkit(tk: Toolkit, hook: Callable, *, sync_too: bool = False) -> Toolkit:
+    """Shallow copy of ``tk`` whose tools run through ``hook``.
+
+    Only async tools get the hook unless ``sync_too``: agno runs a sync tool
+    with an async hook inline on the event loop, instead of in a worker
+    thread. The original toolkit (shared with the main brain) is untouched.
+    """
+
+    def hooked(fns: dict[str, Any]) -> dict[str, Any]:
+        out = dict(fns)
+        for name, f in fns.items():
+            if sync_too or inspect.iscoroutinefunction(f.entrypoint):
+                out[name] = f.model_copy()  # o override do agno nao aceita update=
+                out[name].tool_hooks = [hook, *(f.tool_hooks or ())]
+        return out
+
+    clone = copy.copy(tk)
+    clone.functions = hooked(tk.functions)
+    clone.async_functions = hooked(tk.async_functions)
+    return clone
+
+
 class SubAgent:
     """A role-specialized agent with focused tools and system prompt."""
 
@@ -123,22 +607,48 @@ class SubAgent:
         models: list[Model],
         toolkits: list[Toolkit] | None = None,
         system_prompt: str = "",
+        *,
+        cache: _SemanticCache | None = None,
+        pool_max: int = 4,
     ) -> None:
         self.role = role
-        self._models = models
+        # Chave estável entre restarts: toda call do role cai no mesmo shard
+        # de prompt cache e reaproveita o prefixo system prompt + tools.
+        self._cache_key = f"enton-subagent-{role}"
+        self._models = [_with_prompt_cache_key(m, self._cache_key) for m in models]
         self._system = system_prompt
+        self._cache = cache
+        # Totais monotônicos (report) + janela dos últimos resultados (routing)
         self._total_calls = 0
         self._total_errors = 0
+        self._outcomes: deque[bool] = deque(maxlen=_OUTCOME_WINDOW)
+        self._window_ok = 0
 
-        config = ROLE_CONFIGS.get(role, {})
-        name = config.get("name", f"Enton_{role.title()}")
-        if not system_prompt:
-            self._system = config.get("system", "")
+        config = ROLE_CONFIGS.get(role)
+        self._name = config.name if config else f"Enton_{role.title()}"
+        self._race_models = bool(config and config.race_models)
+        self._toolkits = [self._with_hooks(tk) for tk in toolkits or ()]
+        if not system_prompt and config:
+            self._system = config.system
 
-        self._agent = Agent(
-            name=name,
-            model=models[0] if models else None,
-            tools=toolkits or [],
+        # Pool de Agents: cada execute concorrente usa o seu, sem disputar
+        # `agent.model` durante o fallback. Cresce sob demanda até pool_max.
+        self._pool: deque[Agent] = deque([self._new_agent()])
+        self._pool_sem = asyncio.Semaphore(pool_max)
+        self.pool_hits = 0
+        self.pool_misses = 0
+
+    def _with_hooks(self, tk: Toolkit) -> Toolkit:
+        """Side-effecting tools get the race guard (when racing), never coalescing."""
+        if tk.name in _SIDE_EFFECT_TOOLKITS:
+            return _hooked_toolkit(tk, _race_guard, sync_too=True) if self._race_models else tk
+        return _hooked_toolkit(tk, _coalesce_hook)
+
+    def _new_agent(self) -> Agent:
+        return Agent(
+            name=self._name,
+            model=self._models[0] if self._models else None,
+            tools=self._toolkits,
             instructions=[self._system] if self._system else None,
             tool_call_limit=5,
             retries=1,
@@ -147,50 +657,339 @@ class SubAgent:
             markdown=False,
         )
 
+    def _acquire(self) -> Agent:
+        if self._pool:
+            self.pool_hits += 1
+            return self._pool.popleft()
+        self.pool_misses += 1
+        return self._new_agent()
+
+    async def _cache_lookup(self, task: str, start: float) -> tuple[Any, AgentResult | None]:
+        """Return (task embedding, cached result) — both None when cache is off."""
+        if self._cache is None:
+            return None, None
+        vec = await self._cache.embed(task)
+        cached = self._cache.lookup(self.role, vec) if vec is not None else None
+        if cached is None:
+            return vec, None
+        logger.info("SubAgent [%s]: cache hit", self.role)
+        return vec, dataclasses.replace(
+            cached,
+            elapsed_ms=(time.time() - start) * 1000,
+            tools_used=list(cached.tools_used),
+            metadata={**cached.metadata, "cache_hit": True},
+        )
+
+    def _record_success(
+        self, task: str, vec: Any, model: Model, content: str, start: float
+    ) -> AgentResult:
+        elapsed = (time.time() - start) * 1000
+        self._total_calls += 1
+        self._record_outcome(True)
+
+        mid = getattr(model, "id", "?")
+        logger.info("SubAgent [%s/%s]: %.80s", self.role, mid, content)
+
+        result = AgentResult.acquire(
+            agent_role=self.role,
+            content=content,
+            elapsed_ms=elapsed,
+            metadata={"model": mid},
+        )
+        if vec is not None and content:
+            self._cache.insert(self.role, task, vec, result)
+        return result
+
+    def _failure_message(self) -> str:
+        return f"Erro: {self.role} agent falhou em todos os providers."
+
     async def execute(self, task: str) -> AgentResult:
         """Execute a task with fallback across models."""
         start = time.time()
 
-        for model in self._models:
-            try:
-                self._agent.model = model
-                response = await self._agent.arun(task)
-                content = response.content or ""
-                # Strip <think> tags
-                import re
-
-                content = re.sub(r"<think>.*?</think>", "", content, flags=re.DOTALL).strip()
+        vec, cached = await self._cache_lookup(task, start)
+        if cached is not None:
+            return cached
 
-                elapsed = (time.time() - start) * 1000
-                self._total_calls += 1
+        async with self._pool_sem:
+            agent = self._acquire()
+            try:
+                remaining = self._models
+                # o 2o racer precisa de um slot livre do pool (sem esperar)
+                if self._race_models and len(self._models) >= 2 and not self._pool_sem.locked():
+                    won = await self._race(agent, task)
+                    if won is not None:
+                        return self._record_success(task, vec, won[0], won[1], start)
+                    remaining = self._models[2:]
 
-                mid = getattr(model, "id", "?")
-                logger.info("SubAgent [%s/%s]: %s", self.role, mid, content[:80])
-
-                return AgentResult(
-                    agent_role=self.role,
-                    content=content,
-                    elapsed_ms=elapsed,
-                    metadata={"model": mid},
-                )
-            except Exception:
-                mid = getattr(model, "id", "?")
-                logger.warning("SubAgent [%s/%s] failed", self.role, mid)
-                self._total_errors += 1
+                for model in remaining:
+                    try:
+                        content = await self._run_model(agent, model, task)
+                        return self._record_success(task, vec, model, content, start)
+                    except Exception:
+                        mid = getattr(model, "id", "?")
+                        logger.warning("SubAgent [%s/%s] failed", self.role, mid)
+                        self._record_error()
+            finally:
+                self._pool.append(agent)
 
         # All models failed
         elapsed = (time.time() - start) * 1000
-        return AgentResult(
+        return AgentResult.acquire(
             agent_role=self.role,
-            content=f"Erro: {self.role} agent falhou em todos os providers.",
+            content=self._failure_message(),
             confidence=0.0,
             elapsed_ms=elapsed,
         )
 
+    @staticmethod
+    async def _run_model(agent: Agent, model: Model, task: str) -> str:
+        agent.model = model
+        response = await agent.arun(task)
+        content = response.content or ""
+        # Strip <think> tags
+        if "<think>" in content:
+            content = _THINK_RE.sub("", content)
+        return content.strip()
+
+    async def _race(self, agent: Agent, task: str) -> tuple[Model, str] | None:
+        """Race the first two models; return (model, content) of the first success.
+
+        The second agent takes its own ``_pool_sem`` slot. Callers check that
+        one is free first: racers that each hold one slot and wait for
+        another would deadlock. A racer that calls a side-effecting tool
+        claims the race and the other one is cancelled (see ``_RaceClaim``).
+        """
+        await self._pool_sem.acquire()  # slot livre: retorna sem suspender
+        other = self._acquire()
+        claim = _RaceClaim()
+        runs: dict[asyncio.Task, Model] = {}
+        for i, (a, m) in enumerate(zip((agent, other), self._models[:2], strict=False)):
+            ctx = contextvars.copy_context()
+            ctx.run(_RACE.set, (claim, i))
+            runs[asyncio.create_task(self._run_model(a, m, task), context=ctx)] = m
+        claim.tasks = list(runs)
+        try:
+            pending = set(runs)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.cancelled():  # perdeu a posse do race
+                        continue
+                    model = runs[t]
+                    if t.exception() is None:
+                        return model, t.result()
+                    logger.warning("SubAgent [%s/%s] failed", self.role, getattr(model, "id", "?"))
+                    self._record_error()
+            return None
+        finally:
+            for t in runs:
+                t.cancel()
+            await asyncio.gather(*runs, return_exceptions=True)
+            self._pool.append(other)
+            self._pool_sem.release()
+
+    async def execute_stream(self, task: str, run_id: str | None = None) -> AsyncIterator[str]:
+        """Execute a task yielding response text as tokens arrive.
+
+        <think> blocks are stripped across chunk boundaries. Falls back to the
+        next model only while nothing has been yielded yet; a failure after
+        the first token ends the stream. Cancel with ``abort_request(run_id)``.
+        """
+        start = time.time()
+
+        vec, cached = await self._cache_lookup(task, start)
+        if cached is not None:
+            yield cached.content
+            return
+
+        async with self._pool_sem:
+            agent = self._acquire()
+            try:
+                for model in self._models:
+                    stripper = _ThinkStripper()
+                    parts: list[str] = []
+                    try:
+                        agent.model = model
+                        async for event in agent.arun(task, stream=True, run_id=run_id):
+                            if getattr(event, "event", None) != RunEvent.run_content:
+                                continue
+                            if not isinstance(event.content, str):
+                                continue
+                            text = stripper.feed(event.content)
+                            if not parts:
+                                text = text.lstrip()
+                            if text:
+                                parts.append(text)
+                                yield text
+                        tail = stripper.flush()
+                        if not parts:
+                            tail = tail.lstrip()
+                        if tail:
+                            parts.append(tail)
+                            yield tail
+                        content = "".join(parts).strip()
+                        self._record_success(task, vec, model, content, start).release()
+                        return
+                    except Exception:
+                        mid = getattr(model, "id", "?")
+                        logger.warning("SubAgent [%s/%s] stream failed", self.role, mid)
+                        self._record_error()
+                        if parts:
+                            return
+            finally:
+                self._pool.append(agent)
+
+        yield self._failure_message()
+
+    async def warmup(self) -> bool:
+        """Fire a 1-token probe so the provider caches the system-prompt prefix.
+
+        Uses the primary model (with the role's prompt_cache_key, so the
+        probe lands on the same cache shard). Not counted in the stats.
+        """
+        if not self._models:
+            return False
+        probe = _one_token_model(self._models[0])
+        async with self._pool_sem:
+            agent = self._acquire()
+            try:
+                agent.model = probe
+                await agent.arun("ok")
+                return True
+            except Exception:
+                logger.debug("SubAgent [%s] warmup failed", self.role)
+                return False
+            finally:
+                agent.model = self._models[0]
+                self._pool.append(agent)
+
+    @staticmethod
+    def abort_request(run_id: str) -> bool:
+        """Cancel an in-flight ``execute_stream`` run."""
+        return Agent.cancel_run(run_id)
+
+    async def execute_batch(self, tasks: list[str], max_inflight: int = 4) -> list[AgentResult]:
+        """Execute sibling tasks concurrently, sharing identical in-flight tool calls.
+
+        A task that raises becomes a failed result of its own; its siblings
+        still run to completion.
+        """
+        sem = asyncio.Semaphore(max_inflight)
+
+        async def _one(task: str) -> AgentResult:
+            async with sem:
+                try:
+                    return await self.execute(task)
+                except Exception as e:
+                    logger.warning("SubAgent [%s] batch task failed: %s", self.role, e)
+                    self._record_error()
+                    return AgentResult.acquire(
+                        agent_role=self.role, content=f"Erro: {e}", confidence=0.0
+                    )
+
+        token = _BATCH.set(_ToolCoalescer())
+        try:
+            return list(await asyncio.gather(*(_one(t) for t in tasks)))
+        finally:
+            _BATCH.reset(token)
+
     @property
     def success_rate(self) -> float:
-        total = self._total_calls + self._total_errors
-        return self._total_calls / total if total else 1.0
+        """Success rate over the last ``_OUTCOME_WINDOW`` attempts."""
+        n = len(self._outcomes)
+        return self._window_ok / n if n else 1.0
+
+    def _record_outcome(self, ok: bool) -> None:
+        if len(self._outcomes) == _OUTCOME_WINDOW:
+            self._window_ok -= self._outcomes[0]
+        self._outcomes.append(ok)
+        self._window_ok += ok
+
+    def _record_error(self) -> None:
+        self._total_errors += 1
+        self._record_outcome(False)
+
+
+# ------------------------------------------------------------------ #
+# Task Classification
+# ------------------------------------------------------------------ #
+
+
+def _kw_set(*words: str) -> frozenset[str]:
+    """Keywords + plural regular (-s): match é por token inteiro, não substring."""
+    return frozenset(words) | frozenset(w + "s" for w in words)
+
+
+_VISION_KW = _kw_set(
+    "camera",
+    "imagem",
+    "foto",
+    "cena",
+    "vendo",
+    "olha",
+    "olhe",
+    "rosto",
+    "face",
+    "visual",
+    "descreva",
+    "observe",
+    "observa",
+    "observar",
+    "observando",
+) | {"imagens"}
+_CODE_KW = _kw_set(
+    "codigo",
+    "code",
+    "python",
+    "rust",
+    "programar",
+    "debug",
+    "compilar",
+    "script",
+    "funcao",
+    "classe",
+    "bug",
+    "implementar",
+    "refatorar",
+    "rodar",
+) | {"funcoes"}
+_SYS_KW = _kw_set(
+    "cpu",
+    "gpu",
+    "ram",
+    "disco",
+    "processo",
+    "hardware",
+    "gcp",
+    "vm",
+    "cloud",
+    "deploy",
+    "sistema",
+    "monitor",
+)
+
+_TOKEN_RE = re.compile(r"[^\W\d_]+")
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify(t: str) -> str:
+    """Classifica a task (já em lowercase). Memoizado: prompts repetidos são O(1).
+
+    Tokeniza uma vez e testa interseção com os sets de cada role, na ordem
+    de prioridade vision > coding > system. Se os keywords mudarem em
+    runtime, chamar ``_classify.cache_clear()``.
+    """
+    toks = set(_TOKEN_RE.findall(t))
+    if toks & _VISION_KW:
+        return "vision"
+    if toks & _CODE_KW:
+        return "coding"
+    if toks & _SYS_KW:
+        return "system"
+
+    # Default: research
+    return "research"
 
 
 class SubAgentOrchestrator:
@@ -199,6 +998,16 @@ class SubAgentOrchestrator:
     This is the bridge between the main brain and the specialists.
     """
 
+    __slots__ = (
+        "_agent_items",
+        "_agent_toolkits",
+        "_agents",
+        "_all_toolkits",
+        "_cache",
+        "_descriptions",
+        "_models",
+    )
+
     def __init__(
         self,
         models: list[Model],
@@ -207,23 +1016,36 @@ class SubAgentOrchestrator:
         self._models = models
         self._all_toolkits = toolkits or {}
         self._agents: dict[str, SubAgent] = {}
+        self._agent_toolkits: dict[str, tuple[Toolkit, ...]] = {}
+        self._cache: _SemanticCache | None = None
+        if settings.sub_agent_cache_enabled:
+            self._cache = _SemanticCache(
+                Path(settings.memory_root) / "subagent_cache.db",
+                threshold=settings.sub_agent_cache_threshold,
+                max_per_role=settings.sub_agent_cache_max_entries,
+            )
         self._init_agents()
+        # Roles são fixos após o init: snapshot ordenado pra queries sem iterar dict
+        self._agent_items: tuple[tuple[str, SubAgent], ...] = tuple(self._agents.items())
+        self._descriptions: dict[str, str] = {
+            role: ROLE_CONFIGS[role].description for role in self._agents
+        }
 
     def _init_agents(self) -> None:
         """Initialize sub-agents from role configs."""
         for role, config in ROLE_CONFIGS.items():
-            # Resolve toolkit names to actual toolkit instances
-            agent_toolkits: list[Toolkit] = []
-            for tk_name in config.get("toolkit_names", []):
-                tk = self._all_toolkits.get(tk_name)
-                if tk:
-                    agent_toolkits.append(tk)
+            # Resolve toolkit names to actual toolkit instances (once per role)
+            agent_toolkits = tuple(
+                tk for name in config.toolkit_names if (tk := self._all_toolkits.get(name))
+            )
+            self._agent_toolkits[role] = agent_toolkits
 
             self._agents[role] = SubAgent(
                 role=role,
                 models=self._models,
-                toolkits=agent_toolkits,
-                system_prompt=config.get("system", ""),
+                toolkits=list(agent_toolkits),
+                system_prompt=config.system,
+                cache=self._cache,
             )
             logger.info(
                 "SubAgent initialized: %s (%d tools)",
@@ -231,20 +1053,51 @@ class SubAgentOrchestrator:
                 len(agent_toolkits),
             )
 
+    async def warmup(self) -> None:
+        """Warm every role's system-prompt prefix cache concurrently (startup)."""
+        results = await asyncio.gather(*(a.warmup() for a in self._agents.values()))
+        logger.info("SubAgent warmup: %d/%d roles", sum(results), len(results))
+
     async def delegate(self, role: str, task: str) -> AgentResult:
         """Delegate a task to a specific sub-agent."""
         agent = self._agents.get(role)
         if not agent:
-            return AgentResult(
+            return AgentResult.acquire(
                 agent_role=role,
                 content=f"Erro: sub-agent '{role}' nao existe. "
                 f"Disponiveis: {', '.join(self._agents.keys())}",
                 confidence=0.0,
             )
 
-        logger.info("Delegating to [%s]: %s", role, task[:80])
+        logger.info("Delegating to [%s]: %.80s", role, task)
         return await agent.execute(task)
 
+    async def delegate_many(self, jobs: list[tuple[str, str]]) -> list[AgentResult]:
+        """Delegate (role, task) jobs in batch, grouped by role.
+
+        Results keep the order of ``jobs``. Failures stay per job: a job
+        that raises comes back as a result with ``confidence=0.0``.
+        """
+        by_role: dict[str, list[int]] = defaultdict(list)
+        for i, (role, _task) in enumerate(jobs):
+            by_role[role].append(i)
+
+        results: list[AgentResult | None] = [None] * len(jobs)
+
+        async def _run_role(role: str, idxs: list[int]) -> None:
+            agent = self._agents.get(role)
+            if not agent:
+                for i in idxs:
+                    results[i] = await self.delegate(role, jobs[i][1])
+                return
+            logger.info("Delegating batch to [%s]: %d tasks", role, len(idxs))
+            batch = await agent.execute_batch([jobs[i][1] for i in idxs])
+            for i, r in zip(idxs, batch, strict=True):
+                results[i] = r
+
+        await asyncio.gather(*(_run_role(r, idxs) for r, idxs in by_role.items()))
+        return results  # type: ignore[return-value]
+
     async def auto_delegate(self, task: str) -> AgentResult:
         """Automatically choose the best sub-agent for a task."""
         role = self._classify_task(task)
@@ -252,66 +1105,7 @@ class SubAgentOrchestrator:
 
     def _classify_task(self, task: str) -> str:
         """Simple heuristic to classify which agent should handle a task."""
-        t = task.lower()
-
-        # Vision keywords
-        vision_kw = [
-            "camera",
-            "imagem",
-            "foto",
-            "cena",
-            "vendo",
-            "olha",
-            "rosto",
-            "face",
-            "visual",
-            "descreva",
-            "observ",
-        ]
-        if any(kw in t for kw in vision_kw):
-            return "vision"
-
-        # Coding keywords
-        code_kw = [
-            "codigo",
-            "code",
-            "python",
-            "rust",
-            "programar",
-            "debug",
-            "compilar",
-            "script",
-            "funcao",
-            "classe",
-            "bug",
-            "implementar",
-            "refatorar",
-            "rodar",
-            "executar codigo",
-        ]
-        if any(kw in t for kw in code_kw):
-            return "coding"
-
-        # System keywords
-        sys_kw = [
-            "cpu",
-            "gpu",
-            "ram",
-            "disco",
-            "processo",
-            "hardware",
-            "gcp",
-            "vm",
-            "cloud",
-            "deploy",
-            "sistema",
-            "monitor",
-        ]
-        if any(kw in t for kw in sys_kw):
-            return "system"
-
-        # Default: research
-        return "research"
+        return _classify(task.lower())
 
     # ------------------------------------------------------------------ #
     # Query
@@ -321,16 +1115,18 @@ class SubAgentOrchestrator:
         """List available sub-agents with their stats."""
         return {
             role: {
-                "description": ROLE_CONFIGS.get(role, {}).get("description", ""),
+                "description": self._descriptions[role],
                 "success_rate": agent.success_rate,
                 "total_calls": agent._total_calls,
+                "pool_hits": agent.pool_hits,
+                "pool_misses": agent.pool_misses,
             }
-            for role, agent in self._agents.items()
+            for role, agent in self._agent_items
         }
 
     def get_agent(self, role: str) -> SubAgent | None:
         return self._agents.get(role)
 
     def summary(self) -> str:
-        total = sum(a._total_calls for a in self._agents.values())
-        return f"SubAgents: {len(self._agents)} roles, {total} total calls"
+        total = sum(a._total_calls for _, a in self._agent_items)
+        return f"SubAgents: {len(self._agent_items)} roles, {total} total calls"
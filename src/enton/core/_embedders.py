@@ -0,0 +1,91 @@
+"""Process-wide embedder singletons.
+
+Every nomic-embed-text consumer (memory, blobs, commonsense, crawler,
+sub-agent cache) shares one OllamaEmbedder: one import, one instance and
+one pooled keep-alive HTTP client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+if TYPE_CHECKING:
+    from agno.knowledge.embedder.ollama import OllamaEmbedder
+
+NOMIC_EMBED_DIM = 768
+
+_EMBED_POOL = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+
+
+@functools.lru_cache(maxsize=1)
+def nomic_embedder() -> OllamaEmbedder:
+    """Shared OllamaEmbedder for nomic-embed-text (raises if the SDK is missing)."""
+    from agno.knowledge.embedder.ollama import OllamaEmbedder
+
+    return OllamaEmbedder(
+        id="nomic-embed-text",
+        dimensions=NOMIC_EMBED_DIM,
+        client_kwargs={"limits": _EMBED_POOL},
+    )
+
+
+def _is_ollama(embedder: Any) -> bool:
+    from agno.knowledge.embedder.ollama import OllamaEmbedder
+
+    return isinstance(embedder, OllamaEmbedder)
+
+
+def _embed_kwargs(embedder: OllamaEmbedder) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {}
+    if embedder.options is not None:
+        kwargs["options"] = embedder.options
+    if embedder.dimensions is not None:
+        kwargs["dimensions"] = embedder.dimensions
+    return kwargs
+
+
+def _check_dims(embedder: Any, vectors: list[list[float]]) -> list[list[float]]:
+    # mesmo contrato do get_embedding: dimensao errada -> []
+    dims = getattr(embedder, "dimensions", None)
+    return [v if dims is None or len(v) == dims else [] for v in vectors]
+
+
+def embed_many(embedder: Any, texts: list[str]) -> list[list[float]]:
+    """Embeddings for ``texts`` in one ``/api/embed`` round trip (blocking).
+
+    Non-Ollama embedders fall back to one ``get_embedding`` per text.
+    Returns one vector per text; failed/invalid ones are ``[]``.
+    """
+    if not texts:
+        return []
+    if not _is_ollama(embedder):
+        return [embedder.get_embedding(t) or [] for t in texts]
+    response = embedder.client.embed(input=texts, model=embedder.id, **_embed_kwargs(embedder))
+    return _batch_vectors(embedder, texts, response)
+
+
+async def aembed_many(embedder: Any, texts: list[str]) -> list[list[float]]:
+    """Async :func:`embed_many` over the embedder's async Ollama client."""
+    if not texts:
+        return []
+    if not _is_ollama(embedder):
+        aget = getattr(embedder, "async_get_embedding", None)
+        if not inspect.iscoroutinefunction(aget):
+            return await asyncio.to_thread(embed_many, embedder, texts)
+        return [v or [] for v in await asyncio.gather(*(aget(t) for t in texts))]
+    response = await embedder.aclient.embed(
+        input=texts, model=embedder.id, **_embed_kwargs(embedder)
+    )
+    return _batch_vectors(embedder, texts, response)
+
+
+def _batch_vectors(embedder: Any, texts: list[str], response: Any) -> list[list[float]]:
+    vectors = response.get("embeddings") or []
+    if len(vectors) != len(texts):
+        return [[] for _ in texts]
+    return _check_dims(embedder, vectors)
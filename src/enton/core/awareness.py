@@ -18,9 +18,13 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 from typing import TYPE_CHECKING
 
+from enton.core.events import SystemEvent
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from enton.core.events import EventBus
-    from enton.core.self_model import SelfModel
+    from enton.core.self_model import Mood, SelfModel
 
 logger = logging.getLogger(__name__)
 
@@ -91,8 +95,86 @@ LEVEL_CONFIGS: dict[AwarenessLevel, AwarenessConfig] = {
     ),
 }
 
-# Minimum seconds between transitions (debounce)
-_MIN_TRANSITION_GAP = 2.0
+# Minimum gap between transitions (debounce), monotonic ns
+_MIN_TRANSITION_GAP_NS = 2_000_000_000
+_NS_PER_S = 1_000_000_000
+
+
+# "OLD->NEW" pré-montado pra cada par de níveis (detail do SystemEvent)
+_TRANSITION_LABELS: dict[tuple[AwarenessLevel, AwarenessLevel], str] = {
+    (a, b): f"{a.name}->{b.name}" for a in AwarenessLevel for b in AwarenessLevel if a is not b
+}
+
+# -- evaluation rules (one per level) --
+# Each rule receives (mood, seconds in state) and returns (target, reason) or None.
+
+_DORMANT_WAKE_SOCIAL = 0.1
+_DORMANT_WAKE_ENGAGEMENT = 0.2
+_SENTINEL_PERSON_SOCIAL = 0.3
+_SENTINEL_IDLE_S = 600  # 10min idle
+_ATTENTIVE_FOCUS_ENGAGEMENT = 0.6
+_ATTENTIVE_ALONE_SOCIAL = 0.1
+_ATTENTIVE_ALONE_S = 60
+_FOCUSED_DROP_ENGAGEMENT = 0.3
+_FOCUSED_DROP_S = 30
+_CREATIVE_WAKE_SOCIAL = 0.2
+_CREATIVE_MAX_S = 300  # 5min dream max
+_ALERT_TIMEOUT_S = 60
+
+_Transition = tuple[AwarenessLevel, str]
+
+
+def _eval_dormant(mood: Mood, t: float) -> _Transition | None:
+    # wake up on any sound or detection
+    if mood.social > _DORMANT_WAKE_SOCIAL or mood.engagement > _DORMANT_WAKE_ENGAGEMENT:
+        return AwarenessLevel.SENTINEL, "wakeup"
+    return None
+
+
+def _eval_sentinel(mood: Mood, t: float) -> _Transition | None:
+    if mood.social > _SENTINEL_PERSON_SOCIAL:
+        return AwarenessLevel.ATTENTIVE, "person detected"
+    if t > _SENTINEL_IDLE_S:
+        return AwarenessLevel.CREATIVE, "idle->dream"
+    return None
+
+
+def _eval_attentive(mood: Mood, t: float) -> _Transition | None:
+    if mood.engagement > _ATTENTIVE_FOCUS_ENGAGEMENT:
+        return AwarenessLevel.FOCUSED, "high engagement"
+    if mood.social < _ATTENTIVE_ALONE_SOCIAL and t > _ATTENTIVE_ALONE_S:
+        return AwarenessLevel.SENTINEL, "no one around"
+    return None
+
+
+def _eval_focused(mood: Mood, t: float) -> _Transition | None:
+    if mood.engagement < _FOCUSED_DROP_ENGAGEMENT and t > _FOCUSED_DROP_S:
+        return AwarenessLevel.ATTENTIVE, "engagement dropped"
+    return None
+
+
+def _eval_creative(mood: Mood, t: float) -> _Transition | None:
+    if mood.social > _CREATIVE_WAKE_SOCIAL:
+        return AwarenessLevel.ATTENTIVE, "interaction during dream"
+    if t > _CREATIVE_MAX_S:
+        return AwarenessLevel.SENTINEL, "dream complete"
+    return None
+
+
+def _eval_alert(mood: Mood, t: float) -> _Transition | None:
+    if t > _ALERT_TIMEOUT_S:
+        return AwarenessLevel.ATTENTIVE, "alert timeout"
+    return None
+
+
+_EVAL_RULES: dict[AwarenessLevel, Callable[[Mood, float], _Transition | None]] = {
+    AwarenessLevel.DORMANT: _eval_dormant,
+    AwarenessLevel.SENTINEL: _eval_sentinel,
+    AwarenessLevel.ATTENTIVE: _eval_attentive,
+    AwarenessLevel.FOCUSED: _eval_focused,
+    AwarenessLevel.CREATIVE: _eval_creative,
+    AwarenessLevel.ALERT: _eval_alert,
+}
 
 
 @dataclass(slots=True)
@@ -100,9 +182,18 @@ class AwarenessStateMachine:
     """Manages Enton's cognitive mode based on environment and mood."""
 
     _state: AwarenessLevel = AwarenessLevel.SENTINEL
-    _last_transition: float = field(default_factory=time.time)
-    _state_enter_time: float = field(default_factory=time.time)
+    _last_transition: int = field(default_factory=time.monotonic_ns)
+    _state_enter_time: int = field(default_factory=time.monotonic_ns)
     _transition_count: int = 0
+    # LEVEL_CONFIGS[_state], atualizado só na troca de estado (config é lido por frame)
+    _current_config: AwarenessConfig = field(init=False)
+
+    def __post_init__(self) -> None:
+        self._current_config = LEVEL_CONFIGS[self._state]
+
+    def _set_state(self, new_state: AwarenessLevel) -> None:
+        self._state = new_state
+        self._current_config = LEVEL_CONFIGS[new_state]
 
     # -- properties --
 
@@ -112,11 +203,11 @@ class AwarenessStateMachine:
 
     @property
     def config(self) -> AwarenessConfig:
-        return LEVEL_CONFIGS[self._state]
+        return self._current_config
 
     @property
     def time_in_state(self) -> float:
-        return time.time() - self._state_enter_time
+        return (time.monotonic_ns() - self._state_enter_time) / _NS_PER_S
 
     @property
     def is_dreaming(self) -> bool:
@@ -137,20 +228,29 @@ class AwarenessStateMachine:
         new_state: AwarenessLevel,
         reason: str = "",
         bus: EventBus | None = None,
+        *,
+        force: bool = False,
     ) -> bool:
-        """Transition to a new awareness level. Returns True if transitioned."""
+        """Transition to a new awareness level. Returns True if transitioned.
+
+        Transitions closer than 2s are debounced, except when ``force`` is set
+        or the target is ALERT — alerts must land immediately.
+        """
         if new_state == self._state:
             return False
 
-        # debounce
-        elapsed = time.time() - self._last_transition
-        if elapsed < _MIN_TRANSITION_GAP:
+        now = time.monotonic_ns()
+        if (
+            not force
+            and new_state is not AwarenessLevel.ALERT
+            and now - self._last_transition < _MIN_TRANSITION_GAP_NS
+        ):
             return False
 
         old = self._state
-        self._state = new_state
-        self._last_transition = time.time()
-        self._state_enter_time = time.time()
+        self._set_state(new_state)
+        self._last_transition = now
+        self._state_enter_time = now
         self._transition_count += 1
 
         logger.info(
@@ -162,12 +262,11 @@ class AwarenessStateMachine:
         )
 
         if bus is not None:
-            from enton.core.events import SystemEvent
-
+            label = _TRANSITION_LABELS[old, new_state]
             bus.emit_nowait(
                 SystemEvent(
                     kind="awareness_change",
-                    detail=f"{old.name}->{new_state.name}: {reason}",
+                    detail=f"{label}: {reason}" if reason else label,
                 )
             )
 
@@ -175,46 +274,16 @@ class AwarenessStateMachine:
 
     def evaluate(self, self_model: SelfModel, bus: EventBus | None = None) -> None:
         """Evaluate transitions based on current state. Call periodically."""
-        mood = self_model.mood
-        t = self.time_in_state
-
-        if self._state == AwarenessLevel.DORMANT:
-            # wake up on any sound or detection
-            if mood.social > 0.1 or mood.engagement > 0.2:
-                self.transition(AwarenessLevel.SENTINEL, "wakeup", bus)
-
-        elif self._state == AwarenessLevel.SENTINEL:
-            if mood.social > 0.3:
-                self.transition(AwarenessLevel.ATTENTIVE, "person detected", bus)
-            elif t > 600:  # 10min idle
-                self.transition(AwarenessLevel.CREATIVE, "idle->dream", bus)
-
-        elif self._state == AwarenessLevel.ATTENTIVE:
-            if mood.engagement > 0.6:
-                self.transition(AwarenessLevel.FOCUSED, "high engagement", bus)
-            elif mood.social < 0.1 and t > 60:
-                self.transition(AwarenessLevel.SENTINEL, "no one around", bus)
-
-        elif self._state == AwarenessLevel.FOCUSED:
-            if mood.engagement < 0.3 and t > 30:
-                self.transition(AwarenessLevel.ATTENTIVE, "engagement dropped", bus)
-
-        elif self._state == AwarenessLevel.CREATIVE:
-            if mood.social > 0.2:
-                self.transition(
-                    AwarenessLevel.ATTENTIVE,
-                    "interaction during dream",
-                    bus,
-                )
-            elif t > 300:  # 5min dream max
-                self.transition(AwarenessLevel.SENTINEL, "dream complete", bus)
-
-        elif self._state == AwarenessLevel.ALERT and t > 60:
-            self.transition(AwarenessLevel.ATTENTIVE, "alert timeout", bus)
+        rule = _EVAL_RULES.get(self._state)
+        if rule is None:
+            return
+        result = rule(self_model.mood, self.time_in_state)
+        if result is not None:
+            self.transition(*result, bus)
 
     def trigger_alert(self, reason: str, bus: EventBus | None = None) -> None:
         """Force transition to ALERT (e.g. loud sound, unknown person)."""
-        self.transition(AwarenessLevel.ALERT, reason, bus)
+        self.transition(AwarenessLevel.ALERT, reason, bus, force=True)
 
     def on_interaction(self, bus: EventBus | None = None) -> None:
         """User interaction — ensure we're at least ATTENTIVE."""
@@ -237,12 +306,12 @@ class AwarenessStateMachine:
     def from_dict(self, data: dict) -> None:
         name = data.get("state", "SENTINEL")
         try:
-            self._state = AwarenessLevel[name]
+            self._set_state(AwarenessLevel[name])
         except KeyError:
-            self._state = AwarenessLevel.SENTINEL
+            self._set_state(AwarenessLevel.SENTINEL)
 
     def summary(self) -> str:
-        cfg = self.config
+        cfg = self._current_config
         return (
             f"[{self._state.name}] "
             f"vision={cfg.vision_fps}fps audio={'on' if cfg.audio else 'off'} "
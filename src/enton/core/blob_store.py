@@ -7,7 +7,10 @@ external HD with Qdrant metadata indexing and transparent fallback.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import itertools
 import logging
+import os
 import shutil
 import time
 import uuid
@@ -16,21 +19,36 @@ from enum import StrEnum
 from pathlib import Path
 from typing import Any
 
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.models import (
+    Direction,
     Distance,
     FieldCondition,
     Filter,
     MatchValue,
+    OrderBy,
     PayloadSchemaType,
     PointStruct,
     VectorParams,
 )
 
+from enton.core._embedders import nomic_embedder
+from enton.core.query_cache import EMBED_CACHE, QueryCache
+
 logger = logging.getLogger(__name__)
 
 BLOB_COLLECTION = "enton_blobs"
 EMBED_DIM = 768  # nomic-embed-text
+_PAYLOAD_INDEXES = (
+    ("timestamp", PayloadSchemaType.FLOAT),
+    ("blob_type", PayloadSchemaType.KEYWORD),
+)
+# (qdrant_url, collection) pairs already checked/created by this process
+_COLLECTIONS_ENSURED: set[tuple[str, str]] = set()
+# blob id suffix: per-process counter (random start, so restarts don't reuse suffixes)
+_ID_COUNTER = itertools.count(int.from_bytes(os.urandom(3)))
+_FLUSH_BATCH = 32  # upsert immediately once this many points are pending
+_FLUSH_DELAY_S = 0.25  # otherwise coalesce points for this long
 
 _MIME_MAP = {
     ".jpg": "image/jpeg",
@@ -42,6 +60,38 @@ _MIME_MAP = {
     ".webm": "video/webm",
     ".bin": "application/octet-stream",
 }
+# precomputed upper-case variants: ".JPG" from cameras/phones resolves without .lower()
+_MIME_MAP |= {ext.upper(): mime for ext, mime in _MIME_MAP.items()}
+_DEFAULT_MIME = "application/octet-stream"
+
+
+_COPY_CHUNK = 1 << 30
+_COPY_BUFSIZE = 4 * 1024 * 1024  # userspace fallback buffer (shutil default is 64 KiB)
+
+
+def _fast_copy(src: Path, dst: Path) -> None:
+    """copy2 with in-kernel copying: copy_file_range on one fs, sendfile across mounts."""
+    if not hasattr(os, "copy_file_range"):  # non-Linux
+        shutil.copy2(src, dst)
+        return
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        same_fs = os.fstat(in_fd).st_dev == os.fstat(out_fd).st_dev
+        try:
+            while True:
+                if same_fs:
+                    n = os.copy_file_range(in_fd, out_fd, _COPY_CHUNK)
+                else:
+                    n = os.sendfile(out_fd, in_fd, None, _COPY_CHUNK)
+                if n == 0:
+                    break
+        except OSError:
+            # filesystem without in-kernel copy support: restart in userspace
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            shutil.copyfileobj(fsrc, fdst, _COPY_BUFSIZE)
+    shutil.copystat(src, dst)
 
 
 class BlobType(StrEnum):
@@ -77,12 +127,22 @@ class BlobStore:
         self._root = Path(root)
         self._fallback = Path(fallback)
         self._qdrant_url = qdrant_url
-        self._qdrant: QdrantClient | None = None
+        self._qdrant: AsyncQdrantClient | None = None
+        self._qdrant_lock = asyncio.Lock()
         self._embedder: Any = None
         self._hd_available: bool | None = None
         self._last_check: float = 0.0
         self._check_interval = 60.0
-        self._ensure_dirs()
+        self._query_cache = QueryCache(dim=EMBED_DIM)
+        self._pending: list[PointStruct] = []
+        self._flush_task: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._dir_counts: dict[Path, tuple[int, int]] = {}  # dir -> (mtime_ns, count)
+        self._known_dirs: set[Path] = set()
+        # single probe at startup, also seeds the 60s availability cache
+        self._hd_available = self._check_hd()
+        self._last_check = time.time()
+        self._ensure_dirs(self._hd_available)
 
     # -- properties --
 
@@ -115,9 +175,7 @@ class BlobStore:
         blob_id = self._make_id()
         filename = f"{blob_id}{extension}"
         dest = self._resolve_path(blob_type, filename)
-        dest.parent.mkdir(parents=True, exist_ok=True)
-
-        await asyncio.to_thread(dest.write_bytes, data)
+        await self._ensure_parent(dest)
 
         meta = BlobMeta(
             blob_id=blob_id,
@@ -125,12 +183,20 @@ class BlobStore:
             path=str(dest),
             size_bytes=len(data),
             timestamp=time.time(),
-            mime_type=_MIME_MAP.get(extension, "application/octet-stream"),
+            mime_type=_MIME_MAP.get(extension, _DEFAULT_MIME),
             camera_id=camera_id,
             tags=tags or [],
             extra=extra or {},
         )
-        await self._index(meta)
+        # embed overlaps the disk write; the point is queued only once the write succeeded
+        written: asyncio.Future[bool] = asyncio.get_running_loop().create_future()
+        self._index_later(meta, written)
+        try:
+            await asyncio.to_thread(dest.write_bytes, data)
+        except BaseException:
+            written.set_result(False)
+            raise
+        written.set_result(True)
         logger.debug("BlobStore: stored %s (%d bytes)", dest.name, len(data))
         return meta
 
@@ -149,12 +215,12 @@ class BlobStore:
         blob_id = self._make_id()
         filename = f"{blob_id}{src.suffix}"
         dest = self._resolve_path(blob_type, filename)
-        dest.parent.mkdir(parents=True, exist_ok=True)
+        await self._ensure_parent(dest)
 
         if move:
             await asyncio.to_thread(shutil.move, str(src), str(dest))
         else:
-            await asyncio.to_thread(shutil.copy2, str(src), str(dest))
+            await asyncio.to_thread(_fast_copy, src, dest)
 
         size = await asyncio.to_thread(lambda: dest.stat().st_size)
         meta = BlobMeta(
@@ -163,12 +229,12 @@ class BlobStore:
             path=str(dest),
             size_bytes=size,
             timestamp=time.time(),
-            mime_type=_MIME_MAP.get(src.suffix, "application/octet-stream"),
+            mime_type=_MIME_MAP.get(src.suffix, _DEFAULT_MIME),
             camera_id=camera_id,
             tags=tags or [],
             extra=extra or {},
         )
-        await self._index(meta)
+        self._index_later(meta)
         return meta
 
     async def search(
@@ -177,11 +243,22 @@ class BlobStore:
         blob_type: BlobType | None = None,
         n: int = 10,
     ) -> list[BlobMeta]:
-        """Semantic search via Qdrant."""
+        """Semantic search via Qdrant (recent/near-duplicate queries hit the cache)."""
+        scope = f"{blob_type.value if blob_type else ''}:{n}"
+        cached = self._query_cache.get_exact(query, scope)
+        if cached is not None:
+            return cached
+
         embedding = await self._embed_text(query)
-        if not embedding or not self._init_qdrant():
+        if not embedding or not await self._init_qdrant():
             return []
 
+        vec = QueryCache.normalize(embedding)
+        if vec is not None:
+            cached = self._query_cache.lookup(vec, scope)
+            if cached is not None:
+                return cached
+
         try:
             filt = None
             if blob_type:
@@ -190,16 +267,19 @@ class BlobStore:
                         FieldCondition(key="blob_type", match=MatchValue(value=blob_type.value)),
                     ]
                 )
-            response = self._qdrant.query_points(
+            response = await self._qdrant.query_points(
                 collection_name=BLOB_COLLECTION,
                 query=embedding,
                 limit=n,
                 query_filter=filt,
             )
-            return [self._payload_to_meta(r.payload) for r in response.points]
+            results = [self._payload_to_meta(r.payload) for r in response.points]
         except Exception:
             logger.warning("BlobStore search failed")
             return []
+        if vec is not None:
+            self._query_cache.put(query, vec, results, scope)
+        return results
 
     async def recent(
         self,
@@ -207,7 +287,7 @@ class BlobStore:
         n: int = 10,
     ) -> list[BlobMeta]:
         """Get N most recent blobs via Qdrant scroll."""
-        if not self._init_qdrant():
+        if not await self._init_qdrant():
             return []
         try:
             filt = None
@@ -217,15 +297,14 @@ class BlobStore:
                         FieldCondition(key="blob_type", match=MatchValue(value=blob_type.value)),
                     ]
                 )
-            # Fetch more than needed, sort in Python by timestamp
-            fetch_limit = min(n * 3, 100)
-            results, _ = self._qdrant.scroll(
+            # Server-side ordering over the timestamp payload index
+            results, _ = await self._qdrant.scroll(
                 collection_name=BLOB_COLLECTION,
                 scroll_filter=filt,
-                limit=fetch_limit,
+                limit=n,
+                order_by=OrderBy(key="timestamp", direction=Direction.DESC),
             )
-            metas = [self._payload_to_meta(r.payload) for r in results]
-            return sorted(metas, key=lambda m: m.timestamp, reverse=True)[:n]
+            return [self._payload_to_meta(r.payload) for r in results]
         except Exception:
             logger.warning("BlobStore recent query failed")
             return []
@@ -233,19 +312,17 @@ class BlobStore:
     async def stats(self) -> dict[str, Any]:
         """Storage stats: free space, counts by type."""
         root = self.active_root
-        try:
-            usage = await asyncio.to_thread(shutil.disk_usage, str(root))
-            free_gb = round(usage.free / (1024**3), 1)
-        except Exception:
-            free_gb = -1
-
-        counts: dict[str, int] = {}
-        for bt in BlobType:
-            d = root / bt.value
-            if d.exists():
-                counts[bt.value] = len(list(d.iterdir()))
-            else:
-                counts[bt.value] = 0
+        # disk_usage + one scandir per type run concurrently in worker threads
+        usage, *type_counts = await asyncio.gather(
+            asyncio.to_thread(shutil.disk_usage, str(root)),
+            *(asyncio.to_thread(self._count_dir, root / bt.value) for bt in BlobType),
+            return_exceptions=True,
+        )
+        free_gb = -1 if isinstance(usage, BaseException) else round(usage.free / (1024**3), 1)
+        counts = {
+            bt.value: 0 if isinstance(c, BaseException) else c
+            for bt, c in zip(BlobType, type_counts, strict=True)
+        }
 
         return {
             "root": str(root),
@@ -254,12 +331,39 @@ class BlobStore:
             "counts": counts,
         }
 
+    async def flush(self) -> None:
+        """Finish in-flight indexing and upsert pending points now (call on shutdown)."""
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self._flush_now()
+
     # -- internals --
 
+    async def _ensure_parent(self, dest: Path) -> None:
+        """mkdir a blob's parent once; later stores skip the syscall."""
+        parent = dest.parent
+        if parent not in self._known_dirs:
+            await asyncio.to_thread(parent.mkdir, parents=True, exist_ok=True)
+            self._known_dirs.add(parent)
+
+    def _count_dir(self, d: Path) -> int:
+        """Entries in a blob-type dir; rescans only when its mtime changed."""
+        try:
+            mtime = d.stat().st_mtime_ns
+        except OSError:
+            return 0
+        cached = self._dir_counts.get(d)
+        # mtime granularity is coarse on some filesystems: only trust settled dirs
+        settled = time.time_ns() - mtime > 1_000_000_000
+        if cached is not None and cached[0] == mtime and settled:
+            return cached[1]
+        with os.scandir(d) as it:
+            n = sum(1 for _ in it)
+        self._dir_counts[d] = (mtime, n)
+        return n
+
     def _make_id(self) -> str:
-        ts = int(time.time() * 1000)
-        short = uuid.uuid4().hex[:6]
-        return f"{ts}_{short}"
+        return f"{time.time_ns() // 1_000_000}_{next(_ID_COUNTER) & 0xFFFFFF:06x}"
 
     def _resolve_path(self, blob_type: BlobType, filename: str) -> Path:
         return self.active_root / blob_type.value / filename
@@ -273,60 +377,65 @@ class BlobStore:
                 return False
             # Create our subdirectory if mount point is writable
             self._root.mkdir(parents=True, exist_ok=True)
-            test = self._root / ".probe"
-            test.write_text("ok")
-            test.unlink()
+            if not os.access(self._root, os.W_OK):
+                raise PermissionError(self._root)
             return True
         except Exception:
             logger.warning("BlobStore: HD not writable at %s, using fallback", self._root)
             return False
 
-    def _ensure_dirs(self) -> None:
-        root = self._root if self._check_hd() else self._fallback
+    def _ensure_dirs(self, hd_available: bool) -> None:
+        root = self._root if hd_available else self._fallback
         for bt in BlobType:
             (root / bt.value).mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(root / bt.value)
         status = "HD" if root == self._root else "fallback"
         logger.info("BlobStore: ready at %s (%s)", root, status)
 
-    def _init_qdrant(self) -> bool:
+    async def _init_qdrant(self) -> bool:
         if self._qdrant is not None:
             return True
-        try:
-            client = QdrantClient(url=self._qdrant_url, timeout=5)
-            collections = [c.name for c in client.get_collections().collections]
-            if BLOB_COLLECTION not in collections:
-                client.create_collection(
-                    collection_name=BLOB_COLLECTION,
-                    vectors_config=VectorParams(size=EMBED_DIM, distance=Distance.COSINE),
-                )
-                logger.info("Created Qdrant collection '%s'", BLOB_COLLECTION)
-            # Create payload indexes for filtering and ordering
+        async with self._qdrant_lock:  # concurrent index tasks share one client
+            if self._qdrant is not None:
+                return True
             try:
-                client.create_payload_index(
-                    collection_name=BLOB_COLLECTION,
-                    field_name="timestamp",
-                    field_schema=PayloadSchemaType.FLOAT,
-                )
-                client.create_payload_index(
+                client = AsyncQdrantClient(url=self._qdrant_url, timeout=5)
+                key = (self._qdrant_url, BLOB_COLLECTION)
+                if key not in _COLLECTIONS_ENSURED:
+                    await self._ensure_collection(client)
+                    _COLLECTIONS_ENSURED.add(key)
+                self._qdrant = client
+                return True
+            except Exception:
+                logger.debug("Qdrant unavailable for BlobStore")
+                return False
+
+    @staticmethod
+    async def _ensure_collection(client: AsyncQdrantClient) -> None:
+        """Create collection + payload indexes (once per process per server)."""
+        collections = [c.name for c in (await client.get_collections()).collections]
+        if BLOB_COLLECTION not in collections:
+            await client.create_collection(
+                collection_name=BLOB_COLLECTION,
+                vectors_config=VectorParams(size=EMBED_DIM, distance=Distance.COSINE),
+            )
+            logger.info("Created Qdrant collection '%s'", BLOB_COLLECTION)
+        # Create payload indexes for filtering and ordering
+        for field_name, schema in _PAYLOAD_INDEXES:
+            try:
+                await client.create_payload_index(
                     collection_name=BLOB_COLLECTION,
-                    field_name="blob_type",
-                    field_schema=PayloadSchemaType.KEYWORD,
+                    field_name=field_name,
+                    field_schema=schema,
                 )
             except Exception:
-                pass  # indexes may already exist
-            self._qdrant = client
-            return True
-        except Exception:
-            logger.debug("Qdrant unavailable for BlobStore")
-            return False
+                pass  # index may already exist
 
     def _init_embedder(self) -> bool:
         if self._embedder is not None:
             return True
         try:
-            from agno.knowledge.embedder.ollama import OllamaEmbedder
-
-            self._embedder = OllamaEmbedder(id="nomic-embed-text", dimensions=EMBED_DIM)
+            self._embedder = nomic_embedder()
             return True
         except Exception:
             logger.debug("OllamaEmbedder unavailable for BlobStore")
@@ -336,31 +445,83 @@ class BlobStore:
         if not self._init_embedder():
             return None
         try:
-            result = await asyncio.to_thread(self._embedder.get_embedding, text)
-            return result
+            return await EMBED_CACHE.aembed(self._embedder, text)
         except Exception:
             logger.debug("BlobStore embedding failed")
             return None
 
-    async def _index(self, meta: BlobMeta) -> None:
-        """Index blob metadata in Qdrant."""
-        if not self._init_qdrant():
+    def _index_later(
+        self, meta: BlobMeta, written: asyncio.Future[bool] | None = None
+    ) -> asyncio.Task:
+        """Index in the background, keeping a strong ref until done."""
+        task = asyncio.create_task(self._index(meta, written))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+        return task
+
+    async def _index(self, meta: BlobMeta, written: asyncio.Future[bool] | None = None) -> None:
+        """Queue blob metadata for the next batched Qdrant upsert.
+
+        With ``written``, the point is queued only if that future resolves True
+        (the blob file was fully written).
+        """
+        if not await self._init_qdrant():
             return
 
-        # Build searchable text from tags + type + camera
-        search_text = " ".join(
-            [
-                meta.blob_type.value,
-                meta.camera_id,
-                *meta.tags,
-                *[f"{k}={v}" for k, v in meta.extra.items() if isinstance(v, str)],
-            ]
-        )
-        embedding = await self._embed_text(search_text)
+        extras = [f"{k}={v}" for k, v in meta.extra.items() if isinstance(v, str)]
+        # Build searchable text from tags + type + camera. Untagged blobs of one
+        # (type, camera) share the same text, so EMBED_CACHE serves them.
+        search_text = " ".join([meta.blob_type.value, meta.camera_id, *meta.tags, *extras])
+        embedding = await self._embed_text(search_text.strip())
         if not embedding:
             return
+        if written is not None and not await written:
+            return  # escrita falhou: sem arquivo, sem ponto
+
+        payload = self._meta_to_payload(meta)
+        point_id = self._point_id(meta.blob_id)
+        self._pending.append(PointStruct(id=point_id, vector=embedding, payload=payload))
+        if len(self._pending) >= _FLUSH_BATCH:
+            await self._flush_now()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(_FLUSH_DELAY_S))
+
+    async def _flush_now(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        await self._upsert_pending()
+
+    async def _flush_after(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # past this point flush() must not cancel us mid-upsert
+        self._flush_task = None
+        await self._upsert_pending()
+
+    async def _upsert_pending(self) -> None:
+        """Send all pending points to Qdrant in a single upsert."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            await self._qdrant.upsert(
+                collection_name=BLOB_COLLECTION,
+                points=batch,
+            )
+        except Exception:
+            logger.debug("BlobStore Qdrant indexing failed (%d points)", len(batch))
+            return
+        # new points may belong in any cached result list
+        self._query_cache.clear()
 
-        payload = {
+    @staticmethod
+    def _point_id(blob_id: str) -> str:
+        """Deterministic point id: re-indexing a blob overwrites instead of duplicating."""
+        return uuid.UUID(bytes=hashlib.blake2b(blob_id.encode(), digest_size=16).digest()).hex
+
+    @staticmethod
+    def _meta_to_payload(meta: BlobMeta) -> dict[str, Any]:
+        return {
             "blob_id": meta.blob_id,
             "blob_type": meta.blob_type.value,
             "path": meta.path,
@@ -371,22 +532,22 @@ class BlobStore:
             "tags": meta.tags,
         }
 
-        try:
-            self._qdrant.upsert(
-                collection_name=BLOB_COLLECTION,
-                points=[
-                    PointStruct(
-                        id=uuid.uuid4().hex,
-                        vector=embedding,
-                        payload=payload,
-                    )
-                ],
-            )
-        except Exception:
-            logger.debug("BlobStore Qdrant indexing failed")
-
     @staticmethod
     def _payload_to_meta(payload: dict) -> BlobMeta:
+        try:
+            # fast path: every key is written by _meta_to_payload
+            return BlobMeta(
+                payload["blob_id"],
+                BlobType(payload["blob_type"]),
+                payload["path"],
+                payload["size_bytes"],
+                payload["timestamp"],
+                payload["mime_type"],
+                payload["camera_id"],
+                payload["tags"] or [],
+            )
+        except KeyError:
+            pass
         return BlobMeta(
             blob_id=payload.get("blob_id", ""),
             blob_type=BlobType(payload.get("blob_type", "images")),
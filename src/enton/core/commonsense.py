@@ -6,12 +6,15 @@ exists (populated by scripts/load_commonsense.py).
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
-from agno.knowledge.embedder.ollama import OllamaEmbedder
 from qdrant_client import QdrantClient
 
+from enton.core._embedders import nomic_embedder
+from enton.core.query_cache import EMBED_CACHE, QueryCache
+
 logger = logging.getLogger(__name__)
 
 COMMONSENSE_COLLECTION = "enton_commonsense"
@@ -26,6 +29,7 @@ class CommonsenseKB:
         self._qdrant: Any = None
         self._embedder: Any = None
         self._available: bool | None = None
+        self._query_cache = QueryCache(dim=EMBED_DIM)
 
     def _init_qdrant(self) -> bool:
         """Check if commonsense collection exists."""
@@ -57,10 +61,7 @@ class CommonsenseKB:
         if self._embedder is not None:
             return self._embedder
         try:
-            self._embedder = OllamaEmbedder(
-                id="nomic-embed-text",
-                dimensions=EMBED_DIM,
-            )
+            self._embedder = nomic_embedder()
             return self._embedder
         except Exception:
             return None
@@ -70,21 +71,34 @@ class CommonsenseKB:
         if not self._init_qdrant():
             return []
 
+        scope = str(n)
+        cached = self._query_cache.get_exact(query, scope)
+        if cached is not None:
+            return cached
+
         embedder = self._get_embedder()
         if embedder is None:
             return []
 
         try:
-            embedding = embedder.get_embedding(query)
+            embedding = await EMBED_CACHE.aembed(embedder, query)
             if embedding is None:
                 return []
 
-            response = self._qdrant.query_points(
+            vec = QueryCache.normalize(embedding)
+            if vec is not None:
+                cached = self._query_cache.lookup(vec, scope)
+                if cached is not None:
+                    return cached
+
+            # sync Qdrant client: keep the round trip off the event loop
+            response = await asyncio.to_thread(
+                self._qdrant.query_points,
                 collection_name=COMMONSENSE_COLLECTION,
                 query=embedding,
                 limit=n,
             )
-            return [
+            results = [
                 {
                     "subject": r.payload.get("subject", ""),
                     "predicate": r.payload.get("predicate", ""),
@@ -96,6 +110,9 @@ class CommonsenseKB:
         except Exception:
             logger.warning("Commonsense search failed")
             return []
+        if vec is not None:
+            self._query_cache.put(query, vec, results, scope)
+        return results
 
     async def what_is(self, concept: str, n: int = 3) -> list[str]:
         """Get commonsense facts about a concept as natural language."""
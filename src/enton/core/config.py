@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 from enum import StrEnum
 from pathlib import Path
 
@@ -94,6 +95,13 @@ class Settings(BaseSettings):
     brain_timeout: float = 30.0
     brain_max_turns: int = 5
 
+    # Sub-agents — cache semântico de respostas (desligado: tasks de vision/system
+    # dependem do estado atual do mundo e não devem ser reaproveitadas às cegas)
+    sub_agent_cache_enabled: bool = False
+    sub_agent_cache_threshold: float = 0.92
+    sub_agent_cache_max_entries: int = 500
+    sub_agent_warmup: bool = True  # 1 probe por role no boot (aquece prefix cache)
+
     # Vision
     yolo_model: str = "models/yolo11s.pt"
     yolo_confidence: float = 0.35
@@ -185,7 +193,10 @@ class Settings(BaseSettings):
     # Metrics
     metrics_interval: float = 10.0
 
-    @property
+    # Derived values below are parsed once per instance (cached_property): the
+    # settings singleton is treated as immutable after construction.
+
+    @functools.cached_property
     def camera_url(self) -> str | int:
         if self.camera_source.isdigit():
             return int(self.camera_source)
@@ -193,28 +204,27 @@ class Settings(BaseSettings):
             return self.camera_source
         return f"rtsp://{self.camera_ip}:{self.camera_rtsp_port}{self.camera_rtsp_path}"
 
-    @property
+    @functools.cached_property
     def camera_sources(self) -> dict[str, str | int]:
         """Parse multi-camera config into {id: source} dict."""
         if self.cameras:
             result: dict[str, str | int] = {}
             for entry in self.cameras.split(","):
-                entry = entry.strip()
-                if ":" in entry:
-                    cam_id, source = entry.split(":", 1)
-                    result[cam_id.strip()] = (
-                        int(source) if source.strip().isdigit() else source.strip()
-                    )
+                cam_id, sep, source = entry.partition(":")
+                if not sep:
+                    continue
+                source = source.strip()
+                result[cam_id.strip()] = int(source) if source.isdigit() else source
             if result:
                 return result
         # Fallback: single camera from camera_source
         return {"main": self.camera_url}
 
-    @property
+    @functools.cached_property
     def yolo_model_path(self) -> Path:
         return self._resolve_engine(self.yolo_model)
 
-    @property
+    @functools.cached_property
     def yolo_pose_model_path(self) -> Path:
         return self._resolve_engine(self.yolo_pose_model)
 
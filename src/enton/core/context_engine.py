@@ -14,18 +14,87 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import queue
+import threading
 import time
 import uuid
+from collections import Counter
 from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # checkpoints stay uncompressed
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:  # JSON checkpoints only
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 # Rough token estimation: 1 token ≈ 4 chars for English, ~3 for Portuguese
 _CHARS_PER_TOKEN = 3.5
+# assemble() partial-sort floor: below this many entries just sort everything
+_ASSEMBLE_MIN_K = 16
+# recency shifts scores slowly; an unchanged context reassembles identically
+# within this window, so assemble() reuses the last string
+_ASSEMBLE_CACHE_TTL = 1.0
+
+
+def _dump_json(data: dict) -> bytes:
+    """Serialize a checkpoint straight to UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _load_json(raw: bytes) -> dict:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# On-disk checkpoint formats, detected by suffix (plain JSON stays readable)
+_CHECKPOINT_SUFFIXES = (".json", ".json.zst", ".msgpack", ".msgpack.zst")
+_SUFFIXES_LONGEST_FIRST = sorted(_CHECKPOINT_SUFFIXES, key=len, reverse=True)
+_ZSTD_LEVEL = 3
+_DECODE_ERRORS: tuple[type[Exception], ...] = (ValueError, KeyError)
+if zstandard is not None:
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+def _split_checkpoint_name(name: str) -> tuple[str, str] | None:
+    """'abc.json.zst' -> ('abc', '.json.zst'); None for unrelated files."""
+    for suffix in _SUFFIXES_LONGEST_FIRST:
+        if name.endswith(suffix):
+            return name[: -len(suffix)], suffix
+    return None
+
+
+def _read_checkpoint_file(path: Path) -> dict:
+    raw = path.read_bytes()
+    if path.name.endswith(".zst"):
+        if zstandard is None:
+            raise ValueError(f"zstandard not installed, cannot read {path.name}")
+        raw = zstandard.ZstdDecompressor().decompress(raw)
+    if path.name.endswith((".msgpack", ".msgpack.zst")):
+        if msgpack is None:
+            raise ValueError(f"msgpack not installed, cannot read {path.name}")
+        return msgpack.unpackb(raw, raw=False)
+    return _load_json(raw)
 
 
-@dataclass
+@dataclass(slots=True)
 class ContextEntry:
     """A single piece of context with metadata."""
 
@@ -39,13 +108,16 @@ class ContextEntry:
 
     def __post_init__(self) -> None:
         if self.token_estimate == 0:
-            self.token_estimate = int(len(self.content) / _CHARS_PER_TOKEN)
+            # integer form of len / _CHARS_PER_TOKEN (3.5 = 7/2), no float round trip
+            self.token_estimate = len(self.content) * 2 // 7
 
     @property
     def is_stale(self) -> bool:
-        if self.ttl <= 0:
-            return False
-        return (time.time() - self.timestamp) > self.ttl
+        return self.is_stale_at(time.time())
+
+    def is_stale_at(self, now: float) -> bool:
+        """is_stale against a caller-provided clock snapshot (bulk passes)."""
+        return self.ttl > 0 and (now - self.timestamp) > self.ttl
 
     @property
     def age_seconds(self) -> float:
@@ -59,16 +131,41 @@ class ContextEntry:
         return self.priority * 0.7 + recency * 0.3
 
 
-@dataclass
+@dataclass(slots=True)
 class Checkpoint:
-    """Saved context state for restore."""
+    """Saved context state for restore.
+
+    ``entries`` is columnar: one parallel list per _ENTRY_COLUMNS field.
+    """
 
     id: str
     name: str
-    entries: list[dict]
+    entries: dict[str, list]
     metadata: dict
     created_at: float = field(default_factory=time.time)
 
+    @property
+    def entry_count(self) -> int:
+        return len(self.entries["key"])
+
+
+_ENTRY_COLUMNS = ("key", "content", "category", "priority", "ttl")
+_ENTRY_DEFAULTS = {"category": "system", "priority": 0.5, "ttl": 0.0}
+
+
+def _as_columns(entries: dict | list) -> dict[str, list]:
+    """Normalize stored entries to columns (older checkpoints are a list of dicts)."""
+    if isinstance(entries, dict):
+        n = len(entries.get("key", ()))
+        return {
+            col: entries[col] if col in entries else [_ENTRY_DEFAULTS[col]] * n
+            for col in _ENTRY_COLUMNS
+        }
+    return {
+        col: [row[col] if col in row else _ENTRY_DEFAULTS[col] for row in entries]
+        for col in _ENTRY_COLUMNS
+    }
+
 
 class ContextEngine:
     """Manages context budget for LLM interactions.
@@ -81,12 +178,39 @@ class ContextEngine:
         self,
         max_tokens: int = 8000,
         checkpoint_dir: Path | None = None,
+        *,
+        compress: bool = False,
+        checkpoint_format: str = "json",
     ) -> None:
         self._entries: dict[str, ContextEntry] = {}
+        self._total_tokens = 0  # running sum of token_estimate over _entries
+        self._generation = 0  # bumped on every change to _entries
+        self._assemble_cache: tuple[int, int, float, str] | None = None
+        self._by_category_cache: tuple[int, frozenset[str], dict[str, str]] | None = None
         self._max_tokens = max_tokens
+        # polled often (budget_used_pct / rot_score): multiply, don't divide
+        self._inv_max_tokens = 1.0 / max_tokens if max_tokens > 0 else 0.0
         self._checkpoint_dir = checkpoint_dir
         self._checkpoints: dict[str, Checkpoint] = {}
         self._total_compressions = 0
+        # zstd-compressed checkpoints (.json.zst) when requested and available
+        self._zstd = None
+        if compress:
+            if zstandard is not None:
+                self._zstd = zstandard.ZstdCompressor(level=_ZSTD_LEVEL)
+            else:
+                logger.warning("zstandard not installed; checkpoints stay uncompressed")
+
+        # "msgpack": ~1/3 the bytes of indented JSON and faster to parse
+        if checkpoint_format == "msgpack" and msgpack is None:
+            logger.warning("msgpack not installed; checkpoints stay JSON")
+            checkpoint_format = "json"
+        self._format = checkpoint_format
+
+        # disk writes go to a daemon thread, started on the first checkpoint
+        self._write_queue: queue.Queue[tuple[Path, dict]] | None = None
+        # name -> mtime of on-disk files that failed to decode (skip until touched)
+        self._disk_scan_cache: dict[str, float] = {}
 
         if checkpoint_dir:
             checkpoint_dir.mkdir(parents=True, exist_ok=True)
@@ -104,17 +228,28 @@ class ContextEngine:
         ttl: float = 0.0,
     ) -> None:
         """Set/update a context entry."""
-        self._entries[key] = ContextEntry(
+        entry = ContextEntry(
             key=key,
             content=content,
             category=category,
             priority=priority,
             ttl=ttl,
         )
+        old = self._entries.get(key)
+        if old is not None:
+            self._total_tokens -= old.token_estimate
+        self._entries[key] = entry
+        self._total_tokens += entry.token_estimate
+        self._generation += 1
 
     def remove(self, key: str) -> bool:
         """Remove a context entry."""
-        return self._entries.pop(key, None) is not None
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._total_tokens -= entry.token_estimate
+        self._generation += 1
+        return True
 
     def get(self, key: str) -> str | None:
         """Get context content by key."""
@@ -125,9 +260,12 @@ class ContextEngine:
 
     def _cleanup_stale(self) -> int:
         """Remove expired entries. Returns count removed."""
-        stale = [k for k, v in self._entries.items() if v.is_stale]
+        now = time.time()
+        stale = [k for k, v in self._entries.items() if v.is_stale_at(now)]
         for k in stale:
-            del self._entries[k]
+            self._total_tokens -= self._entries.pop(k).token_estimate
+        if stale:
+            self._generation += 1
         return len(stale)
 
     # ------------------------------------------------------------------ #
@@ -136,19 +274,17 @@ class ContextEngine:
 
     @property
     def current_tokens(self) -> int:
-        """Estimated total tokens in all entries."""
-        return sum(e.token_estimate for e in self._entries.values())
+        """Estimated total tokens in all entries (kept incrementally)."""
+        return self._total_tokens
 
     @property
     def budget_used_pct(self) -> float:
         """Percentage of token budget used."""
-        if self._max_tokens <= 0:
-            return 0.0
-        return min(100.0, self.current_tokens / self._max_tokens * 100)
+        return min(100.0, self._total_tokens * self._inv_max_tokens * 100)
 
     @property
     def is_over_budget(self) -> bool:
-        return self.current_tokens > self._max_tokens
+        return self._total_tokens > self._max_tokens
 
     def assemble(self, extra_budget: int = 0) -> str:
         """Assemble context string within token budget.
@@ -156,25 +292,83 @@ class ContextEngine:
         Entries are sorted by relevance score. Lower-priority entries
         are dropped if we exceed the budget.
         """
-        self._cleanup_stale()
-        budget = self._max_tokens + extra_budget
-
-        # Sort by relevance (highest first)
-        entries = sorted(
-            self._entries.values(),
-            key=lambda e: e.relevance_score(),
-            reverse=True,
+        # One sweep over _entries feeds stale eviction, scoring and the
+        # tail-fit check (columns: priority, timestamp, ttl, tokens).
+        now = time.time()
+        entries = list(self._entries.values())
+        cols = np.fromiter(
+            ((e.priority, e.timestamp, e.ttl, e.token_estimate) for e in entries),
+            dtype=np.dtype((np.float64, 4)),
+            count=len(entries),
         )
+        prio, age, ttl, tokens = cols[:, 0], now - cols[:, 1], cols[:, 2], cols[:, 3]
+        stale = (ttl > 0) & (age > ttl)
+        if stale.any():
+            for i in np.flatnonzero(stale):
+                self._total_tokens -= self._entries.pop(entries[i].key).token_estimate
+            self._generation += 1
+            keep = np.flatnonzero(~stale)
+            entries = [entries[i] for i in keep]
+            prio, age, tokens = prio[keep], age[keep], tokens[keep]
+
+        mono = time.monotonic()
+        cached = self._assemble_cache
+        if (
+            cached is not None
+            and cached[0] == self._generation
+            and cached[1] == extra_budget
+            and mono - cached[2] < _ASSEMBLE_CACHE_TTL
+        ):
+            return cached[3]
+        budget = self._max_tokens + extra_budget
 
+        # same formula as _relevance_scores
+        neg_scores = -(prio * 0.7 + 0.3 / (1.0 + age / 300.0))
+        n = len(entries)
+
+        # Only the top-k (about what the budget can hold, x2) gets fully
+        # sorted; the tail is sorted only if something there still fits.
+        avg = self._total_tokens // max(1, n)
+        k = max(_ASSEMBLE_MIN_K, (budget // max(1, avg)) * 2)
+        if k < n:
+            split = np.argpartition(neg_scores, k)
+            head, tail = split[:k], split[k:]
+        else:
+            head, tail = np.arange(n), None
+
+        # flat list of the entries' own strings, joined once at the end:
+        # no per-entry f-string objects
         parts: list[str] = []
+        extend = parts.extend
+        sep = ""
         used = 0
-        for entry in entries:
-            if used + entry.token_estimate > budget:
-                continue  # skip low-relevance entries
-            parts.append(f"[{entry.category}:{entry.key}] {entry.content}")
-            used += entry.token_estimate
-
-        return "\n".join(parts)
+        for order in (head, tail):
+            if order is None:
+                break
+            if order is tail and not (tokens[tail] <= budget - used).any():
+                break
+            # highest relevance first; stable like sorted(reverse=True)
+            for i in order[np.argsort(neg_scores[order], kind="stable")]:
+                entry = entries[i]
+                if used + entry.token_estimate > budget:
+                    continue  # skip low-relevance entries
+                extend((sep, "[", entry.category, ":", entry.key, "] ", entry.content))
+                sep = "\n"
+                used += entry.token_estimate
+
+        result = "".join(parts)
+        self._assemble_cache = (self._generation, extra_budget, mono, result)
+        return result
+
+    @staticmethod
+    def _relevance_scores(entries: list[ContextEntry], now: float | None = None) -> np.ndarray:
+        """Vectorized ContextEntry.relevance_score over entries (one clock read)."""
+        if now is None:
+            now = time.time()
+        n = len(entries)
+        prio = np.fromiter((e.priority for e in entries), dtype=np.float64, count=n)
+        ts = np.fromiter((e.timestamp for e in entries), dtype=np.float64, count=n)
+        return prio * 0.7 + 0.3 / (1.0 + (now - ts) / 300.0)
 
     def assemble_by_category(
         self,
@@ -182,12 +376,18 @@ class ContextEngine:
     ) -> dict[str, str]:
         """Assemble context grouped by category."""
         self._cleanup_stale()
+        wanted = frozenset(categories or ())
+        cached = self._by_category_cache
+        if cached is not None and cached[0] == self._generation and cached[1] == wanted:
+            return dict(cached[2])
         groups: dict[str, list[str]] = {}
         for entry in self._entries.values():
-            if categories and entry.category not in categories:
+            if wanted and entry.category not in wanted:
                 continue
             groups.setdefault(entry.category, []).append(entry.content)
-        return {cat: "\n".join(items) for cat, items in groups.items()}
+        result = {cat: "\n".join(items) for cat, items in groups.items()}
+        self._by_category_cache = (self._generation, wanted, result)
+        return dict(result)
 
     # ------------------------------------------------------------------ #
     # Checkpointing (wcgw-inspired)
@@ -199,16 +399,14 @@ class ContextEngine:
         Returns checkpoint ID.
         """
         cp_id = uuid.uuid4().hex[:12]
-        entries_data = [
-            {
-                "key": e.key,
-                "content": e.content,
-                "category": e.category,
-                "priority": e.priority,
-                "ttl": e.ttl,
-            }
-            for e in self._entries.values()
-        ]
+        values = self._entries.values()
+        entries_data = {
+            "key": [e.key for e in values],
+            "content": [e.content for e in values],
+            "category": [e.category for e in values],
+            "priority": [e.priority for e in values],
+            "ttl": [e.ttl for e in values],
+        }
         cp = Checkpoint(
             id=cp_id,
             name=name,
@@ -219,38 +417,69 @@ class ContextEngine:
 
         # Persist to disk if checkpoint dir configured
         if self._checkpoint_dir:
-            path = self._checkpoint_dir / f"{cp_id}.json"
-            path.write_text(
-                json.dumps(
-                    {
-                        "id": cp.id,
-                        "name": cp.name,
-                        "entries": cp.entries,
-                        "metadata": cp.metadata,
-                        "created_at": cp.created_at,
-                    },
-                    ensure_ascii=False,
-                    indent=2,
-                ),
-                encoding="utf-8",
-            )
-            logger.info("Checkpoint saved: %s → %s", name, path)
+            data = {
+                "id": cp.id,
+                "name": cp.name,
+                "entries": cp.entries,
+                "metadata": cp.metadata,
+                "created_at": cp.created_at,
+            }
+            suffix = ".msgpack" if self._format == "msgpack" else ".json"
+            if self._zstd is not None:
+                suffix += ".zst"
+            self._enqueue_write(self._checkpoint_dir / f"{cp_id}{suffix}", data)
 
         return cp_id
 
+    def flush(self) -> None:
+        """Block until every queued checkpoint is on disk."""
+        if self._write_queue is not None:
+            self._write_queue.join()
+
+    def _enqueue_write(self, path: Path, data: dict) -> None:
+        if self._write_queue is None:
+            self._write_queue = queue.Queue()
+            threading.Thread(
+                target=self._checkpoint_writer_loop,
+                args=(self._write_queue,),
+                name="checkpoint-writer",
+                daemon=True,
+            ).start()
+        self._write_queue.put((path, data))
+
+    def _encode_checkpoint(self, data: dict) -> bytes:
+        if self._format == "msgpack":
+            payload = msgpack.packb(data, use_bin_type=True)
+        else:
+            payload = _dump_json(data)
+        if self._zstd is not None:
+            payload = self._zstd.compress(payload)
+        return payload
+
+    def _checkpoint_writer_loop(self, q: queue.Queue[tuple[Path, dict]]) -> None:
+        while True:
+            path, data = q.get()
+            try:
+                path.write_bytes(self._encode_checkpoint(data))
+                logger.info("Checkpoint saved: %s → %s", data["name"], path)
+            except Exception:
+                logger.exception("Checkpoint write failed: %s", path)
+            finally:
+                q.task_done()
+
     def restore(self, checkpoint_id: str) -> bool:
         """Restore context from a checkpoint."""
         cp = self._checkpoints.get(checkpoint_id)
 
         # Try loading from disk
         if not cp and self._checkpoint_dir:
-            path = self._checkpoint_dir / f"{checkpoint_id}.json"
-            if path.exists():
-                data = json.loads(path.read_text(encoding="utf-8"))
+            path = self._find_checkpoint_file(checkpoint_id)
+            if path is not None:
+                data = _read_checkpoint_file(path)
                 cp = Checkpoint(
                     id=data["id"],
                     name=data["name"],
-                    entries=data["entries"],
+                    entries=_as_columns(data["entries"]),
                     metadata=data.get("metadata", {}),
                     created_at=data.get("created_at", 0),
                 )
@@ -260,41 +489,58 @@ class ContextEngine:
             return False
 
         self._entries.clear()
-        for entry_data in cp.entries:
-            self.set(
-                key=entry_data["key"],
-                content=entry_data["content"],
-                category=entry_data.get("category", "system"),
-                priority=entry_data.get("priority", 0.5),
-                ttl=entry_data.get("ttl", 0.0),
-            )
-        logger.info("Checkpoint restored: %s (%d entries)", cp.name, len(cp.entries))
+        self._total_tokens = 0
+        self._generation += 1
+        cols = cp.entries
+        for key, content, category, priority, ttl in zip(
+            *(cols[c] for c in _ENTRY_COLUMNS), strict=True
+        ):
+            self.set(key=key, content=content, category=category, priority=priority, ttl=ttl)
+        logger.info("Checkpoint restored: %s (%d entries)", cp.name, cp.entry_count)
         return True
 
+    def _find_checkpoint_file(self, checkpoint_id: str) -> Path | None:
+        for suffix in _CHECKPOINT_SUFFIXES:
+            path = self._checkpoint_dir / f"{checkpoint_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
     def list_checkpoints(self) -> list[dict]:
         """List available checkpoints."""
         # Include on-disk checkpoints
         if self._checkpoint_dir:
-            for path in self._checkpoint_dir.glob("*.json"):
-                cp_id = path.stem
-                if cp_id not in self._checkpoints:
+            with os.scandir(self._checkpoint_dir) as it:
+                for dirent in it:
+                    parsed = _split_checkpoint_name(dirent.name)
+                    if parsed is None or parsed[0] in self._checkpoints:
+                        continue
+                    cp_id = parsed[0]
                     try:
-                        data = json.loads(path.read_text(encoding="utf-8"))
-                        self._checkpoints[cp_id] = Checkpoint(
-                            id=cp_id,
-                            name=data.get("name", "?"),
-                            entries=data.get("entries", []),
-                            metadata=data.get("metadata", {}),
-                            created_at=data.get("created_at", 0),
-                        )
-                    except (json.JSONDecodeError, KeyError):
+                        mtime = dirent.stat().st_mtime
+                    except OSError:
                         continue
+                    if self._disk_scan_cache.get(dirent.name) == mtime:
+                        continue  # unreadable last time, unchanged since
+                    try:
+                        data = _read_checkpoint_file(Path(dirent.path))
+                    except _DECODE_ERRORS:
+                        self._disk_scan_cache[dirent.name] = mtime
+                        continue
+                    self._disk_scan_cache.pop(dirent.name, None)
+                    self._checkpoints[cp_id] = Checkpoint(
+                        id=cp_id,
+                        name=data.get("name", "?"),
+                        entries=_as_columns(data.get("entries", [])),
+                        metadata=data.get("metadata", {}),
+                        created_at=data.get("created_at", 0),
+                    )
 
         return [
             {
                 "id": cp.id,
                 "name": cp.name,
-                "entries": len(cp.entries),
+                "entries": cp.entry_count,
                 "created_at": cp.created_at,
                 "metadata": cp.metadata,
             }
@@ -323,15 +569,17 @@ class ContextEngine:
         entries = list(self._entries.values())
         total = len(entries)
 
+        now = time.time()
+
         # Factor 1: staleness ratio
-        stale_count = sum(1 for e in entries if e.is_stale)
+        stale_count = sum(1 for e in entries if e.is_stale_at(now))
         stale_ratio = stale_count / total
 
         # Factor 2: budget pressure
-        budget_pressure = min(1.0, self.current_tokens / self._max_tokens)
+        budget_pressure = min(1.0, self._total_tokens * self._inv_max_tokens)
 
         # Factor 3: noise (low average relevance)
-        avg_relevance = sum(e.relevance_score() for e in entries) / total
+        avg_relevance = float(self._relevance_scores(entries, now).mean())
         noise = 1.0 - avg_relevance
 
         # Weighted combination
@@ -348,14 +596,10 @@ class ContextEngine:
 
     def stats(self) -> dict:
         """Context engine statistics."""
-        entries = list(self._entries.values())
-        categories = {}
-        for e in entries:
-            categories.setdefault(e.category, 0)
-            categories[e.category] += 1
+        categories = dict(Counter(e.category for e in self._entries.values()))
 
         return {
-            "entries": len(entries),
+            "entries": len(self._entries),
             "tokens_used": self.current_tokens,
             "tokens_max": self._max_tokens,
             "budget_pct": round(self.budget_used_pct, 1),
@@ -9,6 +9,7 @@ Wraps crawl4ai to provide:
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -60,28 +61,48 @@ class Crawl4AIEngine:
             logger.exception(f"Crawl exception for {url}")
             return {"error": str(e), "url": url}
 
-    async def crawl_many(self, urls: list[str]) -> list[dict[str, Any]]:
-        """Crawl multiple URLs in parallel."""
+    async def crawl_many(self, urls: list[str], max_concurrent: int = 16) -> list[dict[str, Any]]:
+        """Crawl multiple URLs in parallel.
+
+        Results come back in completion order, so formatting overlaps with
+        the slowest pages still loading. ``max_concurrent`` caps open pages.
+        """
         try:
             async with AsyncWebCrawler(config=self._browser_config) as crawler:
-                results = await crawler.arun_many(urls, config=self._run_config)
+                sem = asyncio.Semaphore(max_concurrent)
+
+                async def _one(url: str) -> dict[str, Any]:
+                    # Falha de uma URL nao derruba as paginas ja prontas
+                    try:
+                        async with sem:
+                            res = await crawler.arun(url=url, config=self._run_config)
+                        return self._format(res)
+                    except Exception as e:
+                        logger.warning("Crawl exception for %s: %s", url, e)
+                        return {"error": str(e), "url": url}
 
+                tasks = [asyncio.create_task(_one(u)) for u in urls]
                 processed = []
-                for res in results:
-                    if not res.success:
-                        processed.append({"error": res.error_message, "url": res.url})
-                        continue
-
-                    processed.append(
-                        {
-                            "url": res.url,
-                            "title": res.metadata.get("title", ""),
-                            "markdown": res.markdown,
-                            "links": list(res.links.keys()) if hasattr(res.links, "keys") else [],
-                            "metadata": res.metadata,
-                        }
-                    )
+                try:
+                    for fut in asyncio.as_completed(tasks):
+                        processed.append(await fut)
+                finally:
+                    for t in tasks:
+                        t.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
                 return processed
         except Exception as e:
             logger.exception("Bulk crawl exception")
-            return [{"error": str(e)} for _ in urls]
+            return [{"error": str(e), "url": u} for u in urls]
+
+    @staticmethod
+    def _format(res: Any) -> dict[str, Any]:
+        if not res.success:
+            return {"error": res.error_message, "url": res.url}
+        return {
+            "url": res.url,
+            "title": res.metadata.get("title", ""),
+            "markdown": res.markdown,
+            "links": list(res.links.keys()) if hasattr(res.links, "keys") else [],
+            "metadata": res.metadata,
+        }
@@ -20,10 +20,12 @@ Pattern:
 
 from __future__ import annotations
 
+import functools
 import logging
+import re
 import time
 import traceback
-from collections import deque
+from collections import Counter, defaultdict, deque
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
@@ -41,11 +43,33 @@ class ErrorRecord:
     message: str
     provider: str = ""
     prompt_snippet: str = ""  # first 200 chars of prompt
-    traceback_snippet: str = ""  # last 500 chars of traceback
     timestamp: float = field(default_factory=time.time)
     retry_attempt: int = 0
     resolved: bool = False
     resolution: str = ""  # what fixed it
+    # traceback capturado sem frames; formatado so quando alguem le traceback_snippet
+    _tbe: traceback.TracebackException | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _tb: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @classmethod
+    def from_exception(cls, exc: BaseException, **kwargs: Any) -> ErrorRecord:
+        """Build a record for ``exc`` without keeping its frames alive."""
+        rec = cls(error_type=type(exc).__name__, message=str(exc)[:500], **kwargs)
+        rec._tbe = traceback.TracebackException(
+            type(exc), exc, exc.__traceback__, lookup_lines=False
+        )
+        return rec
+
+    @property
+    def traceback_snippet(self) -> str:
+        """Last 500 chars of the traceback, formatted on first access."""
+        if self._tb is None:
+            tbe = self._tbe
+            self._tb = "".join(tbe.format())[-500:] if tbe is not None else ""
+            self._tbe = None
+        return self._tb
 
     def summary(self) -> str:
         return (
@@ -56,6 +80,62 @@ class ErrorRecord:
 
 from enton.cognition.prompts import ERROR_LOOPBACK_PROMPT as LOOPBACK_PROMPT
 
+_SIMILAR_WINDOW = 300.0  # last 5 minutes
+
+# Palavra-chave -> tag da dica. Um unico scan da mensagem acha todas.
+_HINT_KEYWORDS: dict[str, str] = {
+    "429": "rate",
+    "rate": "rate",
+    "limit": "rate",
+    "timeout": "timeout",
+    "tool": "tool",
+    "not found": "missing",
+    "unknown": "missing",
+    "json": "parse",
+    "parse": "parse",
+    "decode": "parse",
+    "connect": "conn",
+    "refused": "conn",
+    "permission": "perm",
+    "denied": "perm",
+    "forbidden": "perm",
+}
+# lookahead: casamentos sobrepostos tambem contam (ex.: "ratelimit")
+_HINT_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_HINT_KEYWORDS, key=len, reverse=True))) + "))"
+)
+
+
+def _hint_tags(text: str) -> set[str]:
+    """Tags of every hint keyword found in ``text`` (single pass)."""
+    return {_HINT_KEYWORDS[m.group(1)] for m in _HINT_RE.finditer(text)}
+
+
+_HINT_RATE_LIMIT = "DICA: Rate limit atingido. Simplifique a chamada."
+_HINT_TIMEOUT = "DICA: Timeout. Tente uma abordagem mais rapida."
+_HINT_TOOL_MISSING = (
+    "DICA: Ferramenta nao encontrada. Use outra ferramenta disponivel ou resolva sem ferramentas."
+)
+_HINT_PARSE = "DICA: Erro de parsing. Retorne texto simples em vez de JSON."
+_HINT_CONN = "DICA: Servico indisponivel. Evite dependencias externas."
+_HINT_PERM = "DICA: Sem permissao. Tente um caminho/recurso diferente."
+
+# ordem de saida das dicas
+_HINTS_BY_FLAG: tuple[tuple[str, str], ...] = (
+    ("rate", _HINT_RATE_LIMIT),
+    ("timeout", _HINT_TIMEOUT),
+    ("tool_missing", _HINT_TOOL_MISSING),
+    ("parse", _HINT_PARSE),
+    ("conn", _HINT_CONN),
+    ("perm", _HINT_PERM),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _hints_for_flags(flags: frozenset[str]) -> str:
+    """Pre-joined hint block for a flag set (same errors repeat in a loop)."""
+    return "\n".join(hint for flag, hint in _HINTS_BY_FLAG if flag in flags)
+
 
 class ErrorLoopBack:
     """Error-aware retry handler for brain calls.
@@ -82,6 +162,8 @@ class ErrorLoopBack:
         self._max_total = max_total_retries
         self._error_ttl = error_ttl
         self._history: deque[ErrorRecord] = deque(maxlen=50)
+        # (error_type, provider) -> timestamps dos ultimos _SIMILAR_WINDOW s
+        self._similar_index: defaultdict[tuple[str, str], deque[float]] = defaultdict(deque)
         self._consecutive_failures = 0
 
     # ------------------------------------------------------------------ #
@@ -102,20 +184,25 @@ class ErrorLoopBack:
         On total failure, result is empty string.
         """
         last_error: ErrorRecord | None = None
-        original_prompt = str(args[0]) if args else ""
+        call_args = list(args)  # args[0] trocado in-place nos retries
+        if not args:
+            original_prompt = ""
+        elif isinstance(args[0], str):
+            original_prompt = args[0]
+        else:
+            original_prompt = str(args[0])
 
         for attempt in range(1, self._max_total + 1):
             try:
                 # If previous attempt failed, inject error context
-                if last_error and args:
-                    enhanced_prompt = self._build_loopback_prompt(
+                if last_error and call_args:
+                    call_args[0] = self._build_loopback_prompt(
                         original_prompt,
                         last_error,
                         attempt,
                     )
-                    args = (enhanced_prompt, *args[1:])
 
-                result = await func(*args, **kwargs)
+                result = await func(*call_args, **kwargs)
 
                 # Success — record resolution if we recovered
                 if last_error:
@@ -143,7 +230,7 @@ class ErrorLoopBack:
                     original_prompt,
                     attempt,
                 )
-                self._history.append(error)
+                self._record(error)
                 self._consecutive_failures += 1
                 last_error = error
 
@@ -205,15 +292,10 @@ class ErrorLoopBack:
         attempt: int,
     ) -> ErrorRecord:
         """Capture exception details into an ErrorRecord."""
-        tb = traceback.format_exception(type(exc), exc, exc.__traceback__)
-        tb_str = "".join(tb)
-
-        return ErrorRecord(
-            error_type=type(exc).__name__,
-            message=str(exc)[:500],
+        return ErrorRecord.from_exception(
+            exc,
             provider=provider_id,
             prompt_snippet=prompt[:200],
-            traceback_snippet=tb_str[-500:],
             retry_attempt=attempt,
         )
 
@@ -239,57 +321,44 @@ class ErrorLoopBack:
 
     def _error_hints(self, error: ErrorRecord) -> str:
         """Generate hints based on error patterns."""
-        hints: list[str] = []
-        msg = error.message.lower()
-        etype = error.error_type.lower()
-
-        # Rate limit
-        if "429" in msg or "rate" in msg or "limit" in msg:
-            hints.append("DICA: Rate limit atingido. Simplifique a chamada.")
-
-        # Timeout
-        if "timeout" in etype or "timeout" in msg:
-            hints.append("DICA: Timeout. Tente uma abordagem mais rapida.")
-
-        # Tool not found
-        if "tool" in msg and ("not found" in msg or "unknown" in msg):
-            hints.append(
-                "DICA: Ferramenta nao encontrada. Use outra ferramenta "
-                "disponivel ou resolva sem ferramentas."
-            )
-
-        # JSON/parsing errors
-        if "json" in msg or "parse" in msg or "decode" in msg:
-            hints.append("DICA: Erro de parsing. Retorne texto simples em vez de JSON.")
-
-        # Connection errors
-        if "connection" in msg or "connect" in msg or "refused" in msg:
-            hints.append("DICA: Servico indisponivel. Evite dependencias externas.")
-
-        # Permission denied
-        if "permission" in msg or "denied" in msg or "forbidden" in msg:
-            hints.append("DICA: Sem permissao. Tente um caminho/recurso diferente.")
-
-        # Similar errors in history — pattern detection
+        tags = _hint_tags(error.message.lower())
+        if "timeout" in error.error_type.lower():
+            tags.add("timeout")
+        if "tool" in tags and "missing" in tags:
+            tags.add("tool_missing")
+        hints = _hints_for_flags(frozenset(tags))
+
+        # Similar errors in history — pattern detection (muda com o tempo, fora do cache)
         similar = self._find_similar_errors(error)
         if similar >= 3:
-            hints.append(
+            alert = (
                 f"ALERTA: Este tipo de erro ja ocorreu {similar}x recentemente. "
                 "Mude completamente a estrategia."
             )
+            return f"{hints}\n{alert}" if hints else alert
 
-        return "\n".join(hints) if hints else ""
+        return hints
+
+    def _record(self, error: ErrorRecord) -> None:
+        """Append to history and to the (type, provider) similarity index."""
+        self._history.append(error)
+        bucket = self._similar_index[(error.error_type, error.provider)]
+        self._expire(bucket, error.timestamp)
+        bucket.append(error.timestamp)
+
+    @staticmethod
+    def _expire(bucket: deque[float], now: float) -> None:
+        cutoff = now - _SIMILAR_WINDOW
+        while bucket and bucket[0] <= cutoff:
+            bucket.popleft()
 
     def _find_similar_errors(self, error: ErrorRecord) -> int:
         """Count recent similar errors (same type + provider)."""
-        cutoff = time.time() - 300  # last 5 minutes
-        return sum(
-            1
-            for e in self._history
-            if e.error_type == error.error_type
-            and e.provider == error.provider
-            and e.timestamp > cutoff
-        )
+        bucket = self._similar_index.get((error.error_type, error.provider))
+        if not bucket:
+            return 0
+        self._expire(bucket, time.time())
+        return len(bucket)
 
     # ------------------------------------------------------------------ #
     # Context integration
@@ -336,10 +405,12 @@ class ErrorLoopBack:
     def stats(self) -> dict:
         """Error handler statistics."""
         total = len(self._history)
-        resolved = sum(1 for e in self._history if e.resolved)
-        by_type: dict[str, int] = {}
+        by_type: Counter[str] = Counter()
+        resolved = 0
+        # uma passada so sobre o deque
         for e in self._history:
-            by_type[e.error_type] = by_type.get(e.error_type, 0) + 1
+            by_type[e.error_type] += 1
+            resolved += e.resolved
 
         return {
             "total_errors": total,
@@ -348,7 +419,7 @@ class ErrorLoopBack:
             "consecutive_failures": self._consecutive_failures,
             "is_degraded": self.is_degraded,
             "error_rate": round(self.error_rate, 3),
-            "by_type": by_type,
+            "by_type": dict(by_type),
         }
 
     def summary(self) -> str:
@@ -2,22 +2,39 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import deque
 from collections.abc import Callable, Coroutine
 from dataclasses import dataclass, field
-from time import time
-from typing import Any
+from time import monotonic_ns
+from typing import Any, dataclass_transform
 
 logger = logging.getLogger(__name__)
 
 type EventHandler = Callable[[Event], Coroutine[Any, Any, None]]
 
 
-@dataclass(frozen=True, slots=True)
+@dataclass_transform(frozen_default=True, field_specifiers=(field,))
+def _fast_event[T](cls: type[T]) -> type[T]:
+    """Slotted dataclass that is frozen for type checkers only.
+
+    frozen=True routes every field through object.__setattr__ in __init__
+    (~3x slower construction); events are built per frame, so skip it.
+    Value __eq__/__hash__ stay as with frozen=True.
+    """
+    return dataclass(slots=True, unsafe_hash=True)(cls)
+
+
+@_fast_event
 class Event:
-    timestamp: float = field(default_factory=time)
+    # ns monotonicos: int sem box de float e imune a ajuste de NTP
+    timestamp: int = field(default_factory=monotonic_ns)
+
+    @property
+    def timestamp_s(self) -> float:
+        return self.timestamp / 1e9
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class DetectionEvent(Event):
     label: str = ""
     confidence: float = 0.0
@@ -26,7 +43,7 @@ class DetectionEvent(Event):
     camera_id: str = "main"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class ActivityEvent(Event):
     person_index: int = 0
     activity: str = ""
@@ -34,7 +51,7 @@ class ActivityEvent(Event):
     camera_id: str = "main"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class EmotionEvent(Event):
     person_index: int = 0
     emotion: str = ""
@@ -45,26 +62,26 @@ class EmotionEvent(Event):
     camera_id: str = "main"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class TranscriptionEvent(Event):
     text: str = ""
     is_final: bool = True
     language: str = "pt-BR"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class SpeechRequest(Event):
     text: str = ""
     priority: int = 0  # higher = more important
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class BrainResponse(Event):
     text: str = ""
     source: str = ""  # provider that generated it
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class FaceEvent(Event):
     identity: str = "unknown"
     confidence: float = 0.0
@@ -72,13 +89,13 @@ class FaceEvent(Event):
     camera_id: str = "main"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class SoundEvent(Event):
     label: str = ""
     confidence: float = 0.0
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class SceneChangeEvent(Event):
     """Emitted when visual scene changes significantly."""
 
@@ -87,7 +104,7 @@ class SceneChangeEvent(Event):
     removed_objects: list[str] = field(default_factory=list)
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class SkillEvent(Event):
     """Emitted when a dynamic skill is loaded, unloaded, or forged."""
 
@@ -96,7 +113,7 @@ class SkillEvent(Event):
     detail: str = ""
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class ChannelMessageEvent(Event):
     """Emitted when a message arrives from any channel (Telegram, Discord, etc.)."""
 
@@ -111,7 +128,7 @@ class ChannelMessageEvent(Event):
         return getattr(self.message, "text", "") if self.message else ""
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class HumorEvent(Event):
     """Emitted when sarcasm or humor is detected cross-modally."""
 
@@ -123,7 +140,7 @@ class HumorEvent(Event):
     text_sentiment: str = ""
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class ActionEvent(Event):
     """Emitted when VideoMAE recognizes a temporal action."""
 
@@ -134,7 +151,7 @@ class ActionEvent(Event):
     camera_id: str = "main"
 
 
-@dataclass(frozen=True, slots=True)
+@_fast_event
 class SystemEvent(Event):
     kind: str = ""  # startup, shutdown, error, camera_lost, etc.
     detail: str = ""
@@ -142,24 +159,64 @@ class SystemEvent(Event):
 
 class EventBus:
     def __init__(self) -> None:
-        self._handlers: dict[type[Event], list[EventHandler]] = {}
-        self._queue: asyncio.Queue[Event] = asyncio.Queue()
+        # tuples: rebuilt on on() (rare), iterated per event (hot)
+        self._handlers: dict[type[Event], tuple[EventHandler, ...]] = {}
+        # consumidor unico (run): deque + Event evita os futures do asyncio.Queue
+        self._queue: deque[Event] = deque()
+        self._not_empty = asyncio.Event()
 
     def on(self, event_type: type[Event], handler: EventHandler) -> None:
-        self._handlers.setdefault(event_type, []).append(handler)
+        self._handlers[event_type] = (*self._handlers.get(event_type, ()), handler)
 
     async def emit(self, event: Event) -> None:
-        await self._queue.put(event)
+        self._queue.append(event)
+        self._not_empty.set()
 
     def emit_nowait(self, event: Event) -> None:
-        self._queue.put_nowait(event)
-
-    async def run(self) -> None:
+        self._queue.append(event)
+        self._not_empty.set()
+
+    async def run(self, max_batch_size: int = 64) -> None:
+        """Dispatch events forever, in arrival order.
+
+        When the queue is empty, waits on the not-empty signal; then drains
+        whatever is already queued (a burst from one frame), up to
+        ``max_batch_size`` so a flood can't starve the latency of the first
+        event's handlers.
+        """
+        queue = self._queue
+        not_empty = self._not_empty
+        popleft = queue.popleft
+        get_handlers = self._handlers.get
+        run_handlers = self._run_handlers
+        batch: list[Event] = []
         while True:
-            event = await self._queue.get()
-            handlers = self._handlers.get(type(event), [])
-            for handler in handlers:
-                try:
-                    await handler(event)
-                except Exception:
-                    logger.exception("Handler error for %s", type(event).__name__)
+            if not queue:
+                not_empty.clear()
+                await not_empty.wait()
+                continue
+            while queue and len(batch) < max_batch_size:
+                batch.append(popleft())
+            for event in batch:
+                handlers = get_handlers(type(event))
+                if handlers:
+                    await run_handlers(handlers, event)
+            batch.clear()
+
+    @staticmethod
+    async def _run_handlers(handlers: tuple[EventHandler, ...], event: Event) -> None:
+        """Run every handler for one event; a failing handler is logged and skipped.
+
+        One try block covers the whole group and is only re-entered after
+        a failure, resuming at the next handler.
+        """
+        start, n = 0, len(handlers)
+        while start < n:
+            i = start
+            try:
+                for i in range(start, n):
+                    await handlers[i](event)
+                return
+            except Exception:
+                logger.exception("Handler error for %s", event.__class__.__name__)
+                start = i + 1
@@ -20,22 +20,36 @@ Architecture:
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import importlib
+import importlib.metadata
 import json
 import logging
+import os
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import StrEnum
 from pathlib import Path
+from types import ModuleType
 from typing import TYPE_CHECKING, Any
 
 from agno.tools import Toolkit
 
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
 if TYPE_CHECKING:
     from enton.cognition.brain import EntonBrain
 
 logger = logging.getLogger(__name__)
 
+# manifest bytes -> dict; both decoders take raw bytes (no decode-to-str step)
+_loads = orjson.loads if orjson is not None else json.loads
+
 
 class ExtensionSource(StrEnum):
     """Where an extension came from."""
@@ -93,6 +107,30 @@ class ExtensionMeta:
         return f"{self.name} {status} ({self.source}, {tools}, v{self.version})"
 
 
+ENTRYPOINT_GROUP = "enton.extensions"
+
+# Janela em que um clone bem-sucedido do mesmo repo_url nao e refeito
+_CLONE_TTL = 300.0
+
+
+@functools.cache
+def _all_entry_points() -> importlib.metadata.EntryPoints:
+    # entry_points() rescans every installed distribution's metadata
+    return importlib.metadata.entry_points()
+
+
+@functools.cache
+def _cached_entry_points(group: str) -> tuple[tuple[str, str], ...]:
+    """(name, value) pairs for ``group``, read off the EntryPoint objects once."""
+    return tuple((ep.name, ep.value) for ep in _all_entry_points().select(group=group))
+
+
+def refresh_entry_points() -> None:
+    """Forget the cached entry point scan (e.g. after a pip install)."""
+    _all_entry_points.cache_clear()
+    _cached_entry_points.cache_clear()
+
+
 # Manifest schema (JSON file alongside toolkit .py)
 MANIFEST_EXAMPLE = {
     "name": "my_extension",
@@ -105,6 +143,18 @@ MANIFEST_EXAMPLE = {
 }
 
 
+def _find_toolkit_class(module: ModuleType) -> type[Toolkit] | None:
+    """First Toolkit subclass defined in ``module``, else the first one it imports."""
+    imported: type[Toolkit] | None = None
+    # namespace values directly: no sorted dir() list, no getattr per name
+    for attr in module.__dict__.values():
+        if isinstance(attr, type) and attr is not Toolkit and issubclass(attr, Toolkit):
+            if attr.__module__ == module.__name__:
+                return attr
+            imported = imported or attr
+    return imported
+
+
 class ExtensionRegistry:
     """Centralized extension management for Enton.
 
@@ -120,6 +170,17 @@ class ExtensionRegistry:
         self._brain = brain
         self._extensions_dir = Path(extensions_dir).expanduser()
         self._extensions: dict[str, ExtensionMeta] = {}
+        # manifest path -> mtime at last parse (unchanged files are skipped)
+        self._manifest_mtime: dict[str, float] = {}
+        # stats() counters, kept in step by _add() / _set_state()
+        self._by_state: Counter[str] = Counter()
+        self._by_source: Counter[str] = Counter()
+        self._enabled_tools = 0
+        # toolkit file -> (mtime, executed module, Toolkit subclass found in it)
+        self._file_cache: dict[Path, tuple[float, ModuleType, type[Toolkit] | None]] = {}
+        # install_from_git: um clone por repo_url por vez; sucesso recente -> sem re-clone
+        self._clone_locks: dict[str, asyncio.Lock] = {}
+        self._recent_clones: dict[str, float] = {}
 
     # ------------------------------------------------------------------ #
     # Discovery
@@ -133,24 +194,17 @@ class ExtensionRegistry:
         """
         discovered: list[str] = []
         try:
-            if hasattr(importlib.metadata, "entry_points"):
-                eps = importlib.metadata.entry_points()
-                # Python 3.12+: eps is a dict-like
-                group = eps.get("enton.extensions", [])
-                # Python 3.9-3.11 compat
-                if hasattr(eps, "select"):
-                    group = eps.select(group="enton.extensions")
-
-                for ep in group:
-                    name = ep.name
-                    if name not in self._extensions:
-                        self._extensions[name] = ExtensionMeta(
+            for name, value in _cached_entry_points(ENTRYPOINT_GROUP):
+                if name not in self._extensions:
+                    self._add(
+                        ExtensionMeta(
                             name=name,
                             source=ExtensionSource.ENTRYPOINT,
-                            module_path=str(ep.value),
+                            module_path=value,
                         )
-                        discovered.append(name)
-                        logger.info("Discovered entry point extension: %s", name)
+                    )
+                    discovered.append(name)
+                    logger.info("Discovered entry point extension: %s", name)
         except Exception:
             logger.debug("Entry point discovery failed", exc_info=True)
 
@@ -161,9 +215,24 @@ class ExtensionRegistry:
         discovered: list[str] = []
         self._extensions_dir.mkdir(parents=True, exist_ok=True)
 
-        for manifest_path in self._extensions_dir.glob("*/manifest.json"):
+        with os.scandir(self._extensions_dir) as it:
+            candidates = [
+                os.path.join(d.path, "manifest.json")
+                for d in it
+                if not d.name.startswith(".") and d.is_dir()
+            ]
+
+        for path in candidates:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if self._manifest_mtime.get(path) == mtime:
+                continue
+            self._manifest_mtime[path] = mtime
+            manifest_path = Path(path)
             try:
-                data = json.loads(manifest_path.read_text(encoding="utf-8"))
+                data = _loads(manifest_path.read_bytes())
                 name = data.get("name", manifest_path.parent.name)
                 if name in self._extensions:
                     continue
@@ -171,14 +240,16 @@ class ExtensionRegistry:
                 module_file = data.get("module", "toolkit.py")
                 module_path = str(manifest_path.parent / module_file)
 
-                self._extensions[name] = ExtensionMeta(
-                    name=name,
-                    source=ExtensionSource.MANIFEST,
-                    description=data.get("description", ""),
-                    version=data.get("version", "0.1.0"),
-                    author=data.get("author", "unknown"),
-                    tags=data.get("tags", []),
-                    module_path=module_path,
+                self._add(
+                    ExtensionMeta(
+                        name=name,
+                        source=ExtensionSource.MANIFEST,
+                        description=data.get("description", ""),
+                        version=data.get("version", "0.1.0"),
+                        author=data.get("author", "unknown"),
+                        tags=data.get("tags", []),
+                        module_path=module_path,
+                    )
                 )
                 discovered.append(name)
                 logger.info("Discovered manifest extension: %s", name)
@@ -211,19 +282,19 @@ class ExtensionRegistry:
         try:
             toolkit = self._load_toolkit(meta)
             if toolkit is None:
-                meta.state = ExtensionState.ERROR
+                self._set_state(meta, ExtensionState.ERROR)
                 meta.error = "Failed to extract toolkit from module"
                 return False
 
             meta.toolkit = toolkit
             meta.loaded_at = time.time()
-            meta.tool_count = len(toolkit.functions) if hasattr(toolkit, "functions") else 0
-            meta.state = ExtensionState.LOADED
+            meta.tool_count = len(getattr(toolkit, "functions", None) or ())
+            self._set_state(meta, ExtensionState.LOADED)
             logger.info("Loaded extension: %s (%d tools)", name, meta.tool_count)
             return True
 
         except Exception as exc:
-            meta.state = ExtensionState.ERROR
+            self._set_state(meta, ExtensionState.ERROR)
             meta.error = str(exc)[:200]
             logger.warning("Failed to load extension '%s': %s", name, exc)
             return False
@@ -252,16 +323,25 @@ class ExtensionRegistry:
         return None
 
     def _load_from_file(self, path: Path) -> Toolkit | None:
-        """Load toolkit from a .py file (same logic as SkillRegistry)."""
-        import types
+        """Load toolkit from a .py file (same logic as SkillRegistry).
 
+        The executed module is reused while the file's mtime is unchanged;
+        each call still builds a fresh toolkit instance.
+        """
         module_name = f"enton_ext_{path.stem}"
         try:
-            source = path.read_text()
-            code = compile(source, str(path), "exec")
-            module = types.ModuleType(module_name)
-            module.__file__ = str(path)
-            exec(code, module.__dict__)
+            mtime = path.stat().st_mtime
+            cached = self._file_cache.get(path)
+            if cached is not None and cached[0] == mtime:
+                _, module, toolkit_cls = cached
+            else:
+                source = path.read_text()
+                code = compile(source, str(path), "exec")
+                module = ModuleType(module_name)
+                module.__file__ = str(path)
+                exec(code, module.__dict__)
+                toolkit_cls = _find_toolkit_class(module)
+                self._file_cache[path] = (mtime, module, toolkit_cls)
 
             # Try factory function first
             factory = getattr(module, "create_toolkit", None)
@@ -270,11 +350,8 @@ class ExtensionRegistry:
                 if isinstance(result, Toolkit):
                     return result
 
-            # Scan for Toolkit subclass
-            for attr_name in dir(module):
-                attr = getattr(module, attr_name, None)
-                if isinstance(attr, type) and issubclass(attr, Toolkit) and attr is not Toolkit:
-                    return attr()
+            if toolkit_cls is not None:
+                return toolkit_cls()
 
         except Exception:
             logger.warning("File load failed: %s", path)
@@ -300,7 +377,7 @@ class ExtensionRegistry:
             return False
 
         self._brain.register_toolkit(meta.toolkit, f"ext_{name}")
-        meta.state = ExtensionState.ENABLED
+        self._set_state(meta, ExtensionState.ENABLED)
         logger.info("Enabled extension: %s", name)
         return True
 
@@ -311,7 +388,7 @@ class ExtensionRegistry:
             return False
 
         self._brain.unregister_toolkit(f"ext_{name}")
-        meta.state = ExtensionState.DISABLED
+        self._set_state(meta, ExtensionState.DISABLED)
         meta.toolkit = None
         logger.info("Disabled extension: %s", name)
         return True
@@ -325,13 +402,20 @@ class ExtensionRegistry:
 
         Expects repo to contain manifest.json at root.
         """
-        import asyncio
-
         if not name:
             # Extract name from URL: https://github.com/user/enton-ext-foo → foo
             name = repo_url.rstrip("/").split("/")[-1]
             name = name.removeprefix("enton-ext-").removeprefix("enton-")
 
+        async with self._clone_locks.setdefault(repo_url, asyncio.Lock()):
+            cloned_at = self._recent_clones.get(repo_url)
+            if cloned_at is not None and time.monotonic() - cloned_at < _CLONE_TTL:
+                # outro chamador acabou de instalar o mesmo repo
+                meta = self._extensions.get(name)
+                return meta is not None and meta.state == ExtensionState.ENABLED
+            return await self._clone_and_enable(repo_url, name)
+
+    async def _clone_and_enable(self, repo_url: str, name: str) -> bool:
         target = self._extensions_dir / name
         if target.exists():
             logger.warning("Extension dir already exists: %s", target)
@@ -342,6 +426,7 @@ class ExtensionRegistry:
                 "git",
                 "clone",
                 "--depth=1",
+                "--single-branch",
                 repo_url,
                 str(target),
                 stdout=asyncio.subprocess.PIPE,
@@ -351,6 +436,7 @@ class ExtensionRegistry:
             if proc.returncode != 0:
                 logger.warning("Git clone failed: %s", stderr.decode()[:200])
                 return False
+            self._recent_clones[repo_url] = time.monotonic()
 
             # Discover the newly cloned extension
             self.discover_manifests()
@@ -386,20 +472,47 @@ class ExtensionRegistry:
 
     def register_builtin(self, name: str, toolkit: Toolkit) -> None:
         """Register a builtin toolkit for tracking (not loading)."""
-        tool_count = len(toolkit.functions) if hasattr(toolkit, "functions") else 0
-        self._extensions[name] = ExtensionMeta(
-            name=name,
-            source=ExtensionSource.BUILTIN,
-            state=ExtensionState.ENABLED,
-            toolkit=toolkit,
-            loaded_at=time.time(),
-            tool_count=tool_count,
+        tool_count = len(getattr(toolkit, "functions", None) or ())
+        self._add(
+            ExtensionMeta(
+                name=name,
+                source=ExtensionSource.BUILTIN,
+                state=ExtensionState.ENABLED,
+                toolkit=toolkit,
+                loaded_at=time.time(),
+                tool_count=tool_count,
+            )
         )
 
     # ------------------------------------------------------------------ #
     # Stats
     # ------------------------------------------------------------------ #
 
+    def _add(self, meta: ExtensionMeta) -> None:
+        """Insert/replace an extension, keeping the stats counters in step."""
+        old = self._extensions.get(meta.name)
+        if old is not None:
+            self._by_state[old.state] -= 1
+            self._by_source[old.source] -= 1
+            if old.state == ExtensionState.ENABLED:
+                self._enabled_tools -= old.tool_count
+        self._extensions[meta.name] = meta
+        self._by_state[meta.state] += 1
+        self._by_source[meta.source] += 1
+        if meta.state == ExtensionState.ENABLED:
+            self._enabled_tools += meta.tool_count
+
+    def _set_state(self, meta: ExtensionMeta, state: ExtensionState) -> None:
+        if meta.state == state:
+            return
+        self._by_state[meta.state] -= 1
+        self._by_state[state] += 1
+        if meta.state == ExtensionState.ENABLED:
+            self._enabled_tools -= meta.tool_count
+        elif state == ExtensionState.ENABLED:
+            self._enabled_tools += meta.tool_count
+        meta.state = state
+
     def record_call(self, ext_name: str, success: bool = True) -> None:
         """Record a tool call for an extension."""
         meta = self._extensions.get(ext_name)
@@ -411,22 +524,12 @@ class ExtensionRegistry:
             meta.errors += 1
 
     def stats(self) -> dict[str, Any]:
-        """Registry-wide statistics."""
-        by_state: dict[str, int] = {}
-        by_source: dict[str, int] = {}
-        total_tools = 0
-
-        for ext in self._extensions.values():
-            by_state[ext.state] = by_state.get(ext.state, 0) + 1
-            by_source[ext.source] = by_source.get(ext.source, 0) + 1
-            if ext.state == ExtensionState.ENABLED:
-                total_tools += ext.tool_count
-
+        """Registry-wide statistics (counters kept incrementally)."""
         return {
             "total_extensions": len(self._extensions),
-            "total_tools": total_tools,
-            "by_state": by_state,
-            "by_source": by_source,
+            "total_tools": self._enabled_tools,
+            "by_state": {k: v for k, v in self._by_state.items() if v},
+            "by_source": {k: v for k, v in self._by_source.items() if v},
         }
 
     def summary(self) -> str:
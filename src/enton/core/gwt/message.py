@@ -1,5 +1,5 @@
-import time
 from dataclasses import dataclass, field
+from time import monotonic_ns
 from typing import Any
 
 
@@ -14,8 +14,12 @@ class BroadcastMessage:
     source: str
     saliency: float  # 0.0 a 1.0 (Quão importante/surpreendente é)
     modality: str  # "vision", "audio", "inner_speech", "emotion", etc.
-    timestamp: float = field(default_factory=time.time)
+    timestamp: int = field(default_factory=monotonic_ns)  # ns monotonicos
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def timestamp_s(self) -> float:
+        return self.timestamp / 1e9
+
     def __str__(self) -> str:
         return f"[{self.source}:{self.modality}] (saliency={self.saliency:.2f}) {str(self.content)[:50]}"
@@ -21,6 +21,9 @@ class CognitiveModule(ABC):
             context: O conteúdo que estava no Global Workspace no passo anterior.
                      Pode ser None no primeiro passo.
 
+        Pode ser ``async def``: o Workspace aguarda todos os módulos async do
+        ciclo juntos (módulos com I/O não somam latência ao tick).
+
         Returns:
             Um BroadcastMessage candidato a entrar no Workspace, ou None se não tiver nada a dizer.
         """
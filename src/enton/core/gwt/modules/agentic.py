@@ -1,11 +1,18 @@
+from __future__ import annotations
+
 import asyncio
 import logging
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 
 from enton.cognition.brain import EntonBrain
+from enton.cognition.prompts import AGENTIC_TOOL_PROMPT
 from enton.core.gwt.message import BroadcastMessage
 from enton.core.gwt.module import CognitiveModule
 
+if TYPE_CHECKING:
+    from enton.core.gwt.workspace import GlobalWorkspace
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,25 +23,31 @@ class AgenticModule(CognitiveModule):
     para realizar ações no mundo (digital ou físico).
     """
 
-    def __init__(self, brain: EntonBrain):
+    def __init__(self, brain: EntonBrain, workspace: GlobalWorkspace | None = None):
         super().__init__(name="agentic_module")
         self.brain = brain
+        # com workspace, o resultado do worker entra direto na caixa de entrada (post)
+        self._workspace = workspace
         self.is_busy = False
         self._pending_result: str | None = None
         self._action_memory: dict[str, Any] = {}
+        # um worker de vida longa consome os jobs (is_busy ja serializa)
+        self._jobs: asyncio.Queue[tuple[str, str, str]] = asyncio.Queue()
+        self._worker_task: asyncio.Task | None = None
+        # verbo da intencao ("<verbo>:<resto>") -> handler que faz o proprio parsing
+        self._verb_handlers: dict[
+            str, Callable[[BroadcastMessage, str], BroadcastMessage | None]
+        ] = {
+            "use_tool": self._handle_use_tool,
+            "agentic_task": self._handle_agentic_task,
+        }
 
     def run_step(self, context: BroadcastMessage | None) -> BroadcastMessage | None:
         # 1. Entrega resultados pendentes (Feedback Loop)
         if self._pending_result:
             content = self._pending_result
             self._pending_result = None
-            return BroadcastMessage(
-                content=f"Action Result: {content[:200]}...",
-                source=self.name,
-                saliency=1.0,
-                modality="memory_recall",
-                metadata={"full_text": content, "type": "action_result"},
-            )
+            return self._result_message(content)
 
         # 2. Se está ocupado, não aceita novas tarefas
         if self.is_busy:
@@ -44,38 +57,70 @@ class AgenticModule(CognitiveModule):
         # Formato esperado da intenção: "use_tool:<tool_name>:<instruction>"
         # Ou intenções de alto nível: "perform_task:<task_description>"
         if context and context.modality == "intention":
-            # Caso 1: Uso explícito de ferramenta
-            if context.content.startswith("use_tool:"):
-                parts = context.content.split(":", 2)
-                if len(parts) == 3:
-                    tool_name, instruction = parts[1], parts[2]
-                    self.is_busy = True
-                    asyncio.create_task(self._execute_tool(tool_name, instruction))
-
-                    return BroadcastMessage(
-                        content=f"Executing tool {tool_name}...",
-                        source=self.name,
-                        saliency=0.9,
-                        modality="inner_speech",
-                    )
-
-            # Caso 2: Tarefa genérica (Agentic execution)
-            elif context.content.startswith("agentic_task:"):
-                instruction = (
-                    context.metadata.get("instruction") or context.content.split(":", 1)[1]
-                )
-                self.is_busy = True
-                asyncio.create_task(self._execute_agentic_task(instruction))
-
-                return BroadcastMessage(
-                    content=f"Starting agentic task: {instruction[:50]}...",
-                    source=self.name,
-                    saliency=0.9,
-                    modality="inner_speech",
-                )
+            verb, _, rest = context.content.partition(":")
+            handler = self._verb_handlers.get(verb)
+            if handler is not None:
+                return handler(context, rest)
 
         return None
 
+    def _result_message(self, content: str) -> BroadcastMessage:
+        return BroadcastMessage(
+            content=f"Action Result: {content[:200]}...",
+            source=self.name,
+            saliency=1.0,
+            modality="memory_recall",
+            metadata={"full_text": content, "type": "action_result"},
+        )
+
+    def _deliver(self, content: str) -> None:
+        """Entrega o resultado do worker: post no workspace ou no proximo run_step."""
+        if self._workspace is not None:
+            self._workspace.post(self._result_message(content))
+        else:
+            self._pending_result = content
+
+    def _handle_use_tool(self, context: BroadcastMessage, rest: str) -> BroadcastMessage | None:
+        # Caso 1: Uso explícito de ferramenta
+        tool_name, sep, instruction = rest.partition(":")
+        if not sep:
+            return None
+        self._submit("tool", tool_name, instruction)
+
+        return BroadcastMessage(
+            content=f"Executing tool {tool_name}...",
+            source=self.name,
+            saliency=0.9,
+            modality="inner_speech",
+        )
+
+    def _handle_agentic_task(self, context: BroadcastMessage, rest: str) -> BroadcastMessage:
+        # Caso 2: Tarefa genérica (Agentic execution)
+        instruction = context.metadata.get("instruction") or rest
+        self._submit("task", "", instruction)
+
+        return BroadcastMessage(
+            content=f"Starting agentic task: {instruction[:50]}...",
+            source=self.name,
+            saliency=0.9,
+            modality="inner_speech",
+        )
+
+    def _submit(self, kind: str, tool_name: str, instruction: str) -> None:
+        """Enfileira o job pro worker (que sobe sob demanda, com referencia forte)."""
+        self.is_busy = True
+        self._jobs.put_nowait((kind, tool_name, instruction))
+        if self._worker_task is None or self._worker_task.done():
+            self._worker_task = asyncio.get_running_loop().create_task(self._worker())
+
+    async def _worker(self) -> None:
+        while True:
+            kind, tool_name, instruction = await self._jobs.get()
+            if kind == "tool":
+                await self._execute_tool(tool_name, instruction)
+            else:
+                await self._execute_agentic_task(instruction)
+
     async def _execute_tool(self, tool_name: str, instruction: str):
         """Executa uma ferramenta específica via Brain."""
         try:
@@ -83,18 +128,16 @@ class AgenticModule(CognitiveModule):
 
             # Aqui usamos o brain.think, mas forçando o contexto da ferramenta se possível
             # Como o brain já tem toolkits registrados, pedimos pra ele usar.
-            from enton.cognition.prompts import AGENTIC_TOOL_PROMPT
-
             prompt = AGENTIC_TOOL_PROMPT.format(
                 tool_name=tool_name,
                 instruction=instruction,
             )
             result = await self.brain.think(prompt)
 
-            self._pending_result = f"Tool {tool_name} output: {result}"
+            self._deliver(f"Tool {tool_name} output: {result}")
         except Exception as e:
             logger.error(f"AgenticModule tool error: {e}")
-            self._pending_result = f"Error using {tool_name}: {e}"
+            self._deliver(f"Error using {tool_name}: {e}")
         finally:
             self.is_busy = False
 
@@ -103,9 +146,9 @@ class AgenticModule(CognitiveModule):
         try:
             logger.info(f"AgenticModule: Executing task: {instruction}")
             result = await self.brain.think(instruction)
-            self._pending_result = f"Task result: {result}"
+            self._deliver(f"Task result: {result}")
         except Exception as e:
             logger.error(f"AgenticModule task error: {e}")
-            self._pending_result = f"Error executing task: {e}"
+            self._deliver(f"Error executing task: {e}")
         finally:
             self.is_busy = False
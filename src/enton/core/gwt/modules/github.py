@@ -7,6 +7,9 @@ from enton.skills.github_learner import GitHubLearner
 
 logger = logging.getLogger(__name__)
 
+# Estudos simultaneos (cada um segura uma thread + chamadas de LLM)
+_MAX_CONCURRENT_STUDIES = 1
+
 
 class GitHubModule(CognitiveModule):
     """
@@ -19,6 +22,8 @@ class GitHubModule(CognitiveModule):
         self.learner = learner
         self.is_busy = False
         self._pending_result: str | None = None
+        # referencia forte: o loop so guarda weakref das tasks
+        self._inflight: set[asyncio.Task] = set()
 
     def run_step(self, context: BroadcastMessage | None) -> BroadcastMessage | None:
         # 1. Se tem resultado pendente de uma tarefa anterior, entrega agora
@@ -34,7 +39,7 @@ class GitHubModule(CognitiveModule):
             )
 
         # 2. Se está ocupado, silêncio
-        if self.is_busy:
+        if self.is_busy or len(self._inflight) >= _MAX_CONCURRENT_STUDIES:
             return None
 
         # 3. Verifica se há uma ordem para este módulo
@@ -46,7 +51,9 @@ class GitHubModule(CognitiveModule):
             topic = context.metadata.get("topic")
             if topic:
                 self.is_busy = True
-                asyncio.create_task(self._perform_study(topic))
+                task = asyncio.create_task(self._perform_study(topic))
+                task.add_done_callback(self._inflight.discard)
+                self._inflight.add(task)
 
                 return BroadcastMessage(
                     content=f"Starting study on {topic}",
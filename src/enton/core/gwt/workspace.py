@@ -1,10 +1,15 @@
+import asyncio
+import inspect
 import logging
+from collections import deque
 
 from enton.core.gwt.message import BroadcastMessage
 from enton.core.gwt.module import CognitiveModule
 
 logger = logging.getLogger(__name__)
 
+_HISTORY_SIZE = 100
+
 
 class GlobalWorkspace:
     """
@@ -15,14 +20,22 @@ class GlobalWorkspace:
     def __init__(self):
         self.modules: list[CognitiveModule] = []
         self.current_conscious_content: BroadcastMessage | None = None
-        self.history: list[BroadcastMessage] = []
+        self.history: deque[BroadcastMessage] = deque(maxlen=_HISTORY_SIZE)
         self.step_counter: int = 0
+        self._inbox: deque[BroadcastMessage] = deque()
 
     def register_module(self, module: CognitiveModule) -> None:
         self.modules.append(module)
         logger.info(f"Module registered in GWT: {module.name}")
 
-    def tick(self) -> BroadcastMessage | None:
+    def post(self, message: BroadcastMessage) -> None:
+        """
+        Enfileira um candidato vindo de fora do ciclo (ex: resultado async).
+        Ele compete a cada tick e só sai da fila quando vence.
+        """
+        self._inbox.append(message)
+
+    async def tick(self) -> BroadcastMessage | None:
         """
         Executa um ciclo cognitivo completo.
         1. Envia contexto atual para todos os módulos.
@@ -31,16 +44,37 @@ class GlobalWorkspace:
         4. Atualiza contexto.
         """
         self.step_counter += 1
-        candidates: list[BroadcastMessage] = []
+        context = self.current_conscious_content
+        results: list[BroadcastMessage | None] = []
+        pending: list[tuple[int, CognitiveModule, asyncio.Task]] = []
 
-        # 1. Parallel execution (synchronous for now, but conceptual parallel)
+        # 1. Execucao paralela: run_step sincrono roda inline; os async rodam juntos
+        # (tempo do tick = o mais lento, nao a soma)
         for module in self.modules:
             try:
-                candidate = module.run_step(self.current_conscious_content)
-                if candidate:
-                    candidates.append(candidate)
+                result = module.run_step(context)
             except Exception as e:
                 logger.error(f"Error in module {module.name}: {e}", exc_info=True)
+                continue
+            if inspect.isawaitable(result):
+                # eager: quem retorna sem await (ex: is_busy) nem passa pelo scheduler
+                task = asyncio.eager_task_factory(asyncio.get_running_loop(), result)
+                pending.append((len(results), module, task))
+                result = None  # preenchido depois do gather, na mesma posicao
+            results.append(result)
+
+        if pending:
+            done = await asyncio.gather(*(t for _, _, t in pending), return_exceptions=True)
+            for (idx, module, _), result in zip(pending, done, strict=True):
+                if isinstance(result, BaseException):
+                    logger.error(f"Error in module {module.name}: {result}", exc_info=result)
+                    result = None
+                results[idx] = result
+
+        candidates: list[BroadcastMessage] = [r for r in results if r]
+        n_module = len(candidates)
+        inbox = self._inbox
+        candidates.extend(inbox)
 
         if not candidates:
             # Silence... nothing happened.
@@ -50,15 +84,21 @@ class GlobalWorkspace:
 
         # 2. Competition: Winner-Take-All
         # TODO: Add noise/probabilistic selection logic (Softmax)
-        winner = max(candidates, key=lambda msg: msg.saliency)
+        # passada unica sem lambda; ">" mantem o primeiro em caso de empate (como max)
+        win_idx = 0
+        best = candidates[0].saliency
+        for i, msg in enumerate(candidates):
+            if msg.saliency > best:
+                best = msg.saliency
+                win_idx = i
+        winner = candidates[win_idx]
+        if win_idx >= n_module:
+            # postado venceu: sai da fila; os postados que perderam competem de novo
+            del inbox[win_idx - n_module]
 
         # 3. Update Global Workspace
         self.current_conscious_content = winner
-        self.history.append(winner)  # Short-term history
-
-        # Limit history size
-        if len(self.history) > 100:
-            self.history.pop(0)
+        self.history.append(winner)  # Short-term history (deque evicts the oldest)
 
         logger.debug(f"GWT Tick {self.step_counter}: Winner -> {winner}")
         return winner
@@ -7,19 +7,31 @@ Enton real-time awareness of his computational resources.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import platform
 import shutil
 import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
 import psutil
 
+try:
+    import pynvml
+except ImportError:  # sem NVML: cai no nvidia-smi
+    pynvml = None
+
 logger = logging.getLogger(__name__)
 
+# Pool proprio pras sondas bloqueantes (nvidia-smi ate 5s): rodam juntas
+# sem disputar o executor default do loop
+_PROBE_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hw-probe")
+
 
-@dataclass
+@dataclass(slots=True)
 class GPUInfo:
     """Single GPU device info."""
 
@@ -37,7 +49,7 @@ class GPUInfo:
     compute_capability: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DiskInfo:
     """Disk mount info."""
 
@@ -50,7 +62,7 @@ class DiskInfo:
     fstype: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class HardwareProfile:
     """Full hardware profile — Enton's self-awareness of his power."""
 
@@ -148,18 +160,76 @@ class HardwareProfile:
 
 def detect_hardware(workspace_path: str = "") -> HardwareProfile:
     """Detect all hardware — called on boot and periodically."""
-    hw = HardwareProfile()
+    return detect_dynamic(detect_static(), workspace_path)
+
+
+async def detect_hardware_async(workspace_path: str = "") -> HardwareProfile:
+    """Same as :func:`detect_hardware`, without blocking the event loop."""
+    return await detect_dynamic_async(detect_static(), workspace_path)
+
+
+@functools.cache
+def _static_fields() -> dict[str, str | int | float]:
+    """Values fixed for the process lifetime (CPU model, cores, OS, boot time)."""
+    uname = platform.uname()
+    return {
+        "cpu_arch": uname.machine,
+        "cpu_cores_physical": psutil.cpu_count(logical=False) or 1,
+        "cpu_cores_logical": psutil.cpu_count(logical=True) or 1,
+        "cpu_model": _get_cpu_model(),
+        "hostname": uname.node,
+        "os_name": uname.system,
+        "os_version": uname.version,
+        "kernel": uname.release,
+        "boot_time": psutil.boot_time(),
+    }
+
+
+def detect_static() -> HardwareProfile:
+    """Fresh profile with only the static fields filled (probed once per process)."""
+    fields = dict(_static_fields())
+    boot_time = fields.pop("boot_time")
+    hw = HardwareProfile(**fields)
+    hw.uptime_hours = (time.time() - boot_time) / 3600
+    return hw
+
+
+def _cpu_percent() -> float:
+    return psutil.cpu_percent(interval=0.1)
+
+
+def _probes() -> tuple:
+    # resolvido a cada chamada (testes fazem patch nas funcoes do modulo)
+    return (_cpu_percent, _detect_gpus, _detect_disks, _detect_ips)
+
+
+def detect_dynamic(hw: HardwareProfile, workspace_path: str = "") -> HardwareProfile:
+    """Fill the live metrics (usage, freq, RAM, GPUs, disks, IPs) into ``hw``.
+
+    The blocking probes run concurrently, so a refresh costs the slowest one.
+    """
+    futures = [_PROBE_POOL.submit(probe) for probe in _probes()]
+    return _fill_dynamic(hw, workspace_path, [f.result() for f in futures])
+
+
+async def detect_dynamic_async(hw: HardwareProfile, workspace_path: str = "") -> HardwareProfile:
+    """Async :func:`detect_dynamic`: probes run on the probe pool and are gathered."""
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(
+        *(loop.run_in_executor(_PROBE_POOL, probe) for probe in _probes())
+    )
+    return _fill_dynamic(hw, workspace_path, results)
+
+
+def _fill_dynamic(hw: HardwareProfile, workspace_path: str, results) -> HardwareProfile:
+    cpu_percent, gpus, disks, ips = results  # ordem de _probes()
 
     # --- CPU ---
-    hw.cpu_arch = platform.machine()
-    hw.cpu_cores_physical = psutil.cpu_count(logical=False) or 1
-    hw.cpu_cores_logical = psutil.cpu_count(logical=True) or 1
     freq = psutil.cpu_freq()
     if freq:
         hw.cpu_freq_max_mhz = freq.max or freq.current
         hw.cpu_freq_current_mhz = freq.current
-    hw.cpu_percent = psutil.cpu_percent(interval=0.1)
-    hw.cpu_model = _get_cpu_model()
+    hw.cpu_percent = cpu_percent
 
     # --- RAM ---
     mem = psutil.virtual_memory()
@@ -168,22 +238,10 @@ def detect_hardware(workspace_path: str = "") -> HardwareProfile:
     hw.ram_used_gb = mem.used / (1 << 30)
     hw.ram_percent = mem.percent
 
-    # --- GPU ---
-    hw.gpus = _detect_gpus()
-
-    # --- Disks ---
-    hw.disks = _detect_disks()
-
-    # --- System ---
-    uname = platform.uname()
-    hw.hostname = uname.node
-    hw.os_name = uname.system
-    hw.os_version = platform.version()
-    hw.kernel = uname.release
-    hw.uptime_hours = (time.time() - psutil.boot_time()) / 3600
-
-    # --- Network ---
-    hw.ip_addresses = _detect_ips()
+    # --- GPU / Disks / Network ---
+    hw.gpus = gpus
+    hw.disks = disks
+    hw.ip_addresses = ips
 
     # --- Workspace ---
     if workspace_path:
@@ -197,6 +255,7 @@ def detect_hardware(workspace_path: str = "") -> HardwareProfile:
     return hw
 
 
+@functools.cache
 def _get_cpu_model() -> str:
     """Extract CPU model name from /proc/cpuinfo or platform."""
     try:
@@ -209,7 +268,74 @@ def _get_cpu_model() -> str:
     return platform.processor() or "unknown"
 
 
+@functools.cache
+def _nvml_ready() -> bool:
+    """Initialize NVML once; False when the library or the driver is missing."""
+    if pynvml is None:
+        return False
+    try:
+        pynvml.nvmlInit()
+    except pynvml.NVMLError:
+        return False
+    return True
+
+
+def _nvml_or(default, fn, *args):
+    """Optional NVML metric (not every board reports power/temperature)."""
+    try:
+        return fn(*args)
+    except pynvml.NVMLError:
+        return default
+
+
+def _as_str(value: str | bytes) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
 def _detect_gpus() -> list[GPUInfo]:
+    """Detect NVIDIA GPUs via NVML (driver calls), falling back to nvidia-smi."""
+    if _nvml_ready():
+        try:
+            return _detect_gpus_nvml()
+        except pynvml.NVMLError:
+            logger.debug("NVML query failed, falling back to nvidia-smi", exc_info=True)
+    return _detect_gpus_smi()
+
+
+def _detect_gpus_nvml() -> list[GPUInfo]:
+    nv = pynvml
+    driver = _as_str(nv.nvmlSystemGetDriverVersion())
+    cuda = ""
+    gpus = []
+    for index in range(nv.nvmlDeviceGetCount()):
+        handle = nv.nvmlDeviceGetHandleByIndex(index)
+        mem = nv.nvmlDeviceGetMemoryInfo(handle)
+        util = _nvml_or(None, nv.nvmlDeviceGetUtilizationRates, handle)
+        major, minor = _nvml_or((0, 0), nv.nvmlDeviceGetCudaComputeCapability, handle)
+        if not cuda:
+            cuda = _get_cuda_version()
+        gpus.append(
+            GPUInfo(
+                index=index,
+                name=_as_str(nv.nvmlDeviceGetName(handle)),
+                vram_total_mb=mem.total >> 20,
+                vram_used_mb=mem.used >> 20,
+                vram_free_mb=mem.free >> 20,
+                utilization_pct=util.gpu if util is not None else 0,
+                temperature_c=_nvml_or(
+                    0, nv.nvmlDeviceGetTemperature, handle, nv.NVML_TEMPERATURE_GPU
+                ),
+                power_draw_w=_nvml_or(0, nv.nvmlDeviceGetPowerUsage, handle) / 1000,
+                power_limit_w=_nvml_or(0, nv.nvmlDeviceGetPowerManagementLimit, handle) / 1000,
+                driver_version=driver,
+                cuda_version=cuda,
+                compute_capability=f"{major}.{minor}" if major else "",
+            )
+        )
+    return gpus
+
+
+def _detect_gpus_smi() -> list[GPUInfo]:
     """Detect NVIDIA GPUs via nvidia-smi."""
     try:
         result = subprocess.run(
@@ -261,6 +387,7 @@ def _detect_gpus() -> list[GPUInfo]:
         return []
 
 
+@functools.cache
 def _get_cuda_version() -> str:
     """Get CUDA version from nvidia-smi."""
     try:
@@ -283,6 +410,7 @@ def _get_cuda_version() -> str:
     return ""
 
 
+@functools.cache
 def _get_compute_capability(gpu_name: str) -> str:
     """Known compute capabilities for common GPUs."""
     cc_map = {
@@ -6,6 +6,8 @@ Stores triples in Qdrant collection 'enton_knowledge' with embeddings.
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import json
 import logging
 import re
@@ -13,12 +15,23 @@ from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 import httpx
-from agno.knowledge.embedder.ollama import OllamaEmbedder
-from bs4 import BeautifulSoup
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, PointStruct, VectorParams
+from bs4 import BeautifulSoup, SoupStrainer
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import Batch, Distance, VectorParams
 
+from enton.core._embedders import aembed_many, nomic_embedder
 from enton.core.crawler_engine import Crawl4AIEngine
+from enton.core.query_cache import EMBED_CACHE
+
+try:
+    import orjson
+except ImportError:  # stdlib json fallback
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # bs4 (so os links de resultado)
+    HTMLParser = None
 
 if TYPE_CHECKING:
     from enton.cognition.brain import EntonBrain
@@ -28,6 +41,13 @@ logger = logging.getLogger(__name__)
 KNOWLEDGE_COLLECTION = "enton_knowledge"
 EMBED_DIM = 768  # nomic-embed-text dimension
 MAX_TEXT_LEN = 10000  # Increased for better context
+# Extracoes de triples (chamadas ao LLM) simultaneas por learn_topic
+_MAX_EXTRACTIONS = 3
+
+# Cerca markdown no inicio/fim da resposta do LLM (```json ... ```)
+_FENCE_RE = re.compile(r"^```\w*\n?|\n?```$")
+# orjson.JSONDecodeError herda de json.JSONDecodeError: um except cobre os dois
+_loads = orjson.loads if orjson is not None else json.loads
 
 
 @dataclass(frozen=True, slots=True)
@@ -41,6 +61,20 @@ class KnowledgeTriple:
     confidence: float = 1.0
 
 
+_RESULT_LINKS = SoupStrainer("a", class_=re.compile(r"(?:^|\s)result__a(?:\s|$)"))
+
+
+def _parse_results(html: str) -> list[str]:
+    """Result URLs (``a.result__a``) from a DuckDuckGo HTML results page."""
+    if HTMLParser is not None:
+        hrefs = (n.attributes.get("href") or "" for n in HTMLParser(html).css("a.result__a"))
+    else:
+        # parse_only: monta so os <a> de resultado, nao o DOM inteiro
+        soup = BeautifulSoup(html, "html.parser", parse_only=_RESULT_LINKS)
+        hrefs = (a.get("href", "") for a in soup.find_all("a"))
+    return [h for h in hrefs if h.startswith("http")]
+
+
 class KnowledgeCrawler:
     """Crawls web pages and extracts knowledge triples via LLM."""
 
@@ -51,44 +85,45 @@ class KnowledgeCrawler:
     ) -> None:
         self._brain = brain
         self._qdrant_url = qdrant_url
-        self._qdrant: Any = None
+        self._qdrant: AsyncQdrantClient | None = None
+        self._qdrant_lock = asyncio.Lock()
         self._embedder: Any = None
         self._triple_count = 0
         self._engine = Crawl4AIEngine()
 
     # -- initialization --
 
-    def _init_qdrant(self) -> bool:
+    async def _init_qdrant(self) -> bool:
         """Initialize Qdrant collection for knowledge triples (lazy)."""
         if self._qdrant is not None:
             return True
-        try:
-            client = QdrantClient(url=self._qdrant_url, timeout=5)
-            collections = [c.name for c in client.get_collections().collections]
-            if KNOWLEDGE_COLLECTION not in collections:
-                client.create_collection(
-                    collection_name=KNOWLEDGE_COLLECTION,
-                    vectors_config=VectorParams(
-                        size=EMBED_DIM,
-                        distance=Distance.COSINE,
-                    ),
-                )
-                logger.info("Created Qdrant collection '%s'", KNOWLEDGE_COLLECTION)
-            self._qdrant = client
-            return True
-        except Exception:
-            logger.warning("Qdrant unavailable for knowledge crawler")
-            return False
+        async with self._qdrant_lock:  # learn_* concorrentes dividem um client
+            if self._qdrant is not None:
+                return True
+            try:
+                client = AsyncQdrantClient(url=self._qdrant_url, timeout=5)
+                collections = [c.name for c in (await client.get_collections()).collections]
+                if KNOWLEDGE_COLLECTION not in collections:
+                    await client.create_collection(
+                        collection_name=KNOWLEDGE_COLLECTION,
+                        vectors_config=VectorParams(
+                            size=EMBED_DIM,
+                            distance=Distance.COSINE,
+                        ),
+                    )
+                    logger.info("Created Qdrant collection '%s'", KNOWLEDGE_COLLECTION)
+                self._qdrant = client
+                return True
+            except Exception:
+                logger.warning("Qdrant unavailable for knowledge crawler")
+                return False
 
     def _get_embedder(self) -> Any:
         """Return OllamaEmbedder for nomic-embed-text."""
         if self._embedder is not None:
             return self._embedder
         try:
-            self._embedder = OllamaEmbedder(
-                id="nomic-embed-text",
-                dimensions=EMBED_DIM,
-            )
+            self._embedder = nomic_embedder()
             return self._embedder
         except Exception:
             logger.warning("Ollama embedder unavailable")
@@ -127,16 +162,19 @@ class KnowledgeCrawler:
 
         try:
             response = await self._brain.think(prompt)
-            if not response:
-                return []
+        except Exception:
+            logger.warning("Failed to extract triples from LLM response")
+            return []
+        if not response:
+            return []
 
-            # Strip markdown fences if present
-            clean = response.strip()
-            if clean.startswith("```"):
-                clean = re.sub(r"^```\w*\n?", "", clean)
-                clean = re.sub(r"\n?```$", "", clean)
+        # Strip markdown fences if present
+        clean = response.strip()
+        if clean.startswith("```"):
+            clean = _FENCE_RE.sub("", clean)
 
-            data = json.loads(clean)
+        try:
+            data = _loads(clean)
             if not isinstance(data, list):
                 return []
 
@@ -152,7 +190,7 @@ class KnowledgeCrawler:
                         )
                     )
             return triples
-        except (json.JSONDecodeError, Exception):
+        except (json.JSONDecodeError, KeyError, TypeError):
             logger.warning("Failed to extract triples from LLM response")
             return []
 
@@ -200,24 +238,34 @@ class KnowledgeCrawler:
         # Parallel crawl with Crawl4AI
         results = await self._engine.crawl_many(target_urls)
 
-        all_triples: list[KnowledgeTriple] = []
+        # extracao (LLM) em paralelo, limitada a _MAX_EXTRACTIONS chamadas simultaneas
+        sem = asyncio.Semaphore(_MAX_EXTRACTIONS)
+
+        async def bounded(res: dict) -> list[KnowledgeTriple]:
+            async with sem:
+                return await self._process_result(res)
 
-        for res in results:
-            url = res.get("url", "")
-            markdown = res.get("markdown", "")
+        batches = await asyncio.gather(*(bounded(r) for r in results), return_exceptions=True)
+        for res, batch in zip(results, batches, strict=True):
+            if isinstance(batch, BaseException):
+                logger.warning(f"Failed to learn from {res.get('url', '')}: {batch}")
+        return list(itertools.chain.from_iterable(b for b in batches if isinstance(b, list)))
 
-            if res.get("error") or not markdown:
-                logger.warning(f"Failed to learn from {url}: {res.get('error')}")
-                continue
+    async def _process_result(self, res: dict) -> list[KnowledgeTriple]:
+        """Extract and store the knowledge of one crawled page."""
+        url = res.get("url", "")
+        markdown = res.get("markdown", "")
 
-            # Extract knowledge from content
-            triples = await self.extract_triples(markdown, source_url=url)
-            if triples:
-                await self._store_triples(triples)
-                all_triples.extend(triples)
-                logger.info(f"Learned {len(triples)} facts from {url}")
+        if res.get("error") or not markdown:
+            logger.warning(f"Failed to learn from {url}: {res.get('error')}")
+            return []
 
-        return all_triples
+        # Extract knowledge from content
+        triples = await self.extract_triples(markdown, source_url=url)
+        if triples:
+            await self._store_triples(triples)
+            logger.info(f"Learned {len(triples)} facts from {url}")
+        return triples
 
     async def _search_web(self, query: str) -> list[str]:
         """DuckDuckGo HTML search — returns list of URLs."""
@@ -232,12 +280,8 @@ class KnowledgeCrawler:
                     headers={"User-Agent": "Enton/0.3 (AI Assistant)"},
                 )
 
-            soup = BeautifulSoup(resp.text, "html.parser")
-            urls = []
-            for link in soup.select("a.result__a"):
-                href = link.get("href", "")
-                if href.startswith("http"):
-                    urls.append(href)
+            # parse e CPU puro: fora do loop pra nao travar o tick do GWT
+            urls = await asyncio.to_thread(_parse_results, resp.text)
             return urls[:5]
         except Exception:
             logger.warning("Web search failed for '%s'", query)
@@ -247,7 +291,7 @@ class KnowledgeCrawler:
 
     async def _store_triples(self, triples: list[KnowledgeTriple]) -> None:
         """Embed and store triples in Qdrant."""
-        if not triples or not self._init_qdrant():
+        if not triples or not await self._init_qdrant():
             return
 
         embedder = self._get_embedder()
@@ -255,32 +299,36 @@ class KnowledgeCrawler:
             return
 
         try:
-            points = []
-            for triple in triples:
-                text = f"{triple.subject} {triple.predicate} {triple.obj}"
-                resp = embedder.get_embedding(text)
-                if resp is None:
+            # um unico request de embedding pro lote inteiro
+            texts = [f"{t.subject} {t.predicate} {t.obj}" for t in triples]
+            vectors = await aembed_many(embedder, texts)
+
+            # colunar (Batch): sem um PointStruct validado por ponto
+            ids: list[int] = []
+            kept: list[list[float]] = []
+            payloads: list[dict[str, str]] = []
+            for triple, embedding in zip(triples, vectors, strict=True):
+                if not embedding:
                     continue
-                embedding = resp
 
                 self._triple_count += 1
-                points.append(
-                    PointStruct(
-                        id=self._triple_count,
-                        vector=embedding,
-                        payload={
-                            "subject": triple.subject,
-                            "predicate": triple.predicate,
-                            "obj": triple.obj,
-                            "source_url": triple.source_url,
-                        },
-                    )
+                ids.append(self._triple_count)
+                kept.append(embedding)
+                payloads.append(
+                    {
+                        "subject": triple.subject,
+                        "predicate": triple.predicate,
+                        "obj": triple.obj,
+                        "source_url": triple.source_url,
+                    }
                 )
 
-            if points:
-                self._qdrant.upsert(
+            if ids:
+                # wait=False: escrita fire-and-forget, nao espera a persistencia
+                await self._qdrant.upsert(
                     collection_name=KNOWLEDGE_COLLECTION,
-                    points=points,
+                    points=Batch(ids=ids, vectors=kept, payloads=payloads),
+                    wait=False,
                 )
         except Exception:
             logger.warning("Failed to store triples in Qdrant")
@@ -289,7 +337,7 @@ class KnowledgeCrawler:
 
     async def search(self, query: str, n: int = 5) -> list[dict]:
         """Semantic search over knowledge triples."""
-        if not self._init_qdrant():
+        if not await self._init_qdrant():
             return []
 
         embedder = self._get_embedder()
@@ -297,11 +345,11 @@ class KnowledgeCrawler:
             return []
 
         try:
-            embedding = embedder.get_embedding(query)
-            if embedding is None:
+            embedding = await EMBED_CACHE.aembed(embedder, query)
+            if not embedding:
                 return []
 
-            response = self._qdrant.query_points(
+            response = await self._qdrant.query_points(
                 collection_name=KNOWLEDGE_COLLECTION,
                 query=embedding,
                 limit=n,
@@ -13,9 +13,9 @@ from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
 from agno.knowledge import Knowledge as AgentKnowledge
-from agno.knowledge.embedder.ollama import OllamaEmbedder
 from agno.vectordb.qdrant import Qdrant
 
+from enton.core._embedders import nomic_embedder
 from enton.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -46,7 +46,7 @@ def create_knowledge():
     try:
         vector_db = Qdrant(
             collection="enton_episodes",
-            embedder=OllamaEmbedder(id="nomic-embed-text", dimensions=768),
+            embedder=nomic_embedder(),
             url=settings.qdrant_url,
         )
         knowledge = AgentKnowledge(vector_db=vector_db)
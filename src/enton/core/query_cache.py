@@ -0,0 +1,179 @@
+"""QueryCache — in-process semantic cache for vector search results.
+
+Ring buffer of recent (query embedding, results) pairs. A repeated query
+string hits before embedding; a near-duplicate query (cosine >= threshold)
+hits before the Qdrant round trip.
+
+EMBED_CACHE is the exact-string embedding LRU shared by BlobStore and
+CommonsenseKB, so identical texts never re-hit Ollama.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Bounded LRU of text -> embedding, keyed by a 16-byte blake2b digest."""
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self._maxsize = maxsize
+        self._data: OrderedDict[bytes, list[float]] = OrderedDict()
+        # embed() runs in worker threads (asyncio.to_thread)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def _key(embedder: Any, text: str) -> bytes:
+        raw = f"{getattr(embedder, 'id', '')}\x00{text}".encode()
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def lookup(self, embedder: Any, text: str) -> list[float] | None:
+        key = self._key(embedder, text)
+        with self._lock:
+            emb = self._data.get(key)
+            if emb is not None:
+                self._data.move_to_end(key)
+            return emb
+
+    def embed(self, embedder: Any, text: str) -> list[float] | None:
+        """Cached ``embedder.get_embedding(text)`` (blocking on miss)."""
+        emb = self.lookup(embedder, text)
+        if emb is not None:
+            return emb
+        emb = embedder.get_embedding(text)
+        self._insert(embedder, text, emb)
+        return emb
+
+    async def aembed(self, embedder: Any, text: str) -> list[float] | None:
+        """Async variant: uses the embedder's async client when it has one."""
+        emb = self.lookup(embedder, text)
+        if emb is not None:
+            return emb
+        aget = getattr(embedder, "async_get_embedding", None)
+        if inspect.iscoroutinefunction(aget):
+            emb = await aget(text)
+        else:
+            emb = await asyncio.to_thread(embedder.get_embedding, text)
+        self._insert(embedder, text, emb)
+        return emb
+
+    def _insert(self, embedder: Any, text: str, emb: list[float] | None) -> None:
+        if not emb:
+            return
+        key = self._key(embedder, text)
+        with self._lock:
+            self._data[key] = emb
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+EMBED_CACHE = EmbeddingCache()
+
+
+class QueryCache:
+    """Semantic cache for ``search(query)`` results, scoped by filter key.
+
+    Embeddings are stored int8-quantized with a per-row scale (~4x smaller
+    than float32); the cosine error is far below the match threshold.
+    """
+
+    def __init__(
+        self,
+        dim: int = 768,
+        capacity: int = 256,
+        threshold: float = 0.95,
+        ttl: float = 300.0,
+    ) -> None:
+        self._threshold = threshold
+        self._ttl = ttl
+        self._capacity = capacity
+        self._vecs = np.zeros((capacity, dim), dtype=np.int8)
+        self._scales = np.zeros(capacity, dtype=np.float32)
+        self._stamps = np.zeros(capacity, dtype=np.float64)
+        self._scopes: list[str | None] = [None] * capacity
+        self._queries: list[str | None] = [None] * capacity
+        self._results: list[list[Any]] = [[] for _ in range(capacity)]
+        self._index: dict[tuple[str, str], int] = {}
+        self._next = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def normalize(embedding: list[float]) -> np.ndarray | None:
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    def get_exact(self, query: str, scope: str = "") -> list[Any] | None:
+        """Hit by query string alone — skips the embed call too."""
+        row = self._index.get((scope, query))
+        if row is None or not self._fresh(row):
+            return None
+        self.hits += 1
+        return list(self._results[row])
+
+    def lookup(self, vec: np.ndarray, scope: str = "") -> list[Any] | None:
+        """Best cached entry with cosine >= threshold in the same scope."""
+        if not self._size:
+            self.misses += 1
+            return None
+        sims = (self._vecs[: self._size] @ vec) * self._scales[: self._size]
+        for row in np.argsort(sims)[::-1]:
+            if sims[row] < self._threshold:
+                break
+            if self._scopes[row] == scope and self._fresh(row):
+                self.hits += 1
+                return list(self._results[row])
+        self.misses += 1
+        return None
+
+    def put(self, query: str, vec: np.ndarray, results: list[Any], scope: str = "") -> None:
+        key = (scope, query)
+        row = self._index.get(key)
+        if row is None:
+            row = self._next
+            old = self._queries[row]
+            if old is not None:
+                self._index.pop((self._scopes[row], old), None)
+            self._next = (row + 1) % self._capacity
+            self._size = min(self._size + 1, self._capacity)
+            self._index[key] = row
+        scale = float(np.abs(vec).max()) / 127 or 1.0
+        self._vecs[row] = np.round(vec / scale)
+        self._scales[row] = scale
+        self._stamps[row] = time.monotonic()
+        self._scopes[row] = scope
+        self._queries[row] = query
+        self._results[row] = list(results)
+
+    def clear(self) -> None:
+        """Drop everything (e.g. after the underlying collection changed)."""
+        self._index.clear()
+        self._scopes = [None] * self._capacity
+        self._queries = [None] * self._capacity
+        self._results = [[] for _ in range(self._capacity)]
+        self._next = 0
+        self._size = 0
+
+    def _fresh(self, row: int) -> bool:
+        return time.monotonic() - self._stamps[row] <= self._ttl
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import math
+import sys
 
 import numpy as np
 
@@ -111,5 +112,6 @@ def classify(kpts) -> tuple[str, tuple[int, int, int]]:
             tags.append(("Bracos cruzados", (200, 100, 255)))
 
     if tags:
-        return " | ".join(t[0] for t in tags), tags[0][1]
+        # combinacoes se repetem frame a frame: uma string so por combinacao
+        return sys.intern(" | ".join(t[0] for t in tags)), tags[0][1]
     return "Parado", (200, 200, 200)
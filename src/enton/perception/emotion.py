@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import sys
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
@@ -138,7 +139,7 @@ class EmotionRecognizer:
             try:
                 preds = pipe(pil_img)
                 top = preds[0]
-                label_en = top["label"]
+                label_en = sys.intern(top["label"])  # ~7 labels, string nova por inferencia
                 results.append(
                     FaceEmotion(
                         label=_LABEL_MAP.get(label_en, label_en),
@@ -8,7 +8,6 @@ Exposes the SubAgentOrchestrator to the LLM so Enton can:
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import TYPE_CHECKING
 
@@ -47,6 +46,7 @@ class SubAgentTools(Toolkit):
         if result.content:
             parts.append(result.content)
         parts.append(f"\n(confianca: {result.confidence:.0%}, tempo: {result.elapsed_ms:.0f}ms)")
+        result.release()
 
         return "\n".join(parts)
 
@@ -69,6 +69,7 @@ class SubAgentTools(Toolkit):
             result.content,
             f"\n(confianca: {result.confidence:.0%}, tempo: {result.elapsed_ms:.0f}ms)",
         ]
+        result.release()
 
         return "\n".join(parts)
 
@@ -82,17 +83,14 @@ class SubAgentTools(Toolkit):
             task: A tarefa para todos os agentes executarem.
         """
         roles = ["vision", "research", "coding", "system"]
-        coros = [self._orchestrator.delegate(role, task) for role in roles]
-        results = await asyncio.gather(*coros, return_exceptions=True)
+        results = await self._orchestrator.delegate_many([(r, task) for r in roles])
 
         parts = [f"=== Consensus ({len(roles)} agentes) ===\n"]
-        for role, result in zip(roles, results, strict=True):
-            if isinstance(result, Exception):
-                parts.append(f"[{role}] ERRO: {result}\n")
-            else:
-                parts.append(
-                    f"[{result.agent_role}] (conf={result.confidence:.0%})\n{result.content}\n"
-                )
+        for result in results:
+            parts.append(
+                f"[{result.agent_role}] (conf={result.confidence:.0%})\n{result.content}\n"
+            )
+            result.release()
 
         return "\n---\n".join(parts)
 
@@ -16,7 +16,7 @@ from pathlib import Path
 
 from agno.tools import Toolkit
 
-from enton.core.hardware import HardwareProfile, detect_hardware
+from enton.core.hardware import HardwareProfile, detect_hardware, detect_hardware_async
 
 logger = logging.getLogger(__name__)
 
@@ -37,9 +37,9 @@ class WorkspaceTools(Toolkit):
         self.register(self.project_list)
         self.register(self.disk_usage)
 
-    def _refresh_hardware(self) -> None:
+    async def _refresh_hardware(self) -> None:
         """Refresh hardware stats (CPU/RAM/GPU are dynamic)."""
-        self._hardware = detect_hardware(str(self._workspace))
+        self._hardware = await detect_hardware_async(str(self._workspace))
 
     async def workspace_info(self) -> str:
         """Mostra info do workspace do Enton — onde eu vivo e trabalho.
@@ -112,7 +112,7 @@ class WorkspaceTools(Toolkit):
         Args:
             (nenhum)
         """
-        self._refresh_hardware()
+        await self._refresh_hardware()
         return self._hardware.summary()
 
     async def hardware_gpu(self) -> str:
@@ -121,7 +121,7 @@ class WorkspaceTools(Toolkit):
         Args:
             (nenhum)
         """
-        self._refresh_hardware()
+        await self._refresh_hardware()
         if not self._hardware.gpus:
             return "Nenhuma GPU NVIDIA detectada."
 
@@ -150,7 +150,7 @@ class WorkspaceTools(Toolkit):
         Args:
             (nenhum)
         """
-        self._refresh_hardware()
+        await self._refresh_hardware()
         hw = self._hardware
         lines = [
             "=== HARDWARE PROFILE ===",
@@ -266,7 +266,7 @@ class WorkspaceTools(Toolkit):
         Args:
             (nenhum)
         """
-        self._refresh_hardware()
+        await self._refresh_hardware()
         if not self._hardware.disks:
             return "Nenhum disco detectado."
 
@@ -63,3 +63,32 @@ def test_persistence(tmp_path):
 
     key = datetime.fromtimestamp(ts).strftime("%a-%H")
     assert engine2.model._stats[key]["total"] == 1
+
+
+def test_hour_key_matches_strftime():
+    """_hour_key deve bater com datetime.strftime('%a-%H') em horário local."""
+    from datetime import datetime
+
+    from enton.cognition.prediction import _hour_key
+
+    for ts in (0.0, 1696240800.0, 1700000000.0, 1710054000.0, 1730595600.0):
+        assert _hour_key(ts) == datetime.fromtimestamp(ts).strftime("%a-%H")
+
+
+def test_hour_key_follows_dst_change_inside_cached_window(monkeypatch):
+    """Offset cacheado antes da virada nao pode vazar para depois dela."""
+    import time
+    from datetime import datetime
+
+    from enton.cognition import prediction
+
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        monkeypatch.setattr(prediction, "_tz_window_start", -prediction._TZ_REFRESH_S - 1)
+        dst_start = 1710054000.0  # 2024-03-10 07:00 UTC: 02:00 EST -> 03:00 EDT
+        for ts in (dst_start - 300, dst_start + 300):
+            assert prediction._hour_key(ts) == datetime.fromtimestamp(ts).strftime("%a-%H")
+    finally:
+        monkeypatch.undo()
+        time.tzset()
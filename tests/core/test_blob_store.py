@@ -0,0 +1,222 @@
+"""Tests for BlobStore indexing."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from enton.core.blob_store import BlobStore, BlobType
+
+
+@pytest.fixture()
+def store(tmp_path):
+    bs = BlobStore(root=str(tmp_path / "hd" / "blobs"), fallback=str(tmp_path / "fb"))
+    bs._qdrant = AsyncMock()
+    bs._embedder = MagicMock(id="nomic-embed-text")
+    bs._embedder.get_embedding.return_value = [0.1] * 768
+    return bs
+
+
+@pytest.mark.asyncio()
+async def test_store_batches_upserts(store):
+    for i in range(3):
+        await store.store(b"x", BlobType.IMAGE, extension=".jpg", camera_id=f"cam{i}")
+    store._qdrant.upsert.assert_not_called()
+    await asyncio.sleep(0.3)
+    store._qdrant.upsert.assert_called_once()
+    assert len(store._qdrant.upsert.call_args.kwargs["points"]) == 3
+
+
+@pytest.mark.asyncio()
+async def test_flush_sends_pending_now(store):
+    await store.store(b"x", BlobType.AUDIO, extension=".wav")
+    await store.flush()
+    store._qdrant.upsert.assert_called_once()
+    assert store._flush_task is None
+    assert store._pending == []
+
+
+@pytest.mark.asyncio()
+async def test_full_batch_flushes_immediately(store):
+    from enton.core.blob_store import _FLUSH_BATCH
+
+    for _ in range(_FLUSH_BATCH):
+        await store.store(b"x", BlobType.FACE, extension=".jpg")
+    await asyncio.gather(*store._inflight)
+    store._qdrant.upsert.assert_called_once()
+    assert len(store._qdrant.upsert.call_args.kwargs["points"]) == _FLUSH_BATCH
+
+
+@pytest.mark.asyncio()
+async def test_store_returns_before_indexing(store):
+    gate = asyncio.Event()
+
+    async def slow_embed(text):
+        await gate.wait()
+        return [0.1] * 768
+
+    store._embed_text = slow_embed
+    meta = await store.store(b"abc", BlobType.SNAPSHOT, extension=".png")
+    assert Path(meta.path).read_bytes() == b"abc"
+    assert len(store._inflight) == 1
+    gate.set()
+    await store.flush()
+    assert not store._inflight
+    store._qdrant.upsert.assert_called_once()
+
+
+@pytest.mark.asyncio()
+async def test_failed_write_queues_no_point(store):
+    with (
+        patch.object(Path, "write_bytes", side_effect=OSError("disk full")),
+        pytest.raises(OSError),
+    ):
+        await store.store(b"abc", BlobType.SNAPSHOT, extension=".png")
+    await asyncio.gather(*store._inflight)
+    assert store._pending == []
+    await store.flush()
+    store._qdrant.upsert.assert_not_called()
+
+
+@pytest.mark.asyncio()
+async def test_stats_counts_follow_dir_changes(store):
+    await store.store(b"x", BlobType.IMAGE, extension=".jpg")
+    stats = await store.stats()
+    assert stats["counts"]["images"] == 1
+    assert stats["counts"]["audio"] == 0
+    await store.store(b"y", BlobType.IMAGE, extension=".jpg")
+    stats = await store.stats()
+    assert stats["counts"]["images"] == 2
+    await store.flush()
+
+
+@pytest.mark.asyncio()
+async def test_collection_setup_runs_once_per_server(tmp_path):
+    from enton.core import blob_store
+
+    blob_store._COLLECTIONS_ENSURED.clear()
+    client = AsyncMock()
+    client.get_collections.return_value.collections = []
+    with patch("enton.core.blob_store.AsyncQdrantClient", return_value=client):
+        for i in range(2):
+            bs = BlobStore(root=str(tmp_path / f"hd{i}" / "b"), fallback=str(tmp_path / f"fb{i}"))
+            assert await bs._init_qdrant() is True
+    client.create_collection.assert_called_once()
+    assert client.create_payload_index.call_count == 2
+    blob_store._COLLECTIONS_ENSURED.clear()
+
+
+@pytest.mark.asyncio()
+async def test_recent_orders_server_side(store):
+    point = MagicMock()
+    point.payload = {"blob_id": "1", "blob_type": "images", "timestamp": 2.0}
+    store._qdrant.scroll.return_value = ([point], None)
+    metas = await store.recent(BlobType.IMAGE, n=5)
+    assert [m.blob_id for m in metas] == ["1"]
+    kwargs = store._qdrant.scroll.call_args.kwargs
+    assert kwargs["limit"] == 5
+    assert kwargs["order_by"].key == "timestamp"
+
+
+def test_init_probes_hd_once(tmp_path):
+    with patch.object(BlobStore, "_check_hd", return_value=True) as probe:
+        bs = BlobStore(root=str(tmp_path / "hd" / "b"), fallback=str(tmp_path / "fb"))
+        assert bs.available is True
+        assert bs.active_root == tmp_path / "hd" / "b"
+    probe.assert_called_once()
+
+
+def test_unmounted_hd_uses_fallback(tmp_path):
+    bs = BlobStore(root=str(tmp_path / "missing" / "hd" / "b"), fallback=str(tmp_path / "fb"))
+    assert bs.available is False
+    assert bs.active_root == tmp_path / "fb"
+    assert (tmp_path / "fb" / "images").is_dir()
+
+
+def test_payload_roundtrip_and_upper_case_mime():
+    from enton.core.blob_store import _MIME_MAP, BlobMeta
+
+    assert _MIME_MAP[".JPG"] == "image/jpeg"
+    meta = BlobMeta(
+        blob_id="1_abc",
+        blob_type=BlobType.AUDIO,
+        path="/x/1_abc.wav",
+        size_bytes=3,
+        timestamp=1.5,
+        mime_type="audio/wav",
+        camera_id="cam0",
+        tags=["voz"],
+    )
+    assert BlobStore._payload_to_meta(BlobStore._meta_to_payload(meta)) == meta
+
+
+@pytest.mark.asyncio()
+async def test_untagged_blobs_hit_the_shared_embed_cache(store):
+    from enton.core.query_cache import EMBED_CACHE
+
+    EMBED_CACHE.clear()
+    for tags in ([], [], [], ["gato"]):
+        await store.store(b"x", BlobType.SNAPSHOT, extension=".jpg", camera_id="main", tags=tags)
+        await asyncio.gather(*store._inflight)
+    await store.flush()
+    texts = [c.args[0] for c in store._embedder.get_embedding.call_args_list]
+    assert texts == ["snapshots main", "snapshots main gato"]
+    EMBED_CACHE.clear()
+
+
+def test_point_id_is_deterministic():
+    assert BlobStore._point_id("1_abc") == BlobStore._point_id("1_abc")
+    assert BlobStore._point_id("1_abc") != BlobStore._point_id("1_abd")
+
+
+def test_payload_to_meta_tolerates_missing_keys():
+    meta = BlobStore._payload_to_meta({"blob_id": "old", "blob_type": "faces"})
+    assert meta.blob_id == "old"
+    assert meta.blob_type == BlobType.FACE
+    assert meta.tags == []
+    assert meta.mime_type == ""
+
+
+@pytest.mark.asyncio()
+async def test_store_file_copies_content(store, tmp_path):
+    src = tmp_path / "clip.MP4"
+    src.write_bytes(b"\x00\x01" * 100_000)
+    meta = await store.store_file(src, BlobType.VIDEO)
+    assert Path(meta.path).read_bytes() == src.read_bytes()
+    assert meta.size_bytes == 200_000
+    assert meta.mime_type == "video/mp4"
+    assert src.exists()
+    await store.flush()
+
+
+def test_fast_copy_falls_back_to_userspace(tmp_path):
+    from enton.core.blob_store import _fast_copy
+
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"abc" * 1000)
+    dst = tmp_path / "b.bin"
+    with (
+        patch("os.copy_file_range", side_effect=OSError),
+        patch("os.sendfile", side_effect=OSError),
+    ):
+        _fast_copy(src, dst)
+    assert dst.read_bytes() == src.read_bytes()
+
+
+@pytest.mark.asyncio()
+async def test_store_skips_mkdir_for_known_dirs(store):
+    with patch.object(Path, "mkdir") as mkdir:
+        await store.store(b"x", BlobType.IMAGE, extension=".jpg")
+    mkdir.assert_not_called()
+    await store.flush()
+
+
+def test_make_id_unique_and_time_prefixed(store):
+    ids = [store._make_id() for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    ts, suffix = ids[0].split("_")
+    assert len(ts) == 13
+    assert len(suffix) == 6
@@ -5,6 +5,8 @@ from __future__ import annotations
 import json
 import time
 
+import pytest
+
 from enton.core.context_engine import (
     ContextEngine,
     ContextEntry,
@@ -198,6 +200,8 @@ def test_budget_used_pct_zero_max():
     engine = ContextEngine(max_tokens=0)
     engine.set("a", "some content")
     assert engine.budget_used_pct == 0.0
+    # no ZeroDivisionError from the budget-pressure term
+    assert 0.0 <= engine.rot_score() <= 1.0
 
 
 def test_budget_used_pct_capped_at_100():
@@ -420,13 +424,14 @@ def test_checkpoint_persists_to_disk(tmp_path):
     engine = ContextEngine(checkpoint_dir=cp_dir)
     engine.set("k", "value", category="tool_result")
     cp_id = engine.checkpoint("disk-test")
+    engine.flush()
 
     path = cp_dir / f"{cp_id}.json"
     assert path.exists()
     data = json.loads(path.read_text(encoding="utf-8"))
     assert data["name"] == "disk-test"
-    assert len(data["entries"]) == 1
-    assert data["entries"][0]["key"] == "k"
+    assert data["entries"]["key"] == ["k"]
+    assert data["entries"]["category"] == ["tool_result"]
 
 
 def test_restore_from_disk_only(tmp_path):
@@ -435,6 +440,7 @@ def test_restore_from_disk_only(tmp_path):
     engine1 = ContextEngine(checkpoint_dir=cp_dir)
     engine1.set("k", "disk-value", category="memory", priority=0.9)
     cp_id = engine1.checkpoint("to-disk")
+    engine1.flush()
 
     # New engine instance (no in-memory checkpoints)
     engine2 = ContextEngine(checkpoint_dir=cp_dir)
@@ -449,6 +455,7 @@ def test_list_checkpoints_includes_disk(tmp_path):
     engine1 = ContextEngine(checkpoint_dir=cp_dir)
     engine1.set("k", "v")
     cp_id = engine1.checkpoint("on-disk")
+    engine1.flush()
 
     # Fresh engine with same dir
     engine2 = ContextEngine(checkpoint_dir=cp_dir)
@@ -741,3 +748,230 @@ def test_checkpoint_preserves_priority_and_ttl():
     assert entry.priority == 0.99
     assert entry.ttl == 120.0
     assert entry.category == "sensor"
+
+
+def test_current_tokens_tracks_mutations():
+    """Running token total stays equal to the sum over entries."""
+    engine = ContextEngine(max_tokens=10_000)
+    engine.set("a", "x" * 70)
+    engine.set("b", "y" * 35, ttl=0.01)
+    engine.set("a", "x" * 7)  # overwrite shrinks
+    assert engine.current_tokens == 2 + 10
+    engine.remove("a")
+    assert engine.current_tokens == 10
+    time.sleep(0.02)
+    engine.assemble()  # cleans stale "b"
+    assert engine.current_tokens == 0
+    assert engine.current_tokens == sum(e.token_estimate for e in engine._entries.values())
+
+
+def test_vectorized_scores_match_entry_scores():
+    """Batch scoring agrees with ContextEntry.relevance_score."""
+    engine = ContextEngine()
+    engine.set("a", "x", priority=0.9)
+    engine.set("b", "y", priority=0.1)
+    engine._entries["b"].timestamp -= 600
+    entries = list(engine._entries.values())
+    scores = engine._relevance_scores(entries)
+    for entry, score in zip(entries, scores, strict=True):
+        assert abs(entry.relevance_score() - score) < 1e-3
+
+
+def test_checkpoint_file_is_utf8_json_without_orjson(tmp_path, monkeypatch):
+    """Stdlib fallback writes the same readable JSON."""
+    import enton.core.context_engine as ce
+
+    monkeypatch.setattr(ce, "orjson", None)
+    engine = ContextEngine(checkpoint_dir=tmp_path)
+    engine.set("k", "ação", priority=0.8)
+    cp_id = engine.checkpoint("fallback")
+    engine.flush()
+    raw = (tmp_path / f"{cp_id}.json").read_text(encoding="utf-8")
+    assert "ação" in raw
+    fresh = ContextEngine(checkpoint_dir=tmp_path)
+    assert fresh.restore(cp_id)
+    assert fresh.get("k") == "ação"
+
+
+def test_compressed_checkpoint_roundtrip(tmp_path):
+    """compress=True writes .json.zst that restore/list read back."""
+    pytest.importorskip("zstandard")
+    engine = ContextEngine(checkpoint_dir=tmp_path, compress=True)
+    engine.set("k", "v" * 500, category="memory")
+    cp_id = engine.checkpoint("zst")
+    engine.flush()
+    path = tmp_path / f"{cp_id}.json.zst"
+    assert path.exists()
+    assert path.stat().st_size < 500
+
+    fresh = ContextEngine(checkpoint_dir=tmp_path)
+    assert [c["id"] for c in fresh.list_checkpoints()] == [cp_id]
+    assert fresh.restore(cp_id)
+    assert fresh.get("k") == "v" * 500
+
+
+def test_list_checkpoints_skips_unreadable_files(tmp_path):
+    (tmp_path / "broken.json").write_text("{not json")
+    (tmp_path / "broken2.json.zst").write_bytes(b"garbage")
+    (tmp_path / "notes.txt").write_text("x")
+    engine = ContextEngine(checkpoint_dir=tmp_path)
+    assert engine.list_checkpoints() == []
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_msgpack_checkpoint_roundtrip(tmp_path, compress):
+    """checkpoint_format='msgpack' writes .msgpack(.zst) read back by any engine."""
+    pytest.importorskip("msgpack")
+    if compress:
+        pytest.importorskip("zstandard")
+    engine = ContextEngine(checkpoint_dir=tmp_path, compress=compress, checkpoint_format="msgpack")
+    engine.set("k", "ação", priority=0.9, ttl=60.0)
+    cp_id = engine.checkpoint("mp", metadata={"n": 1})
+    engine.flush()
+    suffix = ".msgpack.zst" if compress else ".msgpack"
+    assert (tmp_path / f"{cp_id}{suffix}").exists()
+
+    fresh = ContextEngine(checkpoint_dir=tmp_path)
+    assert fresh.list_checkpoints()[0]["metadata"] == {"n": 1}
+    assert fresh.restore(cp_id)
+    assert fresh.get("k") == "ação"
+    assert fresh._entries["k"].ttl == 60.0
+
+
+def test_is_stale_at_uses_given_clock():
+    entry = ContextEntry(key="k", content="c", category="system", ttl=10.0, timestamp=100.0)
+    assert entry.is_stale_at(105.0) is False
+    assert entry.is_stale_at(111.0) is True
+    no_ttl = ContextEntry(key="k", content="c", category="system", timestamp=0.0)
+    assert no_ttl.is_stale_at(1e12) is False
+
+
+def test_assemble_partial_sort_matches_full_sort():
+    """Top-k selection yields the same text as a full relevance sort."""
+    import random
+
+    rng = random.Random(7)
+    engine = ContextEngine(max_tokens=300)
+    for i in range(200):
+        engine.set(f"k{i}", "x" * rng.randint(0, 120), priority=rng.random())
+    entries = sorted(engine._entries.values(), key=lambda e: e.relevance_score(), reverse=True)
+    expected, used = [], 0
+    for e in entries:
+        if used + e.token_estimate <= 300:
+            expected.append(f"[{e.category}:{e.key}] {e.content}")
+            used += e.token_estimate
+    assert engine.assemble() == "\n".join(expected)
+
+
+def test_context_entry_has_no_instance_dict():
+    entry = ContextEntry(key="k", content="c", category="system")
+    assert not hasattr(entry, "__dict__")
+
+
+def test_restore_legacy_row_checkpoint(tmp_path):
+    """Checkpoints saved as a list of entry dicts still restore."""
+    legacy = {
+        "id": "legacy1",
+        "name": "old",
+        "entries": [{"key": "k", "content": "v", "priority": 0.9}],
+        "metadata": {},
+        "created_at": 1.0,
+    }
+    (tmp_path / "legacy1.json").write_text(json.dumps(legacy), encoding="utf-8")
+    engine = ContextEngine(checkpoint_dir=tmp_path)
+    assert engine.list_checkpoints()[0]["entries"] == 1
+    assert engine.restore("legacy1")
+    entry = engine._entries["k"]
+    assert entry.priority == 0.9
+    assert entry.category == "system"
+
+
+def test_assemble_reuses_result_until_context_changes():
+    engine = ContextEngine(max_tokens=1000)
+    engine.set("a", "alpha")
+    first = engine.assemble()
+    assert engine.assemble() is first
+    assert engine.assemble(extra_budget=10) is not first
+
+    engine.set("b", "beta")
+    assert "beta" in engine.assemble()
+    engine.remove("b")
+    assert "beta" not in engine.assemble()
+
+
+def test_assemble_cache_expires_with_time(monkeypatch):
+    import enton.core.context_engine as ce
+
+    engine = ContextEngine(max_tokens=1000)
+    engine.set("a", "alpha")
+    first = engine.assemble()
+    monkeypatch.setattr(ce, "_ASSEMBLE_CACHE_TTL", 0.0)
+    assert engine.assemble() is not first
+
+
+def test_assemble_cache_drops_expired_entries():
+    engine = ContextEngine(max_tokens=1000)
+    engine.set("tmp", "short lived", ttl=60)
+    assert "short lived" in engine.assemble()
+    engine._entries["tmp"].timestamp -= 120
+    assert "short lived" not in engine.assemble()
+
+
+def test_assemble_by_category_cached_copy():
+    engine = ContextEngine()
+    engine.set("a", "x", category="sensor")
+    first = engine.assemble_by_category(["sensor"])
+    first["sensor"] = "mutated"
+    assert engine.assemble_by_category(["sensor"]) == {"sensor": "x"}
+    engine.set("b", "y", category="sensor")
+    assert engine.assemble_by_category(["sensor"]) == {"sensor": "x\ny"}
+
+
+def test_checkpoint_returns_before_disk_write(tmp_path, monkeypatch):
+    """checkpoint() hands the write to the writer thread; flush() waits for it."""
+    import threading
+
+    gate = threading.Event()
+    engine = ContextEngine(checkpoint_dir=tmp_path)
+    real_encode = engine._encode_checkpoint
+
+    def slow_encode(data):
+        gate.wait(5)
+        return real_encode(data)
+
+    monkeypatch.setattr(engine, "_encode_checkpoint", slow_encode)
+    engine.set("k", "v")
+    cp_id = engine.checkpoint("async")
+    assert not (tmp_path / f"{cp_id}.json").exists()
+    assert engine.restore(cp_id)  # in-memory copy is available right away
+    gate.set()
+    engine.flush()
+    assert (tmp_path / f"{cp_id}.json").exists()
+
+
+def test_flush_without_checkpoints_is_noop():
+    ContextEngine().flush()
+
+
+def test_list_checkpoints_rereads_bad_file_only_after_change(tmp_path, monkeypatch):
+    import os
+
+    import enton.core.context_engine as ce
+
+    bad = tmp_path / "late.json"
+    bad.write_text("{partial")
+    engine = ContextEngine(checkpoint_dir=tmp_path)
+    assert engine.list_checkpoints() == []
+
+    reads: list[str] = []
+    real_read = ce._read_checkpoint_file
+    monkeypatch.setattr(ce, "_read_checkpoint_file", lambda p: reads.append(p.name) or real_read(p))
+    assert engine.list_checkpoints() == []
+    assert reads == []  # unchanged broken file is not parsed again
+
+    payload = {"id": "late", "name": "done", "entries": [], "metadata": {}}
+    bad.write_text(json.dumps(payload))
+    st = bad.stat()
+    os.utime(bad, (st.st_atime, st.st_mtime + 5))
+    assert [c["name"] for c in engine.list_checkpoints()] == ["done"]
+    assert reads == ["late.json"]
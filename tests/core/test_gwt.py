@@ -64,15 +64,16 @@ class TestBroadcastMessage:
         assert msg.metadata["key"] == "value"
 
     def test_timestamp_auto_set(self):
-        before = time.time()
+        before = time.monotonic_ns()
         msg = BroadcastMessage(
             content="t",
             source="s",
             saliency=0.5,
             modality="m",
         )
-        after = time.time()
+        after = time.monotonic_ns()
         assert before <= msg.timestamp <= after
+        assert msg.timestamp_s == msg.timestamp / 1e9
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -125,7 +126,7 @@ class TestGlobalWorkspace:
         gw = GlobalWorkspace()
         assert gw.modules == []
         assert gw.current_conscious_content is None
-        assert gw.history == []
+        assert list(gw.history) == []
         assert gw.step_counter == 0
 
     def test_register_module(self):
@@ -135,19 +136,19 @@ class TestGlobalWorkspace:
         assert len(gw.modules) == 1
         assert gw.modules[0] is mod
 
-    def test_tick_no_modules(self):
+    async def test_tick_no_modules(self):
         gw = GlobalWorkspace()
-        result = gw.tick()
+        result = await gw.tick()
         assert result is None
         assert gw.step_counter == 1
 
-    def test_tick_no_candidates(self):
+    async def test_tick_no_candidates(self):
         gw = GlobalWorkspace()
         gw.register_module(DummyModule("silent"))
-        result = gw.tick()
+        result = await gw.tick()
         assert result is None
 
-    def test_tick_single_candidate(self):
+    async def test_tick_single_candidate(self):
         gw = GlobalWorkspace()
         msg = BroadcastMessage(
             content="thought",
@@ -156,50 +157,90 @@ class TestGlobalWorkspace:
             modality="inner_speech",
         )
         gw.register_module(DummyModule("mod1", response=msg))
-        result = gw.tick()
+        result = await gw.tick()
         assert result is msg
         assert gw.current_conscious_content is msg
         assert len(gw.history) == 1
 
-    def test_tick_winner_take_all(self):
+    async def test_tick_winner_take_all(self):
         gw = GlobalWorkspace()
         low = BroadcastMessage(content="low", source="s", saliency=0.2, modality="m")
         high = BroadcastMessage(content="high", source="s", saliency=0.9, modality="m")
         gw.register_module(DummyModule("low", response=low))
         gw.register_module(DummyModule("high", response=high))
-        result = gw.tick()
+        result = await gw.tick()
         assert result is high
         assert gw.current_conscious_content is high
 
-    def test_tick_passes_context_to_modules(self):
+    async def test_tick_passes_context_to_modules(self):
         gw = GlobalWorkspace()
         msg = BroadcastMessage(content="first", source="s", saliency=0.5, modality="m")
         mod = DummyModule("mod1", response=msg)
         gw.register_module(mod)
 
-        gw.tick()  # first tick — no context yet
+        await gw.tick()  # first tick — no context yet
         assert mod.received_context is None
 
-        gw.tick()  # second tick — should pass previous winner
+        await gw.tick()  # second tick — should pass previous winner
         assert mod.received_context is msg
 
-    def test_step_counter_increments(self):
+    async def test_step_counter_increments(self):
         gw = GlobalWorkspace()
         gw.register_module(DummyModule("mod"))
-        gw.tick()
-        gw.tick()
-        gw.tick()
+        await gw.tick()
+        await gw.tick()
+        await gw.tick()
         assert gw.step_counter == 3
 
-    def test_history_limit(self):
+    async def test_history_limit(self):
         gw = GlobalWorkspace()
         msg = BroadcastMessage(content="t", source="s", saliency=0.5, modality="m")
         gw.register_module(DummyModule("mod", response=msg))
         for _ in range(150):
-            gw.tick()
+            await gw.tick()
         assert len(gw.history) <= 100
 
-    def test_module_error_doesnt_crash(self):
+    async def test_async_modules_run_concurrently(self):
+        import asyncio
+
+        class SlowModule(CognitiveModule):
+            def __init__(self, name, saliency):
+                super().__init__(name)
+                self.saliency = saliency
+
+            async def run_step(self, context):
+                await asyncio.sleep(0.05)
+                return BroadcastMessage(
+                    content=self.name, source=self.name, saliency=self.saliency, modality="m"
+                )
+
+        class BrokenAsync(CognitiveModule):
+            async def run_step(self, context):
+                raise RuntimeError("boom")
+
+        gw = GlobalWorkspace()
+        for i in range(5):
+            gw.register_module(SlowModule(f"slow{i}", saliency=i / 10))
+        gw.register_module(BrokenAsync("broken"))
+        sync_msg = BroadcastMessage(content="sync", source="s", saliency=0.3, modality="m")
+        gw.register_module(DummyModule("sync", response=sync_msg))
+
+        start = time.perf_counter()
+        winner = await gw.tick()
+        elapsed = time.perf_counter() - start
+
+        assert winner.content == "slow4"
+        assert elapsed < 0.2  # ~max(0.05), not the 0.25 sum
+
+    async def test_tie_keeps_first_registered(self):
+        gw = GlobalWorkspace()
+        first = BroadcastMessage(content="a", source="s", saliency=0.6, modality="m")
+        second = BroadcastMessage(content="b", source="s", saliency=0.6, modality="m")
+        gw.register_module(DummyModule("a", response=first))
+        gw.register_module(DummyModule("b", response=second))
+        assert await gw.tick() is first
+
+    async def test_module_error_doesnt_crash(self):
         """Module that raises exception should not crash the workspace."""
 
         class ErrorModule(CognitiveModule):
@@ -214,10 +255,10 @@ class TestGlobalWorkspace:
         msg = BroadcastMessage(content="ok", source="s", saliency=0.5, modality="m")
         gw.register_module(DummyModule("safe", response=msg))
 
-        result = gw.tick()  # should not raise
+        result = await gw.tick()  # should not raise
         assert result is msg  # safe module still wins
 
-    def test_multiple_ticks_with_competition(self):
+    async def test_multiple_ticks_with_competition(self):
         gw = GlobalWorkspace()
         msg1 = BroadcastMessage(content="a", source="s", saliency=0.3, modality="m")
         msg2 = BroadcastMessage(content="b", source="s", saliency=0.8, modality="m")
@@ -225,9 +266,34 @@ class TestGlobalWorkspace:
         gw.register_module(DummyModule("m2", response=msg2))
 
         for _ in range(10):
-            result = gw.tick()
+            result = await gw.tick()
             assert result is msg2  # always wins due to higher saliency
 
+    async def test_posted_messages_compete_in_next_tick(self):
+        gw = GlobalWorkspace()
+        low = BroadcastMessage(content="low", source="s", saliency=0.2, modality="m")
+        gw.register_module(DummyModule("low", response=low))
+        posted = BroadcastMessage(content="async", source="a", saliency=0.9, modality="m")
+        gw.post(posted)
+        assert await gw.tick() is posted
+        assert await gw.tick() is low  # inbox consumed
+
+    async def test_losing_posted_messages_stay_queued(self):
+        gw = GlobalWorkspace()
+        high = BroadcastMessage(content="high", source="s", saliency=0.8, modality="m")
+        gw.register_module(DummyModule("high", response=high))
+        low = BroadcastMessage(content="low", source="p", saliency=0.3, modality="m")
+        top = BroadcastMessage(content="top", source="p", saliency=0.9, modality="m")
+        gw.post(low)
+        gw.post(top)
+        assert await gw.tick() is top
+        assert list(gw._inbox) == [low]  # perdeu, mas continua na fila
+        assert await gw.tick() is high
+        assert list(gw._inbox) == [low]
+        gw.modules.clear()
+        assert await gw.tick() is low
+        assert not gw._inbox
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  ExecutiveModule
@@ -277,6 +343,86 @@ class TestExecutiveModule:
         assert mod.skill_registry is registry
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  AgenticModule
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+
+def _agentic(result: str = "done"):
+    from unittest.mock import AsyncMock
+
+    from enton.core.gwt.modules.agentic import AgenticModule
+
+    brain = MagicMock()
+    brain.think = AsyncMock(return_value=result)
+    return AgenticModule(brain)
+
+
+def _intention(content: str, **metadata) -> BroadcastMessage:
+    return BroadcastMessage(
+        content=content, source="executive", saliency=1.0, modality="intention", metadata=metadata
+    )
+
+
+class TestAgenticModule:
+    async def test_tool_intention_runs_on_single_worker(self):
+        import asyncio
+
+        mod = _agentic("42")
+        ack = mod.run_step(_intention("use_tool:calc:some sum"))
+        assert "Executing tool calc" in ack.content
+        assert mod.is_busy
+        worker = mod._worker_task
+        assert worker is not None
+
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert not mod.is_busy
+        result = mod.run_step(None)
+        assert result.metadata["full_text"] == "Tool calc output: 42"
+
+        mod.run_step(_intention("agentic_task:x", instruction="read the news"))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert mod._worker_task is worker  # reused, not one task per job
+        mod.brain.think.assert_awaited_with("read the news")
+        worker.cancel()
+
+    async def test_busy_rejects_new_intentions(self):
+        mod = _agentic()
+        mod.run_step(_intention("agentic_task:first"))
+        assert mod.run_step(_intention("agentic_task:second")) is None
+        assert mod._jobs.qsize() == 1
+        mod._worker_task.cancel()
+
+    async def test_worker_result_is_posted_to_workspace(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+
+        from enton.core.gwt.modules.agentic import AgenticModule
+
+        gw = GlobalWorkspace()
+        brain = MagicMock()
+        brain.think = AsyncMock(return_value="feito")
+        mod = AgenticModule(brain, workspace=gw)
+        mod.run_step(_intention("agentic_task:x", instruction="arrumar a mesa"))
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        assert mod.run_step(None) is None  # nada pendente: foi pro inbox
+        winner = await gw.tick()
+        assert winner.source == "agentic_module"
+        assert winner.metadata["full_text"] == "Task result: feito"
+        mod._worker_task.cancel()
+
+    def test_unknown_or_malformed_verbs_are_ignored(self):
+        mod = _agentic()
+        assert mod.run_step(_intention("dance:now")) is None
+        assert mod.run_step(_intention("use_tool:calc")) is None  # missing instruction
+        assert mod.run_step(_intention("use_tool")) is None
+        assert not mod.is_busy
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  ShellState
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
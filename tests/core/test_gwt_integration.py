@@ -37,7 +37,7 @@ async def test_gwt_cycle_boredom_trigger():
         content="nothing_happening", source="perception", saliency=0.1, modality="vision"
     )
 
-    thought_1 = workspace.tick()
+    thought_1 = await workspace.tick()
 
     assert thought_1 is not None
     assert thought_1.source == "executive"
@@ -67,7 +67,7 @@ async def test_gwt_cycle_boredom_fallback():
         content="nothing_happening", source="perception", saliency=0.1, modality="vision"
     )
 
-    thought = workspace.tick()
+    thought = await workspace.tick()
     assert thought is not None
     assert "agentic_task:Pesquise sobre rust_lang" in thought.content
 
@@ -85,13 +85,38 @@ async def test_gwt_github_module_result_delivery():
     github_module._pending_result = "Learned amazing things about Rust"
     github_module.is_busy = False
 
-    thought = workspace.tick()
+    thought = await workspace.tick()
     assert thought is not None
     assert "Study Result" in thought.content
     assert thought.modality == "memory_recall"
     assert thought.saliency == 1.0
 
 
+async def test_github_module_tracks_inflight_study():
+    import asyncio
+
+    learner_skill = MagicMock(spec=GitHubLearner)
+    learner_skill.study_github_topic.return_value = "notes"
+    github_module = GitHubModule(learner_skill)
+    intention = BroadcastMessage(
+        content="study_github:rust",
+        source="executive",
+        saliency=1.0,
+        modality="intention",
+        metadata={"topic": "rust"},
+    )
+
+    assert github_module.run_step(intention) is not None
+    assert len(github_module._inflight) == 1
+    github_module.is_busy = False  # even if the flag is reset, the cap holds
+    assert github_module.run_step(intention) is None
+
+    await asyncio.gather(*github_module._inflight)
+    await asyncio.sleep(0)  # let done callbacks run
+    assert not github_module._inflight
+    assert github_module._pending_result == "notes"
+
+
 if __name__ == "__main__":
     msg = BroadcastMessage(content="test", source="me", saliency=0.5, modality="text")
     print(msg)
@@ -2,7 +2,19 @@
 
 from __future__ import annotations
 
-from enton.core.hardware import DiskInfo, GPUInfo, HardwareProfile
+import time
+from unittest.mock import MagicMock, patch
+
+from enton.core import hardware
+from enton.core.hardware import (
+    DiskInfo,
+    GPUInfo,
+    HardwareProfile,
+    detect_dynamic,
+    detect_hardware,
+    detect_hardware_async,
+    detect_static,
+)
 
 
 class TestGPUInfo:
@@ -119,8 +131,113 @@ class TestHardwareProfile:
         assert d["workspace_free_gb"] == 200.0
         assert "Linux" in d["os"]
 
+    def test_slots(self):
+        assert not hasattr(HardwareProfile(), "__dict__")
+
     def test_to_dict_empty(self):
         hw = HardwareProfile()
         d = hw.to_dict()
         assert d["gpu"] == []
         assert d["disks"] == []
+
+
+class TestDetection:
+    def test_static_fields_probed_once(self, tmp_path):
+        hardware._static_fields.cache_clear()
+        with patch.object(hardware, "_get_cpu_model", return_value="Test CPU") as cpu_model:
+            first = detect_hardware(str(tmp_path))
+            second = detect_hardware(str(tmp_path))
+        hardware._static_fields.cache_clear()
+
+        assert cpu_model.call_count == 1
+        assert first is not second  # profiles are never shared
+        assert first.cpu_model == second.cpu_model == "Test CPU"
+        assert first.cpu_cores_logical >= 1
+        assert first.workspace_path == str(tmp_path)
+        assert first.uptime_hours > 0
+
+    def test_dynamic_fills_given_profile(self):
+        hw = detect_static()
+        assert detect_dynamic(hw) is hw
+        assert hw.ram_total_gb > 0
+
+    def test_cuda_version_cached(self):
+        hardware._get_cuda_version.cache_clear()
+        run = MagicMock(
+            return_value=MagicMock(
+                returncode=0, stdout="Cuda compilation tools, release 12.4, V12.4.131"
+            )
+        )
+        with patch.object(hardware.subprocess, "run", run):
+            assert hardware._get_cuda_version() == "12.4"
+            assert hardware._get_cuda_version() == "12.4"
+        hardware._get_cuda_version.cache_clear()
+        assert run.call_count == 1
+
+    async def test_async_probes_run_concurrently(self):
+        def slow(value):
+            def probe():
+                time.sleep(0.1)
+                return value
+
+            return probe
+
+        gpu = GPUInfo(name="RTX 4090")
+        with (
+            patch.object(hardware, "_cpu_percent", slow(12.0)),
+            patch.object(hardware, "_detect_gpus", slow([gpu])),
+            patch.object(hardware, "_detect_disks", slow([])),
+            patch.object(hardware, "_detect_ips", slow({"eth0": "10.0.0.2"})),
+        ):
+            start = time.perf_counter()
+            hw = await detect_hardware_async()
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.3  # ~max(0.1), not the 0.4 sum
+        assert hw.cpu_percent == 12.0
+        assert hw.gpus == [gpu]
+        assert hw.ip_addresses == {"eth0": "10.0.0.2"}
+
+    def test_gpus_via_nvml(self):
+        from types import SimpleNamespace
+
+        class NVMLError(Exception):
+            pass
+
+        def no_power(handle):
+            raise NVMLError("not supported")
+
+        fake = SimpleNamespace(
+            NVMLError=NVMLError,
+            NVML_TEMPERATURE_GPU=0,
+            nvmlSystemGetDriverVersion=lambda: "550.54",
+            nvmlDeviceGetCount=lambda: 1,
+            nvmlDeviceGetHandleByIndex=lambda i: f"h{i}",
+            nvmlDeviceGetName=lambda h: b"NVIDIA GeForce RTX 4090",
+            nvmlDeviceGetMemoryInfo=lambda h: SimpleNamespace(
+                total=24564 << 20, used=1000 << 20, free=23564 << 20
+            ),
+            nvmlDeviceGetUtilizationRates=lambda h: SimpleNamespace(gpu=37),
+            nvmlDeviceGetCudaComputeCapability=lambda h: (8, 9),
+            nvmlDeviceGetTemperature=lambda h, sensor: 61,
+            nvmlDeviceGetPowerUsage=lambda h: 123_400,
+            nvmlDeviceGetPowerManagementLimit=no_power,
+        )
+        with (
+            patch.object(hardware, "pynvml", fake),
+            patch.object(hardware, "_nvml_ready", return_value=True),
+            patch.object(hardware, "_get_cuda_version", return_value="12.4"),
+            patch.object(hardware.subprocess, "run") as run,
+        ):
+            (gpu,) = hardware._detect_gpus()
+
+        run.assert_not_called()  # no nvidia-smi fork
+        assert gpu.name == "NVIDIA GeForce RTX 4090"
+        assert gpu.vram_total_mb == 24564
+        assert gpu.utilization_pct == 37
+        assert gpu.temperature_c == 61
+        assert gpu.power_draw_w == 123.4
+        assert gpu.power_limit_w == 0  # unsupported metric -> default
+        assert gpu.compute_capability == "8.9"
+        assert gpu.driver_version == "550.54"
+        assert gpu.cuda_version == "12.4"
@@ -0,0 +1,158 @@
+"""Tests for QueryCache."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+
+from enton.core.query_cache import EmbeddingCache, QueryCache
+
+
+def _vec(*xs: float) -> np.ndarray:
+    return QueryCache.normalize(list(xs))
+
+
+def test_exact_hit_before_embed():
+    cache = QueryCache(dim=3)
+    cache.put("gato", _vec(1, 0, 0), ["a"])
+    assert cache.get_exact("gato") == ["a"]
+    assert cache.get_exact("cachorro") is None
+
+
+def test_semantic_hit_above_threshold():
+    cache = QueryCache(dim=3, threshold=0.95)
+    cache.put("gato", _vec(1, 0, 0), ["a"])
+    assert cache.lookup(_vec(1, 0.1, 0)) == ["a"]
+    assert cache.lookup(_vec(0, 1, 0)) is None
+
+
+def test_scope_isolated():
+    cache = QueryCache(dim=3)
+    cache.put("gato", _vec(1, 0, 0), ["a"], scope="images:10")
+    assert cache.get_exact("gato", scope="audio:10") is None
+    assert cache.lookup(_vec(1, 0, 0), scope="audio:10") is None
+
+
+def test_ttl_expires():
+    cache = QueryCache(dim=3, ttl=0.0)
+    cache.put("gato", _vec(1, 0, 0), ["a"])
+    cache._stamps[0] -= 1.0
+    assert cache.get_exact("gato") is None
+    assert cache.lookup(_vec(1, 0, 0)) is None
+
+
+def test_ring_evicts_oldest():
+    cache = QueryCache(dim=3, capacity=2)
+    cache.put("a", _vec(1, 0, 0), [1])
+    cache.put("b", _vec(0, 1, 0), [2])
+    cache.put("c", _vec(0, 0, 1), [3])
+    assert len(cache) == 2
+    assert cache.get_exact("a") is None
+    assert cache.lookup(_vec(1, 0, 0)) is None
+    assert cache.get_exact("c") == [3]
+
+
+def test_clear():
+    cache = QueryCache(dim=3)
+    cache.put("gato", _vec(1, 0, 0), ["a"])
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.lookup(_vec(1, 0, 0)) is None
+
+
+def test_embedding_cache_hits_same_text():
+    cache = EmbeddingCache()
+    embedder = MagicMock(id="nomic-embed-text")
+    embedder.get_embedding.return_value = [0.1, 0.2]
+    assert cache.embed(embedder, "images cam0") == [0.1, 0.2]
+    assert cache.embed(embedder, "images cam0") == [0.1, 0.2]
+    assert embedder.get_embedding.call_count == 1
+    assert cache.lookup(embedder, "audio") is None
+
+
+def test_embedding_cache_lru_bound():
+    cache = EmbeddingCache(maxsize=2)
+    embedder = MagicMock(id="nomic-embed-text")
+    embedder.get_embedding.side_effect = lambda t: [float(len(t))]
+    cache.embed(embedder, "a")
+    cache.embed(embedder, "bb")
+    cache.lookup(embedder, "a")  # a vira o mais recente
+    cache.embed(embedder, "ccc")
+    assert len(cache) == 2
+    assert cache.lookup(embedder, "bb") is None
+    assert cache.lookup(embedder, "a") == [1.0]
+
+
+def test_embedding_cache_skips_empty():
+    cache = EmbeddingCache()
+    embedder = MagicMock(id="nomic-embed-text")
+    embedder.get_embedding.return_value = []
+    assert cache.embed(embedder, "x") == []
+    assert len(cache) == 0
+
+
+async def test_embedding_cache_aembed_prefers_async_client():
+    cache = EmbeddingCache()
+    embedder = MagicMock(id="nomic-embed-text")
+    embedder.async_get_embedding = AsyncMock(return_value=[0.5])
+    assert await cache.aembed(embedder, "cam0") == [0.5]
+    assert await cache.aembed(embedder, "cam0") == [0.5]
+    embedder.async_get_embedding.assert_awaited_once_with("cam0")
+    embedder.get_embedding.assert_not_called()
+
+
+def test_quantized_similarity_close_to_float():
+    rng = np.random.default_rng(0)
+    cache = QueryCache(dim=768, threshold=0.95)
+    base = QueryCache.normalize(rng.standard_normal(768).tolist())
+    cache.put("q", base, ["hit"])
+    assert cache._vecs.dtype == np.int8
+    sim = float(cache._vecs[0] @ base * cache._scales[0])
+    assert abs(sim - 1.0) < 0.01
+    noisy = QueryCache.normalize((base + 0.005 * rng.standard_normal(768)).tolist())
+    assert cache.lookup(noisy) == ["hit"]
+
+
+def test_nomic_embedder_is_shared():
+    from enton.core._embedders import nomic_embedder
+
+    assert nomic_embedder() is nomic_embedder()
+
+
+def test_embed_many_single_round_trip():
+    from agno.knowledge.embedder.ollama import OllamaEmbedder
+
+    from enton.core._embedders import embed_many
+
+    client = MagicMock()
+    client.embed.return_value = {"embeddings": [[1.0, 2.0, 3.0], [4.0, 5.0]]}
+    embedder = OllamaEmbedder(id="nomic-embed-text", dimensions=3, ollama_client=client)
+
+    vectors = embed_many(embedder, ["a b c", "d e f"])
+    assert vectors == [[1.0, 2.0, 3.0], []]  # wrong dimension -> [] like get_embedding
+    client.embed.assert_called_once_with(
+        input=["a b c", "d e f"], model="nomic-embed-text", dimensions=3
+    )
+
+
+def test_embed_many_falls_back_per_text():
+    from enton.core._embedders import embed_many
+
+    embedder = MagicMock()
+    embedder.get_embedding.side_effect = [[0.1], None]
+    assert embed_many(embedder, ["x", "y"]) == [[0.1], []]
+    assert embed_many(embedder, []) == []
+
+
+async def test_aembed_many_uses_async_client():
+    from agno.knowledge.embedder.ollama import OllamaEmbedder
+
+    from enton.core._embedders import aembed_many
+
+    aclient = MagicMock()
+    aclient.embed = AsyncMock(return_value={"embeddings": [[1.0, 2.0], [3.0, 4.0]]})
+    embedder = OllamaEmbedder(id="nomic-embed-text", dimensions=2, async_client=aclient)
+
+    assert await aembed_many(embedder, ["a", "b"]) == [[1.0, 2.0], [3.0, 4.0]]
+    aclient.embed.assert_awaited_once()
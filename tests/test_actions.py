@@ -41,10 +41,12 @@ def test_action_event_fields():
     assert e.camera_id == "cam2"
 
 
-def test_action_event_is_frozen():
+def test_action_event_is_slotted():
+    # frozen so para o type checker; em runtime os slots barram atributos novos
     e = ActionEvent(action="lendo")
     with pytest.raises(AttributeError):
-        e.action = "escrevendo"
+        e.mood = "escrevendo"  # type: ignore[attr-defined]
+    assert e == ActionEvent(action="lendo", timestamp=e.timestamp)
 
 
 # ---------------------------------------------------------------------------
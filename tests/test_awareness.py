@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from unittest.mock import MagicMock
 
 from enton.core.awareness import LEVEL_CONFIGS, AwarenessLevel, AwarenessStateMachine
@@ -61,7 +62,7 @@ def test_evaluate_sentinel_to_attentive():
 def test_evaluate_sentinel_to_creative():
     asm = AwarenessStateMachine()
     asm._last_transition = 0
-    asm._state_enter_time = 0  # been in SENTINEL for ages
+    asm._state_enter_time = time.monotonic_ns() - 3600 * 10**9  # been in SENTINEL for ages
     sm = _make_sm(social=0.0, engagement=0.0)
     asm.evaluate(sm)
     assert asm.state == AwarenessLevel.CREATIVE
@@ -80,7 +81,7 @@ def test_evaluate_focused_to_attentive():
     asm = AwarenessStateMachine()
     asm._state = AwarenessLevel.FOCUSED
     asm._last_transition = 0
-    asm._state_enter_time = 0  # been focused for ages
+    asm._state_enter_time = time.monotonic_ns() - 3600 * 10**9  # been focused for ages
     sm = _make_sm(engagement=0.1)
     asm.evaluate(sm)
     assert asm.state == AwarenessLevel.ATTENTIVE
@@ -133,3 +134,53 @@ def test_summary():
     s = asm.summary()
     assert "SENTINEL" in s
     assert "fps" in s
+
+
+def test_eval_rules_cover_all_levels():
+    from enton.core.awareness import _EVAL_RULES
+
+    assert set(_EVAL_RULES) == set(AwarenessLevel)
+
+
+def test_evaluate_alert_timeout():
+    asm = AwarenessStateMachine()
+    asm._state = AwarenessLevel.ALERT
+    asm._last_transition = 0
+    asm._state_enter_time = time.monotonic_ns() - 120 * 10**9
+    asm.evaluate(_make_sm())
+    assert asm.state == AwarenessLevel.ATTENTIVE
+
+
+def test_config_follows_transition():
+    asm = AwarenessStateMachine()
+    assert asm.config is LEVEL_CONFIGS[AwarenessLevel.SENTINEL]
+    asm._last_transition = 0
+    asm.transition(AwarenessLevel.FOCUSED, "test")
+    assert asm.config is LEVEL_CONFIGS[AwarenessLevel.FOCUSED]
+    asm.from_dict({"state": "DORMANT"})
+    assert asm.config is LEVEL_CONFIGS[AwarenessLevel.DORMANT]
+
+
+def test_transition_emits_system_event():
+    bus = MagicMock()
+    asm = AwarenessStateMachine()
+    asm._last_transition = 0
+    asm.transition(AwarenessLevel.ATTENTIVE, "person detected", bus)
+    event = bus.emit_nowait.call_args[0][0]
+    assert event.kind == "awareness_change"
+    assert event.detail == "SENTINEL->ATTENTIVE: person detected"
+
+
+def test_alert_bypasses_debounce():
+    asm = AwarenessStateMachine()
+    asm._last_transition = 0
+    asm.transition(AwarenessLevel.ATTENTIVE, "first")
+    # logo em seguida: debounce bloquearia, mas alerta passa
+    asm.trigger_alert("loud sound")
+    assert asm.state == AwarenessLevel.ALERT
+
+
+def test_force_bypasses_debounce():
+    asm = AwarenessStateMachine()
+    assert asm.transition(AwarenessLevel.FOCUSED, "too fast") is False
+    assert asm.transition(AwarenessLevel.FOCUSED, "forced", force=True) is True
@@ -104,3 +104,22 @@ async def test_what_is():
     facts = await kb.what_is("dog")
     assert len(facts) == 1
     assert "dog is a mammal" in facts[0]
+
+
+@pytest.mark.asyncio()
+async def test_search_repeated_query_hits_cache():
+    kb = CommonsenseKB()
+    mock_result = MagicMock()
+    mock_result.payload = {"subject": "cat", "predicate": "has", "obj": "whiskers"}
+    mock_result.score = 0.9
+    kb._qdrant = MagicMock()
+    kb._qdrant.query_points.return_value.points = [mock_result]
+    kb._available = True
+    kb._embedder = MagicMock()
+    kb._embedder.get_embedding.return_value = [0.1] * 768
+
+    first = await kb.search("cat anatomy")
+    second = await kb.search("cat anatomy")
+    assert first == second
+    assert kb._embedder.get_embedding.call_count == 1
+    assert kb._qdrant.query_points.call_count == 1
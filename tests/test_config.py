@@ -38,3 +38,17 @@ def test_config_env_override():
         settings = Settings()
         assert settings.camera_ip == "10.0.0.1"
         assert settings.blob_store_root == "/tmp/enton_test_blobs"
+
+
+def test_camera_sources_parsed_once():
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings(_env_file=None, cameras=" main:0, door:rtsp://10.0.0.2:554/s ,bad")
+        sources = settings.camera_sources
+        assert sources == {"main": 0, "door": "rtsp://10.0.0.2:554/s"}
+        assert settings.camera_sources is sources
+
+
+def test_camera_sources_fallback_to_single_camera():
+    with patch.dict(os.environ, {}, clear=True):
+        settings = Settings(_env_file=None)
+        assert settings.camera_sources == {"main": 0}
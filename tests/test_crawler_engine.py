@@ -0,0 +1,73 @@
+"""Tests for Crawl4AIEngine."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from enton.core.crawler_engine import Crawl4AIEngine
+
+
+def _result(url: str, success: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(
+        url=url,
+        success=success,
+        error_message="" if success else "boom",
+        metadata={"title": url},
+        markdown=f"# {url}",
+        links={"https://x": {}},
+    )
+
+
+class _FakeCrawler:
+    def __init__(self, delays: dict[str, float]) -> None:
+        self.delays = delays
+        self.active = 0
+        self.peak = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def arun(self, url: str, config=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(url, 0))
+            if url == "raise":
+                raise RuntimeError("timeout")
+        finally:
+            self.active -= 1
+        return _result(url, success=url != "bad")
+
+
+async def test_crawl_many_completion_order_and_bound():
+    fake = _FakeCrawler({"slow": 0.05, "a": 0.0, "b": 0.01, "bad": 0.0})
+    engine = Crawl4AIEngine()
+    with patch("enton.core.crawler_engine.AsyncWebCrawler", return_value=fake):
+        out = await engine.crawl_many(["slow", "a", "b", "bad"], max_concurrent=2)
+
+    assert len(out) == 4
+    assert out[-1]["url"] == "slow"  # chega por ultimo, nao bloqueia os outros
+    assert fake.peak <= 2
+    bad = next(r for r in out if r["url"] == "bad")
+    assert bad["error"] == "boom"
+    ok = next(r for r in out if r["url"] == "a")
+    assert ok["title"] == "a"
+    assert ok["links"] == ["https://x"]
+
+
+async def test_crawl_many_exception_keeps_other_pages():
+    fake = _FakeCrawler({"a": 0.0, "raise": 0.01, "b": 0.02})
+    engine = Crawl4AIEngine()
+    with patch("enton.core.crawler_engine.AsyncWebCrawler", return_value=fake):
+        out = await engine.crawl_many(["a", "raise", "b"])
+
+    by_url = {r["url"]: r for r in out}
+    assert set(by_url) == {"a", "raise", "b"}
+    assert by_url["raise"]["error"] == "timeout"
+    assert by_url["a"]["title"] == "a"
+    assert by_url["b"]["title"] == "b"
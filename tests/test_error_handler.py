@@ -71,6 +71,24 @@ class TestErrorLoopBack:
         assert error is None
         assert handler.stats()["resolved"] == 1
 
+    def test_retry_rewrites_prompt_keeps_other_args(self, handler):
+        seen: list[tuple] = []
+
+        async def flaky_fn(prompt, system, *, temp):
+            seen.append((prompt, system, temp))
+            if len(seen) == 1:
+                raise ValueError("bad json")
+            return "ok"
+
+        result, _ = asyncio.get_event_loop().run_until_complete(
+            handler.execute(flaky_fn, "hello", "sys", temp=0.2)
+        )
+        assert result == "ok"
+        assert seen[0] == ("hello", "sys", 0.2)
+        assert seen[1][0] != "hello"
+        assert "hello" in seen[1][0]
+        assert seen[1][1:] == ("sys", 0.2)
+
     def test_injects_context(self, handler, ctx):
         async def fail_fn(prompt):
             raise ValueError("bad input")
@@ -81,6 +99,37 @@ class TestErrorLoopBack:
         assert error_ctx is not None
         assert "ValueError" in error_ctx
 
+    def test_traceback_formatted_lazily(self, handler):
+        try:
+            raise ValueError("boom")
+        except ValueError as exc:
+            rec = handler._capture_error(exc, "p", "prompt", 1)
+        assert rec._tb is None
+        assert "ValueError: boom" in rec.traceback_snippet
+        assert rec._tbe is None
+        assert ErrorRecord(error_type="X", message="m").traceback_snippet == ""
+
+    def test_record_does_not_pin_frames(self, handler):
+        import gc
+        import weakref
+
+        class Big:
+            pass
+
+        def fail():
+            big = Big()
+            ref = weakref.ref(big)
+            raise ValueError(ref)
+
+        try:
+            fail()
+        except ValueError as exc:
+            ref = exc.args[0]
+            rec = handler._capture_error(exc, "p", "prompt", 1)
+        gc.collect()
+        assert ref() is None  # locals do frame ja foram soltos
+        assert "in fail" in rec.traceback_snippet
+
     def test_error_hints_rate_limit(self, handler):
         rec = ErrorRecord(
             error_type="HTTPError",
@@ -99,6 +148,40 @@ class TestErrorLoopBack:
         hints = handler._error_hints(rec)
         assert "Timeout" in hints
 
+    def test_error_hints_single_pass_tags(self, handler):
+        rec = ErrorRecord(
+            error_type="RuntimeError",
+            message="Tool 'x' not found; connection refused; ratelimit",
+            provider="nvidia",
+        )
+        hints = handler._error_hints(rec)
+        assert "Ferramenta" in hints
+        assert "indisponivel" in hints
+        assert "Rate limit" in hints
+        assert "parsing" not in hints
+
+    def test_similar_errors_indexed_and_expire(self, handler):
+        for _ in range(3):
+            handler._record(ErrorRecord(error_type="TimeoutError", message="t", provider="p"))
+        handler._record(ErrorRecord(error_type="TimeoutError", message="t", provider="q"))
+        probe = ErrorRecord(error_type="TimeoutError", message="t", provider="p")
+        assert handler._find_similar_errors(probe) == 3
+        assert "ALERTA" in handler._error_hints(probe)
+
+        old = ErrorRecord(error_type="KeyError", message="k", provider="p")
+        old.timestamp -= 600
+        handler._record(old)
+        assert handler._find_similar_errors(old) == 0
+
+    def test_error_hints_cached_per_flag_set(self, handler):
+        rec = ErrorRecord(error_type="HTTPError", message="429 rate limited", provider="a")
+        first = handler._error_hints(rec)
+        again = handler._error_hints(
+            ErrorRecord(error_type="HTTPError", message="Rate LIMIT", provider="b")
+        )
+        assert again is first
+        assert handler._error_hints(ErrorRecord(error_type="E", message="nothing")) == ""
+
     def test_is_degraded(self, handler):
         assert not handler.is_degraded
         handler._consecutive_failures = 5
@@ -111,3 +194,16 @@ class TestErrorLoopBack:
         assert "error_rate" in s
         assert "is_degraded" in s
         assert "by_type" in s
+
+    def test_stats_counts_by_type_and_resolved(self, handler):
+        handler._history.extend(
+            [
+                ErrorRecord(error_type="ValueError", message="a", resolved=True),
+                ErrorRecord(error_type="ValueError", message="b"),
+                ErrorRecord(error_type="KeyError", message="c"),
+            ]
+        )
+        s = handler.stats()
+        assert s["by_type"] == {"ValueError": 2, "KeyError": 1}
+        assert s["resolved"] == 1
+        assert s["total_errors"] == 3
@@ -24,7 +24,7 @@ async def test_event_bus_emit_and_handle():
     await bus.emit(DetectionEvent(label="person", confidence=0.95))
 
     # Process one event
-    event = await asyncio.wait_for(bus._queue.get(), timeout=1.0)
+    event = bus._queue.popleft()
     handlers = bus._handlers.get(type(event), [])
     for h in handlers:
         await h(event)
@@ -48,7 +48,7 @@ async def test_event_bus_multiple_handlers():
     bus.on(SystemEvent, handler_b)
     await bus.emit(SystemEvent(kind="startup"))
 
-    event = await asyncio.wait_for(bus._queue.get(), timeout=1.0)
+    event = bus._queue.popleft()
     for h in bus._handlers.get(type(event), []):
         await h(event)
 
@@ -73,7 +73,7 @@ async def test_event_bus_type_isolation():
     bus.on(SoundEvent, on_sound)
 
     await bus.emit(DetectionEvent(label="cat"))
-    event = await asyncio.wait_for(bus._queue.get(), timeout=1.0)
+    event = bus._queue.popleft()
     for h in bus._handlers.get(type(event), []):
         await h(event)
 
@@ -86,7 +86,8 @@ def test_event_defaults():
     assert e.text == "hello"
     assert e.is_final is True
     assert e.language == "pt-BR"
-    assert e.timestamp > 0
+    assert isinstance(e.timestamp, int)
+    assert e.timestamp_s == e.timestamp / 1e9
 
 
 def test_detection_event_fields():
@@ -98,4 +99,90 @@ def test_detection_event_fields():
 def test_emit_nowait():
     bus = EventBus()
     bus.emit_nowait(SystemEvent(kind="test"))
-    assert bus._queue.qsize() == 1
+    assert len(bus._queue) == 1
+    assert bus._not_empty.is_set()
+
+
+async def test_run_dispatches_to_handlers_registered_later():
+    bus = EventBus()
+    seen: list[str] = []
+
+    async def on_system(event):
+        seen.append(event.kind)
+
+    async def boom(event):
+        raise RuntimeError("handler bug")
+
+    task = asyncio.create_task(bus.run())
+    bus.emit_nowait(SoundEvent(label="no handlers"))
+    await asyncio.sleep(0)
+    bus.on(SystemEvent, boom)
+    bus.on(SystemEvent, on_system)
+    bus.emit_nowait(SystemEvent(kind="startup"))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    task.cancel()
+
+    assert bus._handlers[SystemEvent] == (boom, on_system)
+    assert seen == ["startup"]
+
+
+async def test_run_drains_burst_in_order_with_batch_cap():
+    bus = EventBus()
+    order: list[str] = []
+
+    async def record(event):
+        order.append(getattr(event, "label", "") or event.kind)
+
+    bus.on(SoundEvent, record)
+    bus.on(SystemEvent, record)
+    for i in range(5):
+        bus.emit_nowait(SoundEvent(label=f"s{i}"))
+        bus.emit_nowait(SystemEvent(kind=f"k{i}"))
+
+    task = asyncio.create_task(bus.run(max_batch_size=3))
+    for _ in range(10):
+        await asyncio.sleep(0)
+    task.cancel()
+
+    # arrival order across types is preserved
+    assert order == [x for i in range(5) for x in (f"s{i}", f"k{i}")]
+    assert not bus._queue
+
+
+async def test_run_wakes_on_emit_after_idle():
+    bus = EventBus()
+    seen: list[str] = []
+
+    async def on_system(event):
+        seen.append(event.kind)
+
+    bus.on(SystemEvent, on_system)
+    task = asyncio.create_task(bus.run())
+    await asyncio.sleep(0)
+    assert not bus._not_empty.is_set()  # idle: parked on the signal
+    for kind in ("a", "b"):
+        bus.emit_nowait(SystemEvent(kind=kind))
+        for _ in range(3):
+            await asyncio.sleep(0)
+    task.cancel()
+
+    assert seen == ["a", "b"]
+
+
+async def test_run_handlers_continues_after_failures():
+    calls: list[str] = []
+
+    def ok(name):
+        async def handler(event):
+            calls.append(name)
+
+        return handler
+
+    async def boom(event):
+        calls.append("boom")
+        raise RuntimeError("handler bug")
+
+    a, b = ok("a"), ok("b")
+    await EventBus._run_handlers((boom, a, boom, boom, b), SystemEvent(kind="x"))
+    assert calls == ["boom", "a", "boom", "boom", "b"]
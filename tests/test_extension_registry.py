@@ -2,16 +2,20 @@
 
 from __future__ import annotations
 
-from unittest.mock import MagicMock
+from importlib.metadata import EntryPoint, EntryPoints
+from unittest.mock import MagicMock, patch
 
 import pytest
 from agno.tools import Toolkit
 
 from enton.core.extension_registry import (
+    ENTRYPOINT_GROUP,
     ExtensionMeta,
     ExtensionRegistry,
     ExtensionSource,
     ExtensionState,
+    _cached_entry_points,
+    refresh_entry_points,
 )
 
 
@@ -57,6 +61,13 @@ class TestExtensionRegistry:
         assert meta.source == ExtensionSource.BUILTIN
         assert meta.state == ExtensionState.ENABLED
 
+    def test_register_builtin_tool_count_without_functions(self, registry):
+        registry.register_builtin("bare", MagicMock(spec=[]))
+        assert registry.get("bare").tool_count == 0
+        tk = MagicMock(functions=None)
+        registry.register_builtin("none", tk)
+        assert registry.get("none").tool_count == 0
+
     def test_list_extensions(self, registry):
         tk1 = Toolkit(name="a")
         tk2 = Toolkit(name="b")
@@ -107,6 +118,38 @@ class TestExtensionRegistry:
         assert "my_ext" in found
         assert registry.get("my_ext") is not None
 
+    def test_discover_manifests_skips_unchanged_files(self, registry, tmp_path):
+        import json
+        import os
+
+        ext_dir = tmp_path / "exts" / "late"
+        ext_dir.mkdir(parents=True)
+        manifest = ext_dir / "manifest.json"
+        manifest.write_text("{broken")
+        (tmp_path / "exts" / ".hidden").mkdir()
+        (tmp_path / "exts" / "no_manifest").mkdir()
+
+        assert registry.discover_manifests() == []
+        with patch("enton.core.extension_registry._loads") as loads:
+            assert registry.discover_manifests() == []
+            loads.assert_not_called()
+
+        manifest.write_text(json.dumps({"name": "late"}))
+        st = manifest.stat()
+        os.utime(manifest, (st.st_atime, st.st_mtime + 5))
+        assert registry.discover_manifests() == ["late"]
+
+    def test_discover_manifests_utf8(self, registry, tmp_path):
+        import json
+
+        ext_dir = tmp_path / "exts" / "acentos"
+        ext_dir.mkdir(parents=True)
+        (ext_dir / "manifest.json").write_bytes(
+            json.dumps({"name": "acentos", "description": "ação"}, ensure_ascii=False).encode()
+        )
+        assert registry.discover_manifests() == ["acentos"]
+        assert registry.get("acentos").description == "ação"
+
     def test_load_from_manifest(self, registry, tmp_path):
         ext_dir = tmp_path / "exts" / "loadable"
         ext_dir.mkdir(parents=True)
@@ -133,6 +176,41 @@ class TestExtensionRegistry:
         meta = registry.get("loadable")
         assert meta.state == ExtensionState.LOADED
 
+    def test_load_from_file_reuses_module_until_modified(self, registry, tmp_path):
+        import os
+
+        path = tmp_path / "tk.py"
+        path.write_text(
+            "from agno.tools import Toolkit\n"
+            "class CachedTools(Toolkit):\n"
+            "    def __init__(self):\n"
+            "        super().__init__(name='cached')\n"
+        )
+        first = registry._load_from_file(path)
+        with patch("enton.core.extension_registry.compile", create=True) as comp:
+            second = registry._load_from_file(path)
+            comp.assert_not_called()
+        assert type(second) is type(first)
+        assert second is not first  # fresh toolkit per load
+
+        path.write_text(path.read_text().replace("'cached'", "'edited'"))
+        st = path.stat()
+        os.utime(path, (st.st_atime, st.st_mtime + 5))
+        assert registry._load_from_file(path).name == "edited"
+
+    def test_load_from_file_prefers_class_defined_in_module(self, registry, tmp_path):
+        path = tmp_path / "mixed.py"
+        path.write_text(
+            "from agno.tools import Toolkit\n"
+            "class AImported(Toolkit):\n"
+            "    pass\n"
+            "AImported.__module__ = 'elsewhere'\n"
+            "class ZOwn(Toolkit):\n"
+            "    def __init__(self):\n"
+            "        super().__init__(name='own')\n"
+        )
+        assert registry._load_from_file(path).name == "own"
+
     def test_enable_disable(self, registry, brain, tmp_path):
         ext_dir = tmp_path / "exts" / "toggleable"
         ext_dir.mkdir(parents=True)
@@ -176,3 +254,145 @@ class TestExtensionRegistry:
         meta = registry.get("a")
         assert meta.calls == 1
         assert meta.errors == 1
+
+
+class TestEntryPointDiscovery:
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        refresh_entry_points()
+        yield
+        refresh_entry_points()
+
+    def test_discovers_and_scans_metadata_once(self, registry):
+        eps = EntryPoints(
+            [
+                EntryPoint("foo", "foo_pkg.toolkit:create_toolkit", ENTRYPOINT_GROUP),
+                EntryPoint("other", "x:y", "console_scripts"),
+            ]
+        )
+        with patch("importlib.metadata.entry_points", return_value=eps) as scan:
+            assert registry.discover_entrypoints() == ["foo"]
+            assert registry.discover_entrypoints() == []
+            assert scan.call_count == 1
+
+            refresh_entry_points()
+            registry.discover_entrypoints()
+            assert scan.call_count == 2
+
+        meta = registry.get("foo")
+        assert meta.source == ExtensionSource.ENTRYPOINT
+        assert isinstance(meta.module_path, str)
+        assert meta.module_path == "foo_pkg.toolkit:create_toolkit"
+
+    def test_cached_pairs_are_plain_strings(self):
+        eps = EntryPoints([EntryPoint("foo", "pkg:make", ENTRYPOINT_GROUP)])
+        with patch("importlib.metadata.entry_points", return_value=eps):
+            assert _cached_entry_points(ENTRYPOINT_GROUP) == (("foo", "pkg:make"),)
+            assert _cached_entry_points("missing.group") == ()
+
+
+class TestIncrementalStats:
+    @staticmethod
+    def _recount(registry) -> dict:
+        from collections import Counter
+
+        exts = registry.list_extensions()
+        return {
+            "total_extensions": len(exts),
+            "total_tools": sum(e.tool_count for e in exts if e.state == ExtensionState.ENABLED),
+            "by_state": dict(Counter(e.state for e in exts)),
+            "by_source": dict(Counter(e.source for e in exts)),
+        }
+
+    def test_counters_match_full_recount(self, registry, tmp_path):
+        import json
+
+        ext_dir = tmp_path / "exts" / "cycled"
+        ext_dir.mkdir(parents=True)
+        (ext_dir / "manifest.json").write_text(json.dumps({"name": "cycled"}))
+        (ext_dir / "toolkit.py").write_text(
+            "from agno.tools import Toolkit\n"
+            "def _ping() -> str:\n"
+            "    return 'pong'\n"
+            "class Cycled(Toolkit):\n"
+            "    def __init__(self):\n"
+            "        super().__init__(name='cycled', tools=[_ping])\n"
+        )
+        bad_dir = tmp_path / "exts" / "broken"
+        bad_dir.mkdir()
+        (bad_dir / "manifest.json").write_text(json.dumps({"name": "broken"}))
+
+        registry.register_builtin("core", MagicMock(functions={"a": 1, "b": 2}))
+        registry.discover_manifests()
+        steps = [
+            lambda: registry.enable("cycled"),
+            lambda: registry.load("broken"),
+            lambda: registry.disable("cycled"),
+            lambda: registry.enable("cycled"),
+            lambda: registry.register_builtin("core", MagicMock(functions={"a": 1})),
+        ]
+        for step in steps:
+            step()
+            assert registry.stats() == self._recount(registry)
+        assert registry.stats()["by_state"]["error"] == 1
+
+
+class TestInstallFromGit:
+    @staticmethod
+    def _fake_clone(calls: list):
+        import asyncio
+        import json
+        from pathlib import Path
+
+        async def fake_exec(*args, **kwargs):
+            calls.append(args)
+            await asyncio.sleep(0)  # let concurrent callers pile up on the lock
+            target = Path(args[-1])
+            target.mkdir(parents=True)
+            (target / "manifest.json").write_text(json.dumps({"name": target.name}))
+            proc = MagicMock(returncode=0)
+
+            async def communicate():
+                return b"", b""
+
+            proc.communicate = communicate
+            return proc
+
+        return fake_exec
+
+    async def test_concurrent_installs_clone_once(self, registry):
+        import asyncio
+
+        calls: list = []
+        url = "https://github.com/user/enton-ext-weather"
+        with (
+            patch("asyncio.create_subprocess_exec", self._fake_clone(calls)),
+            patch.object(ExtensionRegistry, "enable", return_value=True) as enable,
+        ):
+            results = await asyncio.gather(*(registry.install_from_git(url) for _ in range(3)))
+
+        assert len(calls) == 1
+        assert "--single-branch" in calls[0]
+        assert enable.call_count == 1
+        assert results[0] is True
+        assert registry.get("weather") is not None
+
+    async def test_failed_clone_is_not_remembered(self, registry):
+        calls: list = []
+        url = "https://github.com/user/enton-ext-broken"
+
+        async def failing_exec(*args, **kwargs):
+            calls.append(args)
+            proc = MagicMock(returncode=128)
+
+            async def communicate():
+                return b"", b"fatal: repository not found"
+
+            proc.communicate = communicate
+            return proc
+
+        with patch("asyncio.create_subprocess_exec", failing_exec):
+            assert await registry.install_from_git(url) is False
+            assert await registry.install_from_git(url) is False
+        assert len(calls) == 2
+        assert url not in registry._recent_clones
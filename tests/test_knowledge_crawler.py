@@ -6,7 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from enton.core.knowledge_crawler import KnowledgeCrawler, KnowledgeTriple
+from enton.core.knowledge_crawler import _MAX_EXTRACTIONS, KnowledgeCrawler, KnowledgeTriple
 
 
 def test_knowledge_triple_creation():
@@ -96,6 +96,25 @@ async def test_extract_triples_markdown_fences():
     assert triples[0].subject == "A"
 
 
+@pytest.mark.asyncio()
+async def test_extract_triples_skips_malformed_items():
+    brain = MagicMock()
+    brain.think = AsyncMock(return_value='```\n[42, {"subject":"A","predicate":"B","obj":"C"}]```')
+    kc = KnowledgeCrawler(brain=brain)
+
+    # non-dict item -> TypeError -> whole response rejected, no exception escapes
+    assert await kc.extract_triples("text") == []
+
+
+@pytest.mark.asyncio()
+async def test_extract_triples_llm_error():
+    brain = MagicMock()
+    brain.think = AsyncMock(side_effect=RuntimeError("provider down"))
+    kc = KnowledgeCrawler(brain=brain)
+
+    assert await kc.extract_triples("text") == []
+
+
 @pytest.mark.asyncio()
 async def test_extract_triples_no_brain():
     kc = KnowledgeCrawler(brain=None)
@@ -149,7 +168,7 @@ async def test_search_with_results():
     mock_result.score = 0.85
     mock_response = MagicMock()
     mock_response.points = [mock_result]
-    mock_client.query_points.return_value = mock_response
+    mock_client.query_points = AsyncMock(return_value=mock_response)
     kc._qdrant = mock_client
 
     mock_embedder = MagicMock()
@@ -159,3 +178,107 @@ async def test_search_with_results():
     results = await kc.search("Python speed")
     assert len(results) == 1
     assert results[0]["subject"] == "Python"
+
+
+@pytest.mark.asyncio()
+async def test_store_triples_embeds_in_one_batch():
+    kc = KnowledgeCrawler()
+    kc._qdrant = AsyncMock()
+    kc._embedder = MagicMock()
+    triples = [KnowledgeTriple(subject=f"s{i}", predicate="is", obj="o") for i in range(3)]
+
+    with patch(
+        "enton.core.knowledge_crawler.aembed_many",
+        new_callable=AsyncMock,
+        return_value=[[0.1] * 768, [], [0.2] * 768],
+    ) as embed:
+        await kc._store_triples(triples)
+
+    embed.assert_awaited_once_with(kc._embedder, ["s0 is o", "s1 is o", "s2 is o"])
+    kwargs = kc._qdrant.upsert.call_args.kwargs
+    assert kwargs["wait"] is False
+    batch = kwargs["points"]
+    assert batch.ids == [1, 2]
+    assert [p["subject"] for p in batch.payloads] == ["s0", "s2"]
+    assert batch.vectors == [[0.1] * 768, [0.2] * 768]
+
+
+@pytest.mark.asyncio()
+async def test_learn_topic_extracts_pages_concurrently():
+    import asyncio
+
+    kc = KnowledgeCrawler()
+    in_flight = 0
+    peak = 0
+
+    async def fake_extract(text, source_url=""):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if source_url.endswith("boom"):
+            raise RuntimeError("llm down")
+        return [KnowledgeTriple(subject=source_url, predicate="is", obj="page")]
+
+    pages = [{"url": f"https://x/{i}", "markdown": "text"} for i in range(3)]
+    pages += [{"url": "https://x/boom", "markdown": "t"}, {"url": "https://x/e", "error": "404"}]
+    kc._engine = MagicMock()
+    kc._engine.crawl_many = AsyncMock(return_value=pages)
+
+    with (
+        patch.object(kc, "_search_web", AsyncMock(return_value=[p["url"] for p in pages])),
+        patch.object(kc, "extract_triples", side_effect=fake_extract),
+        patch.object(kc, "_store_triples", new_callable=AsyncMock) as store,
+    ):
+        triples = await kc.learn_topic("python", max_pages=5)
+
+    assert [t.subject for t in triples] == [f"https://x/{i}" for i in range(3)]
+    assert peak == _MAX_EXTRACTIONS  # overlapped, but capped below the 4 pages
+    assert store.await_count == 3
+
+
+def test_parse_results_keeps_only_result_links():
+    from enton.core.knowledge_crawler import _parse_results
+
+    html = (
+        "<html><body>"
+        '<div class="result"><a class="result__a" href="https://a.dev/x">A</a></div>'
+        '<a class="other" href="https://ads.example">ad</a>'
+        '<div class="result"><a class="result__a" href="/l/?uddg=rel">rel</a></div>'
+        '<div class="result"><a class="result__a result__extra" href="http://b.dev">B</a></div>'
+        "</body></html>"
+    )
+    assert _parse_results(html) == ["https://a.dev/x", "http://b.dev"]
+
+
+@pytest.mark.asyncio()
+async def test_search_web_parses_off_loop():
+    import threading
+
+    kc = KnowledgeCrawler()
+    html = "".join(f'<a class="result__a" href="https://r{i}.dev">r</a>' for i in range(7))
+    mock_resp = MagicMock()
+    mock_resp.text = html
+    mock_client = AsyncMock()
+    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client.__aexit__ = AsyncMock(return_value=False)
+    mock_client.get = AsyncMock(return_value=mock_resp)
+
+    from enton.core import knowledge_crawler as module
+
+    parse_threads = []
+    real_parse = module._parse_results
+
+    def spy(text):
+        parse_threads.append(threading.current_thread())
+        return real_parse(text)
+
+    with (
+        patch("httpx.AsyncClient", return_value=mock_client),
+        patch.object(module, "_parse_results", spy),
+    ):
+        urls = await kc._search_web("python")
+
+    assert urls == [f"https://r{i}.dev" for i in range(5)]
+    assert parse_threads and parse_threads[0] is not threading.main_thread()
@@ -28,6 +28,25 @@ class TestAgentResult:
         assert "150ms" in s
 
 
+class TestAgentResultPool:
+    def test_release_then_acquire_reuses_instance(self):
+        from enton.cognition.sub_agents import _RESULT_POOL
+
+        _RESULT_POOL.clear()
+        r = AgentResult.acquire("coding", "x", tools_used=["shell"], metadata={"model": "m"})
+        r.release()
+        assert r.content == ""
+        assert r.tools_used == []
+        assert r.metadata == {}
+
+        r2 = AgentResult.acquire("vision", "y", confidence=0.9, metadata={"model": "n"})
+        assert r2 is r
+        assert r2.agent_role == "vision"
+        assert r2.confidence == 0.9
+        assert r2.metadata == {"model": "n"}
+        assert r2.tools_used == []
+
+
 class TestSubAgentOrchestrator:
     @pytest.fixture
     def orchestrator(self):
@@ -81,14 +100,37 @@ class TestSubAgentOrchestrator:
 class TestRoleConfigs:
     def test_all_roles_have_required_fields(self):
         for role, config in ROLE_CONFIGS.items():
-            assert "name" in config, f"Role {role} missing 'name'"
-            assert "system" in config, f"Role {role} missing 'system'"
-            assert "toolkit_names" in config, f"Role {role} missing 'toolkit_names'"
-            assert "description" in config, f"Role {role} missing 'description'"
+            assert config.name, f"Role {role} missing 'name'"
+            assert config.system, f"Role {role} missing 'system'"
+            assert config.toolkit_names, f"Role {role} missing 'toolkit_names'"
+            assert config.description, f"Role {role} missing 'description'"
+
+    def test_role_config_frozen(self):
+        import dataclasses
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            ROLE_CONFIGS["coding"].name = "x"
+
+    def test_toolkits_resolved_once_per_role(self):
+        from agno.models.ollama import Ollama
+        from agno.tools import Toolkit
+
+        shell = Toolkit(name="shell_tools")
+        orch = SubAgentOrchestrator(
+            models=[Ollama(id="qwen2.5:14b")], toolkits={"shell_tools": shell}
+        )
+        assert orch._agent_toolkits["coding"] == (shell,)
+        assert orch._agent_toolkits["system"] == (shell,)
+        assert orch._agent_toolkits["vision"] == ()
+
+    def test_race_models_only_for_vision(self):
+        assert ROLE_CONFIGS["vision"].race_models is True
+        assert ROLE_CONFIGS["research"].race_models is False
+        assert ROLE_CONFIGS["coding"].race_models is False
 
     def test_system_prompts_not_empty(self):
         for role, config in ROLE_CONFIGS.items():
-            system = config["system"]
+            system = config.system
             assert len(system) > 20, f"Role {role} system prompt too short"
             # coding prompt is intentionally EN (LLMs code better in English)
             if role != "coding":
@@ -105,3 +147,574 @@ class TestSubAgent:
         model = Ollama(id="qwen2.5:14b")
         agent = SubAgent(role="research", models=[model])
         assert agent.success_rate == 1.0
+
+    def test_success_rate_is_windowed(self):
+        from agno.models.ollama import Ollama
+
+        from enton.cognition.sub_agents import _OUTCOME_WINDOW
+
+        agent = SubAgent(role="research", models=[Ollama(id="qwen2.5:14b")])
+        for _ in range(_OUTCOME_WINDOW):
+            agent._record_error()
+        assert agent.success_rate == 0.0
+        for _ in range(_OUTCOME_WINDOW // 2):
+            agent._record_outcome(True)
+        assert agent.success_rate == 0.5
+        assert agent._total_errors == _OUTCOME_WINDOW
+        assert len(agent._outcomes) == _OUTCOME_WINDOW
+
+
+class TestAgentPool:
+    async def test_concurrent_executes_use_distinct_agents(self):
+        from types import SimpleNamespace
+
+        from agno.models.ollama import Ollama
+
+        agent = SubAgent(role="coding", models=[Ollama(id="qwen2.5:14b")], pool_max=2)
+        seen = []
+
+        async def fake_arun(self_agent, task):
+            seen.append(self_agent)
+            await asyncio.sleep(0.01)
+            return SimpleNamespace(content=task)
+
+        from agno.agent import Agent
+
+        orig = Agent.arun
+        Agent.arun = fake_arun
+        try:
+            results = await asyncio.gather(*(agent.execute(f"t{i}") for i in range(3)))
+        finally:
+            Agent.arun = orig
+
+        assert [r.content for r in results] == ["t0", "t1", "t2"]
+        assert len({id(a) for a in seen[:2]}) == 2
+        assert len(agent._pool) == 2
+        assert agent.pool_misses == 1
+        assert agent.pool_hits == 2
+
+
+class TestPromptCacheKey:
+    def test_key_set_on_copy(self):
+        from agno.models.openrouter import OpenRouter
+
+        shared = OpenRouter(id="qwen/qwen3", api_key="k")
+        agent = SubAgent(role="coding", models=[shared])
+        assert agent._models[0].extra_body == {"prompt_cache_key": "enton-subagent-coding"}
+        assert agent._models[0] is not shared
+        assert not shared.extra_body
+
+    def test_parent_key_preserved(self):
+        from agno.models.openrouter import OpenRouter
+
+        shared = OpenRouter(id="x", api_key="k", extra_body={"prompt_cache_key": "parent"})
+        agent = SubAgent(role="vision", models=[shared])
+        assert agent._models[0] is shared
+
+    def test_unsupported_provider_untouched(self):
+        from agno.models.ollama import Ollama
+
+        model = Ollama(id="qwen2.5:14b")
+        agent = SubAgent(role="research", models=[model])
+        assert agent._models[0] is model
+
+
+class TestSemanticCache:
+    @staticmethod
+    def _vec(*xs):
+        import numpy as np
+
+        v = np.asarray(xs, dtype=np.float32)
+        return v / np.linalg.norm(v)
+
+    def test_hit_above_threshold(self):
+        from enton.cognition.sub_agents import _SemanticCache
+
+        cache = _SemanticCache(threshold=0.9)
+        cache.insert(
+            "coding", "escreva hello world", self._vec(1, 0, 0), AgentResult("coding", "ok")
+        )
+        hit = cache.lookup("coding", self._vec(1, 0.05, 0))
+        assert hit is not None
+        assert hit.content == "ok"
+
+    def test_miss_below_threshold_or_other_role(self):
+        from enton.cognition.sub_agents import _SemanticCache
+
+        cache = _SemanticCache(threshold=0.9)
+        cache.insert("coding", "a", self._vec(1, 0, 0), AgentResult("coding", "ok"))
+        assert cache.lookup("coding", self._vec(0, 1, 0)) is None
+        assert cache.lookup("vision", self._vec(1, 0, 0)) is None
+
+    def test_lru_eviction(self):
+        from enton.cognition.sub_agents import _SemanticCache
+
+        cache = _SemanticCache(threshold=0.99, max_per_role=2)
+        cache.insert("research", "a", self._vec(1, 0, 0), AgentResult("research", "a"))
+        cache.insert("research", "b", self._vec(0, 1, 0), AgentResult("research", "b"))
+        cache.lookup("research", self._vec(1, 0, 0))  # "a" vira o mais recente
+        cache.insert("research", "c", self._vec(0, 0, 1), AgentResult("research", "c"))
+        assert len(cache) == 2
+        assert cache.lookup("research", self._vec(0, 1, 0)) is None
+        assert cache.lookup("research", self._vec(1, 0, 0)) is not None
+
+    def test_persistence(self, tmp_path):
+        from enton.cognition.sub_agents import _SemanticCache
+
+        path = tmp_path / "cache.db"
+        cache = _SemanticCache(path)
+        cache.insert("system", "gpu", self._vec(0, 1, 0), AgentResult("system", "RTX"))
+        cache.flush()  # escrita roda na thread do cache
+
+        reloaded = _SemanticCache(path)
+        hit = reloaded.lookup("system", self._vec(0, 1, 0))
+        assert hit is not None
+        assert hit.content == "RTX"
+
+    async def test_embed_goes_through_shared_embed_cache(self):
+        from unittest.mock import MagicMock
+
+        from enton.cognition.sub_agents import _SemanticCache
+        from enton.core.query_cache import EMBED_CACHE
+
+        EMBED_CACHE.clear()
+        cache = _SemanticCache()
+        cache._embedder = MagicMock(id="nomic-embed-text")
+        cache._embedder.get_embedding.return_value = [3.0, 4.0]
+
+        first = await cache.embed("Status  da GPU")
+        second = await cache.embed("status da gpu")
+        assert first.tolist() == second.tolist() == pytest.approx([0.6, 0.8])
+        cache._embedder.get_embedding.assert_called_once_with("status da gpu")
+        EMBED_CACHE.clear()
+
+    async def test_execute_returns_cached(self):
+        from unittest.mock import AsyncMock
+
+        from agno.models.ollama import Ollama
+
+        from enton.cognition.sub_agents import _SemanticCache
+
+        cache = _SemanticCache()
+        cache.embed = AsyncMock(return_value=self._vec(1, 0, 0))
+        cache.insert("coding", "task", self._vec(1, 0, 0), AgentResult("coding", "cached"))
+        agent = SubAgent(role="coding", models=[Ollama(id="qwen2.5:14b")], cache=cache)
+        agent._pool[0].arun = AsyncMock()
+
+        result = await agent.execute("task")
+        assert result.content == "cached"
+        assert result.metadata["cache_hit"] is True
+        agent._pool[0].arun.assert_not_called()
+
+
+class TestBatchDelegation:
+    async def test_coalescer_shares_only_in_flight_calls(self):
+        from enton.cognition.sub_agents import _ToolCoalescer
+
+        calls = 0
+
+        async def read_file(path):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"conteudo de {path}"
+
+        c = _ToolCoalescer()
+        out = await asyncio.gather(
+            c.call("read_file", read_file, {"path": "a.py"}),
+            c.call("read_file", read_file, {"path": "a.py"}),
+            c.call("read_file", read_file, {"path": "b.py"}),
+        )
+        assert out[0] == out[1] == "conteudo de a.py"
+        assert calls == 2
+        assert c.coalesced == 1
+        assert c._inflight == {}
+
+        # Ja terminou: a mesma chamada executa de novo (sem memo)
+        await c.call("read_file", read_file, {"path": "a.py"})
+        assert calls == 3
+
+    async def test_batch_is_scoped_to_its_own_tasks(self):
+        from enton.cognition.sub_agents import _BATCH, _coalesce_hook, _ToolCoalescer
+
+        calls = 0
+
+        async def read_file(path):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return path
+
+        async def in_batch():
+            _BATCH.set(_ToolCoalescer())
+            await asyncio.gather(
+                _coalesce_hook("read_file", read_file, {"path": "a.py"}),
+                _coalesce_hook("read_file", read_file, {"path": "a.py"}),
+            )
+
+        # um execute() avulso roda ao mesmo tempo, fora do contexto do batch
+        await asyncio.gather(
+            asyncio.create_task(in_batch()),
+            _coalesce_hook("read_file", read_file, {"path": "a.py"}),
+        )
+        assert calls == 2
+
+    def test_hooks_only_on_async_tools_never_on_side_effects(self):
+        from agno.models.ollama import Ollama
+        from agno.tools import Toolkit
+
+        from enton.cognition.sub_agents import _coalesce_hook
+
+        async def search_web(query: str) -> str:
+            return query
+
+        def recall_recent(n: int = 5) -> str:
+            return ""
+
+        async def run_command(cmd: str) -> str:
+            return cmd
+
+        search = Toolkit(name="search_tools")
+        search.register(search_web)
+        search.register(recall_recent)
+        shell = Toolkit(name="shell_tools")
+        shell.register(run_command)
+
+        agent = SubAgent(role="research", models=[Ollama(id="a")], toolkits=[search, shell])
+        hooked, plain = agent._toolkits
+        fns = hooked.get_async_functions()
+        assert fns["search_web"].tool_hooks == [_coalesce_hook]
+        assert fns["recall_recent"].tool_hooks is None  # sync: segue no to_thread do agno
+        assert plain is shell
+        assert search.get_async_functions()["search_web"].tool_hooks is None
+        assert agent._pool[0].tool_hooks is None
+
+    async def test_delegate_many_preserves_order(self):
+        from unittest.mock import AsyncMock
+
+        from agno.models.ollama import Ollama
+
+        orch = SubAgentOrchestrator(models=[Ollama(id="qwen2.5:14b")], toolkits={})
+        for role, agent in orch._agents.items():
+            agent.execute = AsyncMock(
+                side_effect=lambda t, role=role: AgentResult(agent_role=role, content=t)
+            )
+
+        jobs = [("coding", "c1"), ("vision", "v1"), ("coding", "c2"), ("nope", "x")]
+        results = await orch.delegate_many(jobs)
+        assert [r.content for r in results[:3]] == ["c1", "v1", "c2"]
+        assert results[3].confidence == 0.0
+        assert orch._agents["coding"].execute.await_count == 2
+
+    async def test_delegate_many_isolates_failing_job(self):
+        from unittest.mock import AsyncMock
+
+        from agno.models.ollama import Ollama
+
+        orch = SubAgentOrchestrator(models=[Ollama(id="qwen2.5:14b")], toolkits={})
+        for role, agent in orch._agents.items():
+            agent.execute = AsyncMock(
+                side_effect=lambda t, role=role: AgentResult(agent_role=role, content=t)
+            )
+        orch._agents["vision"].execute = AsyncMock(side_effect=RuntimeError("camera off"))
+
+        jobs = [("vision", "v1"), ("research", "r1"), ("coding", "c1")]
+        results = await orch.delegate_many(jobs)
+        assert results[0].agent_role == "vision"
+        assert results[0].confidence == 0.0
+        assert "camera off" in results[0].content
+        assert [r.content for r in results[1:]] == ["r1", "c1"]
+        assert orch._agents["vision"]._total_errors == 1
+
+    async def test_consensus_routes_through_delegate_many(self):
+        from unittest.mock import AsyncMock, MagicMock
+
+        from enton.skills.sub_agent_toolkit import SubAgentTools
+
+        orch = MagicMock()
+        orch.delegate_many = AsyncMock(
+            return_value=[
+                AgentResult(agent_role=r, content=f"ok {r}")
+                for r in ("vision", "research", "coding", "system")
+            ]
+        )
+        out = await SubAgentTools(orch).agent_consensus("qual o status?")
+        orch.delegate_many.assert_awaited_once()
+        assert {role for role, _ in orch.delegate_many.await_args.args[0]} == {
+            "vision",
+            "research",
+            "coding",
+            "system",
+        }
+        assert "ok coding" in out
+        orch.delegate.assert_not_called()
+
+
+class TestThinkStrip:
+    async def test_execute_strips_think(self):
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from agno.models.ollama import Ollama
+
+        agent = SubAgent(role="research", models=[Ollama(id="qwen2.5:14b")])
+        agent._pool[0].arun = AsyncMock(
+            return_value=SimpleNamespace(content="<think>hmm\nok</think> Paris ")
+        )
+        result = await agent.execute("capital da França?")
+        assert result.content == "Paris"
+
+
+class TestClassifyMemo:
+    def test_repeat_prompt_hits_cache(self):
+        from enton.cognition.sub_agents import _classify
+
+        _classify.cache_clear()
+        assert _classify("status da gpu agora") == "system"
+        assert _classify("status da gpu agora") == "system"
+        info = _classify.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+
+class TestStreaming:
+    def test_think_stripper_across_chunks(self):
+        from enton.cognition.sub_agents import _ThinkStripper
+
+        s = _ThinkStripper()
+        chunks = ["Oi <th", "ink>pensando", " muito</thi", "nk> mundo", " <", "b>"]
+        out = "".join(s.feed(c) for c in chunks) + s.flush()
+        assert out == "Oi  mundo <b>"
+
+    def test_think_stripper_unclosed_dropped(self):
+        from enton.cognition.sub_agents import _ThinkStripper
+
+        s = _ThinkStripper()
+        assert s.feed("ok<think>nunca fecha") == "ok"
+        assert s.flush() == ""
+
+    async def test_execute_stream_yields_chunks(self):
+        from types import SimpleNamespace
+
+        from agno.models.ollama import Ollama
+        from agno.run.agent import RunEvent
+
+        async def fake_stream(*chunks):
+            for c in chunks:
+                yield SimpleNamespace(event=RunEvent.run_content, content=c)
+
+        agent = SubAgent(role="research", models=[Ollama(id="qwen2.5:14b")])
+        agent._pool[0].arun = lambda task, **kw: fake_stream("<think>x</think>", " Par", "is")
+
+        out = [c async for c in agent.execute_stream("capital?")]
+        assert "".join(out) == "Paris"
+        assert agent._total_calls == 1
+
+    async def test_execute_stream_falls_back_before_first_token(self):
+        from types import SimpleNamespace
+
+        from agno.models.ollama import Ollama
+        from agno.run.agent import RunEvent
+
+        async def broken():
+            raise RuntimeError("down")
+            yield  # pragma: no cover
+
+        async def ok():
+            yield SimpleNamespace(event=RunEvent.run_content, content="ok")
+
+        agent = SubAgent(role="research", models=[Ollama(id="a"), Ollama(id="b")])
+        streams = iter([broken(), ok()])
+        agent._pool[0].arun = lambda task, **kw: next(streams)
+
+        out = [c async for c in agent.execute_stream("t")]
+        assert out == ["ok"]
+        assert agent._total_errors == 1
+
+
+class TestModelRace:
+    async def test_fast_model_wins(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+
+        async def fake_arun(self_agent, task, **kw):
+            if self_agent.model.id == "slow":
+                await asyncio.sleep(5)
+            return SimpleNamespace(content=self_agent.model.id)
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        agent = SubAgent(role="vision", models=[Ollama(id="slow"), Ollama(id="fast")])
+
+        result = await asyncio.wait_for(agent.execute("t"), timeout=2)
+        assert result.content == "fast"
+        assert result.metadata["model"] == "fast"
+        assert agent._total_errors == 0
+
+    async def test_race_then_sequential_fallback(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+
+        async def fake_arun(self_agent, task, **kw):
+            if self_agent.model.id != "third":
+                raise RuntimeError("down")
+            return SimpleNamespace(content="ok")
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        models = [Ollama(id="a"), Ollama(id="b"), Ollama(id="third")]
+        agent = SubAgent(role="vision", models=models)
+
+        result = await agent.execute("t")
+        assert result.content == "ok"
+        assert agent._total_errors == 2
+
+    async def test_side_effecting_tool_claims_the_race(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+        from agno.tools import Toolkit
+
+        from enton.cognition.sub_agents import _race_guard
+
+        moved: list[str] = []
+
+        async def camera_move(direction: str) -> str:
+            moved.append(direction)
+            return "ok"
+
+        ptz = Toolkit(name="ptz_tools")
+        ptz.register(camera_move)
+
+        async def fake_arun(self_agent, task, **kw):
+            if self_agent.model.id == "slow":
+                await _race_guard("camera_move", camera_move, {"direction": "left"})
+                await asyncio.sleep(0.05)
+            else:
+                await asyncio.sleep(0.01)  # seria o vencedor sem a posse do race
+            return SimpleNamespace(content=self_agent.model.id)
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        models = [Ollama(id="slow"), Ollama(id="fast")]
+        agent = SubAgent(role="vision", models=models, toolkits=[ptz])
+
+        result = await asyncio.wait_for(agent.execute("t"), timeout=2)
+        assert result.content == "slow"
+        assert moved == ["left"]
+        assert agent._total_errors == 0
+
+    async def test_race_guard_is_passthrough_outside_a_race(self):
+        from agno.models.ollama import Ollama
+        from agno.tools import Toolkit
+
+        from enton.cognition.sub_agents import _race_guard
+
+        async def camera_move() -> str:
+            return "ok"
+
+        ptz = Toolkit(name="ptz_tools")
+        ptz.register(camera_move)
+        agent = SubAgent(role="vision", models=[Ollama(id="a")], toolkits=[ptz])
+
+        fn = agent._toolkits[0].get_async_functions()["camera_move"]
+        assert fn.tool_hooks == [_race_guard]
+        assert await _race_guard("camera_move", camera_move, {}) == "ok"
+
+    async def test_race_second_agent_holds_a_pool_slot(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+
+        free_slots: list[int] = []
+
+        async def fake_arun(self_agent, task, **kw):
+            free_slots.append(agent._pool_sem._value)
+            await asyncio.sleep(0)
+            return SimpleNamespace(content=self_agent.model.id)
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        agent = SubAgent(role="vision", models=[Ollama(id="a"), Ollama(id="b")], pool_max=2)
+
+        await agent.execute("t")
+        assert free_slots == [0, 0]  # both racers counted against pool_max
+        assert agent._pool_sem._value == 2
+
+    async def test_race_skipped_without_free_slot(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+
+        calls: list[str] = []
+
+        async def fake_arun(self_agent, task, **kw):
+            calls.append(self_agent.model.id)
+            return SimpleNamespace(content=self_agent.model.id)
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        agent = SubAgent(role="vision", models=[Ollama(id="a"), Ollama(id="b")], pool_max=1)
+
+        result = await agent.execute("t")
+        assert result.content == "a"
+        assert calls == ["a"]  # sequential path, first model not skipped
+
+    def test_token_match_keeps_role_priority(self):
+        from enton.cognition.sub_agents import _classify
+
+        _classify.cache_clear()
+        assert _classify("rode esse codigo e olha a camera") == "vision"
+        assert _classify("checa o disco e o python") == "coding"
+        assert _classify("uso de gpu") == "system"
+        assert _classify("quem descobriu o brasil") == "research"
+        _classify.cache_clear()
+
+    def test_token_match_avoids_substring_false_positives(self):
+        from enton.cognition.sub_agents import _classify
+
+        _classify.cache_clear()
+        assert _classify("qual o jeito mais pythonic") == "research"
+        assert _classify("programa de rádio") == "research"  # 'ram' não é token
+        assert _classify("liste os processos") == "system"  # plural ainda bate
+        _classify.cache_clear()
+
+
+class TestWarmup:
+    def test_one_token_model_copies(self):
+        from agno.models.ollama import Ollama
+        from agno.models.openrouter import OpenRouter
+
+        from enton.cognition.sub_agents import _one_token_model
+
+        ollama = Ollama(id="qwen2.5:14b")
+        probe = _one_token_model(ollama)
+        assert probe.options == {"num_predict": 1}
+        assert ollama.options is None
+
+        router = OpenRouter(id="x", api_key="k")
+        assert _one_token_model(router).max_tokens == 1
+        assert router.max_tokens != 1
+
+    async def test_orchestrator_warmup_probes_each_role(self, monkeypatch):
+        from types import SimpleNamespace
+
+        from agno.agent import Agent
+        from agno.models.ollama import Ollama
+
+        probed = []
+
+        async def fake_arun(self_agent, task, **kw):
+            probed.append(self_agent.name)
+            return SimpleNamespace(content="")
+
+        monkeypatch.setattr(Agent, "arun", fake_arun)
+        orch = SubAgentOrchestrator(models=[Ollama(id="qwen2.5:14b")], toolkits={})
+        await orch.warmup()
+
+        assert len(probed) == len(ROLE_CONFIGS)
+        coder = orch.get_agent("coding")
+        assert coder._total_calls == 0
+        assert coder._pool[0].model is coder._models[0]